@@ -0,0 +1,271 @@
+import numpy as np
+from math import log
+
+class ArrayTree:
+    """
+    Represents a search tree stored in preallocated NumPy arrays, which grow by doubling when they
+    are full (see MCTS.search_array_tree).
+
+    Nodes are rows of the arrays, with node 0 as the root. The first time a node is expanded, a
+    block of rows is allocated for its children, one for each of its legal actions, so the children
+    of a node are contiguous and their UCT values are calculated in one vectorised expression.
+    The children whose actions have been tried come first in the block, in the order they were
+    tried, followed by the untried children in the order of the legal actions. The undo tokens of
+    the nodes are kept in a list alongside the arrays.
+
+    Attributes
+    ----------
+    capacity : int
+        The number of rows allocated in the arrays.
+    size : int
+        The number of rows in use.
+    visits : np.ndarray
+        The number of visits to each node.
+    total_reward : np.ndarray
+        The total reward accumulated at each node.
+    action : np.ndarray
+        The id of the action taken to reach each node (-1 for the root).
+    parent : np.ndarray
+        The index of the parent of each node (-1 for the root).
+    first_child : np.ndarray
+        The index of the first child of each node (-1 if its children are not allocated).
+    next_sibling : np.ndarray
+        The index of the next child of the parent of each node (-1 for the last child).
+    num_children : np.ndarray
+        The number of children of each node, ie. its number of legal actions (-1 if its children
+        are not allocated).
+    num_untried : np.ndarray
+        The number of children of each node whose actions have not been tried.
+    terminal : np.ndarray
+        Whether the game has reached a terminal state at each node.
+    tokens : list
+        The undo token of each node (see MonopolyBoardMCTS.apply).
+
+    Methods
+    -------
+    __init__(capacity=1024)
+        Allocates the arrays.
+    reset(terminal=False)
+        Empties the tree, leaving only the root.
+    grow(capacity)
+        Reallocates the arrays with at least the given number of rows.
+    add_children(node, actions)
+        Allocates the block of children of a node.
+    untried_actions(node)
+        Returns the actions from a node that have not been tried.
+    expand(node, untried_idx, token, terminal)
+        Marks the child of an untried action as tried.
+    best_child(node, exploration_weight)
+        Returns the child of a fully expanded node with the highest UCT value.
+    add_virtual_loss(path, virtual_loss)
+        Adds virtual visits to the nodes on a path.
+    backpropagate(path, reward, virtual_loss=0)
+        Adds a visit and its reward to the nodes on a path.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = 0
+        self.visits = np.zeros(0, dtype=np.float64)
+        self.total_reward = np.zeros(0, dtype=np.float64)
+        self.action = np.zeros(0, dtype=np.int32)
+        self.parent = np.zeros(0, dtype=np.int32)
+        self.first_child = np.zeros(0, dtype=np.int32)
+        self.next_sibling = np.zeros(0, dtype=np.int32)
+        self.num_children = np.zeros(0, dtype=np.int32)
+        self.num_untried = np.zeros(0, dtype=np.int32)
+        self.terminal = np.zeros(0, dtype=bool)
+        self.tokens = []
+        self.grow(capacity)
+        self.reset()
+
+    def reset(self, terminal=False):
+        """
+        Empties the tree, leaving only a root with no visits.
+
+        Parameters
+        ----------
+        terminal : bool, optional
+            Whether the game has reached a terminal state at the root, by default False.
+        """
+        self.size = 1
+        self.visits[0] = 0
+        self.total_reward[0] = 0
+        self.action[0] = -1
+        self.parent[0] = -1
+        self.first_child[0] = -1
+        self.next_sibling[0] = -1
+        self.num_children[0] = -1
+        self.num_untried[0] = 0
+        self.terminal[0] = terminal
+        self.tokens[0] = None
+
+    def grow(self, capacity):
+        """
+        Reallocates the arrays with at least the given number of rows, doubling the current number
+        of rows if that is larger. The rows in use are copied over.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of rows needed.
+        """
+        capacity = max(capacity, 2 * self.capacity)
+
+        for name in ('visits', 'total_reward', 'action', 'parent', 'first_child', 'next_sibling',
+                     'num_children', 'num_untried', 'terminal'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+        self.tokens.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def add_children(self, node, actions):
+        """
+        Allocates the block of children of a node, one for each of its legal actions.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+        actions : list
+            The ids of the legal actions from the node.
+        """
+        num_children = len(actions)
+        start, end = self.size, self.size + num_children
+        if end > self.capacity:
+            self.grow(end)
+
+        self.visits[start:end] = 0
+        self.total_reward[start:end] = 0
+        self.action[start:end] = actions
+        self.parent[start:end] = node
+        self.first_child[start:end] = -1
+        self.next_sibling[start:end] = np.arange(start + 1, end + 1)
+        self.num_children[start:end] = -1
+        self.num_untried[start:end] = 0
+        self.terminal[start:end] = False
+
+        if num_children:
+            self.next_sibling[end - 1] = -1
+        self.first_child[node] = start if num_children else -1
+        self.num_children[node] = num_children
+        self.num_untried[node] = num_children
+        self.size = end
+
+    def untried_actions(self, node):
+        """
+        Returns the actions from a node that have not been tried, in the order of the legal actions
+        of the node.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node, whose children must be allocated.
+
+        Returns
+        -------
+        list
+            The ids of the untried actions.
+        """
+        end = self.first_child[node] + self.num_children[node]
+        return self.action[end - self.num_untried[node]:end].tolist()
+
+    def expand(self, node, untried_idx, token, terminal):
+        """
+        Marks the child of an untried action as tried. The child is moved to the end of the tried
+        children of the node, keeping the untried actions in order. This only reorders actions,
+        since untried children have no other data.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+        untried_idx : int
+            The index of the action in the list of untried actions (see untried_actions).
+        token : tuple
+            The undo token of the action.
+        terminal : bool
+            Whether the game has reached a terminal state at the child.
+
+        Returns
+        -------
+        int
+            The index of the child.
+        """
+        child = self.first_child[node] + self.num_children[node] - self.num_untried[node]
+        tried = child + untried_idx
+
+        action = self.action[tried]
+        self.action[child + 1:tried + 1] = self.action[child:tried].copy()
+        self.action[child] = action
+
+        self.terminal[child] = terminal
+        self.tokens[child] = token
+        self.num_untried[node] -= 1
+
+        return int(child)
+
+    def best_child(self, node, exploration_weight):
+        """
+        Returns the child of a node with the highest UCT value (see MCTS.uct), with the values of
+        all of the children calculated at once. Every child of the node must have been tried, and
+        so visited, which is the case whenever selection moves past a node. A child tried in the 
+        current batch of leaf-parallel search may only have its virtual visits, or none, in which 
+        case the first child with no visits is chosen. Ties go to the child tried first, as for the
+        children of a Node.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+        exploration_weight : float
+            The exploration weight parameter for the UCT formula.
+
+        Returns
+        -------
+        int
+            The index of the best child.
+        """
+        start = self.first_child[node]
+        end = start + self.num_children[node]
+        visits = self.visits[start:end]
+        if not visits.all():
+            return int(start + visits.argmin())
+
+        uct_values = self.total_reward[start:end] / visits
+        uct_values += exploration_weight * np.sqrt(log(self.visits[node]) / visits)
+
+        return int(start + uct_values.argmax())
+
+    def add_virtual_loss(self, path, virtual_loss):
+        """
+        Adds virtual visits (ie. visits with no reward) to the nodes on a path, so that the other
+        leaves selected in the same batch of leaf-parallel search are steered away from the path
+        while its rollouts are pending.
+
+        Parameters
+        ----------
+        path : list
+            The indices of the nodes on the path, which are all different.
+        virtual_loss : int
+            The number of virtual visits to add to each node.
+        """
+        self.visits[path] += virtual_loss
+
+    def backpropagate(self, path, reward, virtual_loss=0):
+        """
+        Adds a visit and its reward to the nodes on a path, replacing any virtual visits.
+
+        Parameters
+        ----------
+        path : list
+            The indices of the nodes on the path, which are all different.
+        reward : float
+            The reward obtained from the rollout.
+        virtual_loss : int, optional
+            The number of virtual visits that were added to each node, by default 0.
+        """
+        self.visits[path] += 1 - virtual_loss
+        self.total_reward[path] += reward
@@ -1,8 +1,142 @@
 import numpy as np
 import random
+import time
+import heapq
+import multiprocessing
 from tqdm import tqdm
-from Node import Node
+from Node import Node, ChildNotFoundError
 from State import State
+from SharedTree import SharedTree
+from ArrayTree import ArrayTree
+from TranspositionTable import TranspositionTable
+from RandomStreams import RandomStreams
+from RandomRollout import RandomRollout
+
+# shared tree of the worker process, attached when the pool for tree-parallel search is created
+_shared_tree = None
+
+def _seed_strategy(root_state, rng):
+    """
+    Give the strategy of the other players its own random number generator, drawn from the
+    generator of a worker process, so that the workers make independent random decisions for them.
+    Strategies without a random number generator are left as they are.
+
+    Parameters
+    ----------
+    root_state : State
+        The state of the game at the root of the search.
+    rng : random.Random
+        The random number generator for the worker.
+    """
+    if hasattr(root_state.strategy, 'rng'):
+        root_state.strategy.rng = random.Random(rng.getrandbits(64))
+
+def _search_worker(root_state, iterations, settings, rng):
+    """
+    Grow an independent search tree from a root state in a worker process, for root-parallel
+    search (see MCTS.search_parallel).
+
+    Parameters
+    ----------
+    root_state : State
+        The state of the game at the root of the search.
+    iterations : int
+        The number of iterations to run in the worker.
+    settings : dict
+        The settings of the search (see MCTS.worker_settings).
+    rng : random.Random
+        The random number generator for the worker.
+
+    Returns
+    -------
+    tuple
+        The number of visits to the root and the statistics of its children (see MCTS.root_statistics).
+    """
+    _seed_strategy(root_state, rng)
+    mcts = MCTS(root_state, iterations, rng=rng, **settings)
+    mcts.grow_tree(iterations, mcts.search_deadline())
+
+    return mcts.root.visits, mcts.root_statistics()
+
+def _leaf_batch_worker(root_state, leaf_snapshots, settings, rng):
+    """
+    Run the rollouts from a batch of leaves in a worker process, for leaf-parallel search (see 
+    MCTS.rollout_leaves). The root state is decoded once, and the board is moved to each leaf by
+    restoring its snapshot.
+
+    Parameters
+    ----------
+    root_state : State
+        The state of the game at the root of the search.
+    leaf_snapshots : list
+        The snapshot of the board at each leaf (see MonopolyBoardMCTS.snapshot).
+    settings : dict
+        The settings of the search (see MCTS.worker_settings).
+    rng : random.Random
+        The random number generator for the worker.
+
+    Returns
+    -------
+    list
+        The mean reward of the rollouts from each leaf and the set of actions taken in them, which
+        is empty unless RAVE is enabled.
+    """
+    _seed_strategy(root_state, rng)
+    # the rollouts do not use the transposition table, so none is created
+    mcts = MCTS(root_state, 0, rng=rng, **dict(settings, max_transpositions=0))
+    mcts.board = root_state.to_monopoly_board(rng)
+
+    results = []
+    for leaf_snapshot in leaf_snapshots:
+        mcts.board.restore(leaf_snapshot)
+        reward = mcts.simulate_leaf(None)
+        results.append((reward, set(mcts.rollout_actions)))
+
+    return results
+
+def _attach_shared_tree(capacity, name, lock, stat_locks):
+    """
+    Attach a worker process to the shared tree for tree-parallel search.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of nodes in the tree.
+    name : str
+        The name of the shared memory block of the tree.
+    lock : multiprocessing.Lock
+        The lock for adding nodes to the tree.
+    stat_locks : list
+        The locks for updating nodes in the tree.
+    """
+    global _shared_tree
+    _shared_tree = SharedTree(capacity, name, lock, stat_locks)
+
+def _tree_search_worker(root_state, iterations, settings, rng):
+    """
+    Grow the shared tree from a root state in a worker process, for tree-parallel search (see 
+    MCTS.search_tree_parallel).
+
+    Parameters
+    ----------
+    root_state : State
+        The state of the game at the root of the search.
+    iterations : int
+        The number of iterations to run in the worker.
+    settings : dict
+        The settings of the search (see MCTS.worker_settings).
+    rng : random.Random
+        The random number generator for the worker.
+
+    Returns
+    -------
+    dict
+        The (undo token, terminal) of each child of the root the worker visited, keyed by action id.
+    """
+    _seed_strategy(root_state, rng)
+    mcts = MCTS(root_state, iterations, rng=rng, **settings)
+
+    return mcts.grow_shared_tree(_shared_tree, iterations, mcts.search_deadline())
 
 class MCTS:
     """
@@ -18,23 +152,209 @@ class MCTS:
         The exploration weight parameter for the UCT formula, by default 1.
     max_simulations : int, optional
         The maximum number of simulations to run during the MCTS algorithm, by default 1000.
+    rng : random.Random, optional
+        The random number generator for the search, used for choosing actions and for the dice rolls
+        on the working board, by default the random module.
+    workers : int, optional
+        The number of worker processes for parallel search, by default 1 (search in this process). 
+        The iterations of each search are split between the workers.
+    parallelism : str, optional
+        How the workers share a search, by default 'root'. With 'root', each worker grows its own 
+        tree and the root statistics are merged (see search_parallel). With 'tree', the workers grow
+        a single tree in shared memory (see search_tree_parallel), which does not support a
+        transposition table, open-loop or chance nodes, RAVE, a prior policy or a maximum number of
+        nodes. With 'leaf', there is a single tree in this process, and the rollouts from a batch
+        of expanded nodes are split between the workers (see run_leaf_batch).
+    virtual_loss : int, optional
+        The number of virtual visits added to each node on the path of a running rollout in 
+        tree-parallel search, or of a pending leaf in leaf-parallel search, by default 1.
+    rollouts : int, optional
+        The number of rollouts run from each expanded node, whose mean reward is backed up, by
+        default 1.
+    leaf_batch : int, optional
+        The number of leaves selected before their rollouts are sent to the workers in 
+        leaf-parallel search, by default 8. Each worker decodes the root state once per batch and
+        runs the rollouts of its share of the leaves.
+    max_transpositions : int, optional
+        The maximum number of entries in the transposition table, by default 0 (no table). With a
+        table, the UCT value of a node is calculated from the statistics of its game state, which 
+        are shared by every node that reaches the same state. States whose players' money falls in
+        the same cash buckets are treated as the same state (see TranspositionTable).
+    tree_backend : str, optional
+        How the tree of a single-process search is stored, by default 'node'. With 'node', the tree
+        is made of Node objects and is carried over to the next move. With 'array', the tree is 
+        stored in NumPy arrays and rebuilt for every move (see search_array_tree), which does not
+        support a transposition table, open-loop or chance nodes, RAVE, a prior policy or a maximum
+        number of nodes.
+    open_loop : bool, optional
+        Whether the tree of Node objects is open-loop, by default False. A closed-loop node holds 
+        the undo token of the one outcome of its action that was sampled when it was created, and 
+        every visit replays that outcome. An open-loop node holds only its action and statistics, 
+        and every iteration performs the actions on its path again with fresh dice rolls and card 
+        draws, so the value of a node averages over the outcomes of its actions. Open-loop nodes
+        do not use the transposition table.
+    chance_nodes : bool, optional
+        Whether ending the turn leads to a chance node in a closed-loop tree of Node objects, by 
+        default False. The children of a chance node are the outcomes of the dice rolls and card 
+        draws, grouped by outcome class, rather than the single outcome sampled on expansion (see
+        sample_outcome).
+    widening_constant : float, optional
+        The constant of the progressive widening of chance nodes, by default 1.
+    widening_exponent : float, optional
+        The exponent of the progressive widening of chance nodes, by default 0.5. A fresh outcome is
+        drawn at a chance node while it has at most widening_constant * visits ** widening_exponent
+        children.
+    time_budget_ms : float, optional
+        The wall-clock time allowed for each search in milliseconds, by default None (no limit). The 
+        search stops at the deadline or after max_iterations iterations, whichever comes first. In
+        parallel search, each worker stops at the deadline.
+    early_stopping : bool, optional
+        Whether a search of the tree of Node objects in this process stops once the best action at
+        the root can no longer change within the remaining iterations, by default False (see 
+        is_decided).
+    adaptive_budget : bool, optional
+        Whether the number of iterations of a search depends on how hard the decision is, by 
+        default False. A forced move (ie. a root with one legal action) is played without a search.
+        Otherwise a search of the tree of Node objects in this process runs in four stages of 
+        max_iterations // 4 iterations, and stops after any stage at which the decision is no
+        longer ambiguous (see is_ambiguous).
+    decisive_ratio : float, optional
+        The number of times more visits the most visited child of the root must have than any other
+        child for a decision to be clear with an adaptive budget, by default 2.
+    rave : bool, optional
+        Whether the UCT value of a node in a tree of Node objects is blended with the 
+        all-moves-as-first (AMAF) value of its action, by default False. The AMAF value of an 
+        action is learned from every iteration that takes the action at any point after the parent
+        node, in the tree or in a rollout, so it is learned much faster than the value of the node.
+        RAVE is not supported by tree-parallel search or the array backend.
+    rave_equivalence : float, optional
+        The number of visits to a node at which its own value and its AMAF value are given equal
+        weight in RAVE, by default 250. The weight of the AMAF value decays as the node is visited.
+    prior : obj, optional
+        The prior policy that scores the legal actions of the agent, by default None (no prior). 
+        This is any object with a score_actions(board, actions) method returning a score from 0 to
+        1 for each action, such as StrategyPrior. With a prior, the tree of Node objects expands the
+        untried action with the highest score first, and the UCT value of a node has a progressive
+        bias term for the score of its action, which decays as the node is visited. A prior is not
+        supported by tree-parallel search or the array backend.
+    prior_weight : float, optional
+        The weight of the progressive bias term in the UCT value, by default 1.
+    rollout_policy : obj, optional
+        The policy that plays out the game in the simulation phase, by default None (RandomRollout,
+        uniformly random actions). This is any object with choose_action(board, legal_actions, rng)
+        and evaluate(board) methods and a max_rounds attribute, such as StrategyRollout or
+        TruncatedRollout.
+    max_nodes : int, optional
+        The maximum number of nodes in the tree of Node objects, by default None (no limit). When 
+        the tree grows past it, the least visited leaves are evicted (see evict_leaves).
+
+    Attributes
+    ----------
+    iterations_used : list
+        The number of iterations run by each search, which is 0 for a forced move.
+    num_nodes : int
+        The number of nodes in the tree of Node objects.
+    node_pool : list
+        The nodes released from the tree, which are reused for new nodes (see new_node).
+    rollout_actions : set
+        The actions taken in the rollouts of the current iteration, recorded for RAVE.
+    board : MonopolyBoardMCTS
+        The working board. It is kept at the state of the root node between iterations, and is 
+        walked down the tree with the undo tokens stored on each node (or by performing the actions
+        of the nodes, if the tree is open-loop) and back to the root with a snapshot.
+    pool : multiprocessing.pool.Pool
+        The pool of worker processes for parallel search, created on the first parallel search.
+    tree : SharedTree
+        The shared tree for tree-parallel search, created with the pool.
+    transpositions : TranspositionTable
+        The statistics of each game state in the search, or None if there is no table.
+    array_tree : ArrayTree
+        The tree of the search with the array backend, created on the first search.
 
     Methods
     -------
+    validate_settings()
+        Check that the settings of the search are known and supported together.
+    new_node(state=None, action=None, parent=None, token=None, terminal=None, key=None, chance=False, prior=0)
+        Create a node, reusing a released node if there is one.
+    release_subtree(node)
+        Release a node and all of its descendants to the node pool.
+    evict_leaves()
+        Evict the least visited leaves of the tree until it is back under its maximum size.
     uct(node)
         Calculate the UCT (Upper Confidence Bound for Trees) value for a given node.
-    select_best_action(node)
+    select_best_action(node, legal_actions=None)
         Select the best action to take from a given node based on the UCT values of its children.
+    cache_legal_actions(node)
+        Cache the legal actions from a node, which the working board must be at the state of.
+    outcome_class()
+        Return the outcome class of the state of the working board.
+    sample_outcome(node)
+        Sample an outcome of the action of a chance node and move the working board to it.
+    choose_untried_action(untried_actions)
+        Choose the untried action to expand and return it with its prior score.
     selection(node)
         Perform the selection phase of the MCTS algorithm.
     expansion(node)
         Perform the expansion phase of the MCTS algorithm.
+    open_loop_selection(node)
+        Perform the selection phase of the MCTS algorithm on an open-loop tree.
+    open_loop_expansion(node)
+        Perform the expansion phase of the MCTS algorithm on an open-loop tree.
     simulation(node)
         Perform the simulation phase of the MCTS algorithm.
+    simulate_leaf(node)
+        Run the rollouts from an expanded node and return their mean reward.
+    rollout_leaves(leaf_snapshots)
+        Run the rollouts from a batch of leaves in the worker processes.
     backpropagation(node, reward)
         Perform the backpropagation phase of the MCTS algorithm.
+    rave_backpropagation(node, reward)
+        Update the AMAF statistics of the children of the nodes on the path to a node.
+    search_deadline()
+        Return the time at which a search that starts now must stop.
+    is_decided(remaining)
+        Check if the best action at the root can no longer change within a number of iterations.
+    is_ambiguous()
+        Check if the best action at the root is still unclear from the visits of its children.
+    forced_action()
+        Return the only legal action at the root, if there is no choice to make.
+    is_search_over(iteration, iterations, start, deadline)
+        Check if a search should stop before its next iteration.
+    select_leaf()
+        Perform the selection and expansion phases of the MCTS algorithm from the root node.
+    add_virtual_loss(node, virtual_loss)
+        Add virtual visits to the nodes on the path from the root to a node.
+    run_leaf_batch(batch, root_snapshot)
+        Run a batch of iterations of leaf-parallel MCTS.
+    grow_tree(iterations, deadline=None)
+        Run a number of iterations of the MCTS algorithm from the root node.
+    search_step(iterations=1)
+        Run a number of iterations of the MCTS algorithm, continuing the current search.
+    best_action_so_far()
+        Return the best action to take from the root node given the search so far.
+    root_statistics()
+        Return the visits, total reward and undo token of each child of the root node.
+    worker_settings()
+        Return the settings of the search that worker processes search with.
+    search_parallel()
+        Grow independent trees in the worker processes and merge their root statistics.
+    best_shared_child(tree, node, children)
+        Select the child of a node in the shared tree with the highest UCT value.
+    grow_shared_tree(tree, iterations, deadline=None)
+        Run a number of iterations of tree-parallel MCTS on the shared tree.
+    search_tree_parallel()
+        Grow a single shared tree in the worker processes and read off the statistics of the root.
+    array_tree_selection(tree)
+        Perform the selection and expansion phases of the MCTS algorithm on the array tree.
+    search_array_tree()
+        Grow a tree stored in NumPy arrays and read off the statistics of the root.
     search()
         Run the MCTS algorithm to find the best action to take from the root node.
+    close()
+        Shut down the pool of worker processes.
+    advance(action)
+        Move the root node and the working board to the child for an action.
     run()
         Run a single iteration of the MCTS algorithm.
     run_game(max_actions=1000, max_rounds=float('inf'))
@@ -43,12 +363,165 @@ class MCTS:
         Run a game using the MCTS algorithm without displaying progress.
     """
 
-    def __init__(self, root_state, max_iterations, exploration_weight=1, max_simulations=1000):
+    def __init__(self, root_state, max_iterations, exploration_weight=1, max_simulations=1000, rng=None, workers=1,
+                 parallelism='root', virtual_loss=1, rollouts=1, leaf_batch=8, max_transpositions=0,
+                 tree_backend='node', open_loop=False, chance_nodes=False, widening_constant=1, widening_exponent=0.5,
+                 time_budget_ms=None, early_stopping=False, adaptive_budget=False, decisive_ratio=2,
+                 max_nodes=None, rave=False, rave_equivalence=250, prior=None, prior_weight=1,
+                 rollout_policy=None):
         self.root = Node(root_state)
+        self.num_nodes = 1
+        self.node_pool = []
+        self.max_nodes = max_nodes
+        self.rave = rave
+        self.rave_equivalence = rave_equivalence
+        self.rollout_actions = set()
+        self.prior = prior
+        self.prior_weight = prior_weight
+        self.rollout_policy = rollout_policy if rollout_policy is not None else RandomRollout()
+        self.rng = rng if rng is not None else random
         self.max_iterations = max_iterations
         self.max_simulations = max_simulations
         self.best_actions = []
         self.exploration_weight = exploration_weight
+        self.workers = workers
+        self.parallelism = parallelism
+        self.virtual_loss = virtual_loss
+        self.rollouts = rollouts
+        self.leaf_batch = leaf_batch
+        self.max_transpositions = max_transpositions
+        self.transpositions = None
+        self.tree_backend = tree_backend
+        self.array_tree = None
+        self.open_loop = open_loop
+        self.chance_nodes = chance_nodes
+        self.widening_constant = widening_constant
+        self.widening_exponent = widening_exponent
+        self.time_budget_ms = time_budget_ms
+        self.early_stopping = early_stopping
+        self.adaptive_budget = adaptive_budget
+        self.decisive_ratio = decisive_ratio
+        self.iterations_used = []
+
+        # states are keyed by hash in the transposition table, which is carried across moves
+        if max_transpositions > 0:
+            self.transpositions = TranspositionTable(max_transpositions)
+            hash(root_state)
+            self.root.key = root_state.zobrist
+        self.board = None
+        self.pool = None
+        self.tree = None
+        self.validate_settings()
+
+    def validate_settings(self):
+        """
+        Check that the settings of the search are known and supported together. The shared tree of
+        tree-parallel search and the tree of the array backend only hold the visits, rewards and 
+        (for the array backend) undo tokens of each node, so the options that need more than that 
+        from a node are not supported by them.
+
+        Raises
+        ------
+        ValueError
+            If a setting is unknown, or an option is set that the search does not support.
+        """
+        if self.parallelism not in ('root', 'tree', 'leaf'):
+            raise ValueError(f"parallelism must be 'root', 'tree' or 'leaf', not {self.parallelism!r}")
+        if self.tree_backend not in ('node', 'array'):
+            raise ValueError(f"tree_backend must be 'node' or 'array', not {self.tree_backend!r}")
+
+        # the options that only a tree of Node objects supports, with whether each is set
+        node_options = {'max_transpositions': self.max_transpositions > 0, 'open_loop': self.open_loop,
+                        'chance_nodes': self.chance_nodes, 'max_nodes': self.max_nodes is not None,
+                        'rave': self.rave, 'prior': self.prior is not None}
+
+        # the search that is run is chosen as in search()
+        if self.workers > 1 and self.parallelism == 'tree':
+            search = "tree-parallel search"
+        elif (self.workers == 1 or self.parallelism == 'leaf') and self.tree_backend == 'array':
+            search = "the array tree backend"
+        else:
+            return
+
+        unsupported = [option for option, is_set in node_options.items() if is_set]
+        if unsupported:
+            raise ValueError(f"{search} does not support {', '.join(unsupported)}")
+
+    def new_node(self, state=None, action=None, parent=None, token=None, terminal=None, key=None, chance=False,
+                 prior=0):
+        """
+        Create a node, reusing a node from the pool of released nodes if there is one (see Node).
+
+        Returns
+        -------
+        Node
+            The new node.
+        """
+        self.num_nodes += 1
+
+        # a released node is set up again from scratch, as if it were new
+        if self.node_pool:
+            node = self.node_pool.pop()
+            node.__init__(state, action, parent, token, terminal, key, chance, prior)
+            return node
+
+        return Node(state, action, parent, token, terminal, key, chance, prior)
+
+    def release_subtree(self, node):
+        """
+        Release a node and all of its descendants to the node pool. The references held by the 
+        nodes are cleared, so that the released tree holds no game state and no reference cycles.
+        The node must already be removed from its parent.
+
+        Parameters
+        ----------
+        node : Node
+            The root of the subtree to release.
+        """
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            node.children.clear()
+            node.state = node.token = node.parent = node.legal_actions = node.untried_actions = None
+            self.node_pool.append(node)
+            self.num_nodes -= 1
+
+    def evict_leaves(self):
+        """
+        Evict the least visited leaves of the tree until it has at most 90% of max_nodes nodes, 
+        which leaves room for the tree to grow before the next eviction. The action of an evicted
+        leaf becomes untried again at its parent, so it can be expanded again later.
+        """
+        target = int(self.max_nodes * 0.9)
+
+        while self.num_nodes > target:
+            leaves = []
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                if node.children:
+                    stack.extend(node.children.values())
+                elif node is not self.root:
+                    leaves.append(node)
+
+            if not leaves:
+                return
+
+            for leaf in heapq.nsmallest(self.num_nodes - target, leaves, key=lambda leaf: leaf.visits):
+                parent = leaf.parent
+
+                # the children of a chance node are keyed by outcome class rather than by action
+                if parent.chance:
+                    outcome = next(outcome for outcome, child in parent.children.items() if child is leaf)
+                    del parent.children[outcome]
+                else:
+                    del parent.children[leaf.action]
+                    if parent.legal_actions is not None:
+                        parent.set_legal_actions(parent.legal_actions)
+
+                self.release_subtree(leaf)
 
     def uct(self, node):
         """
@@ -67,14 +540,34 @@ class MCTS:
         # return infinity for unvisited nodes
         if node.visits == 0:
             return float('inf')
+
+        visits, total_reward, parent_visits = node.visits, node.total_reward, node.parent.visits
+
+        # use the statistics of the game states, if they are in the transposition table
+        if self.transpositions is not None:
+            entry = self.transpositions.get(node.key)
+            if entry is not None:
+                visits, total_reward = entry
+            parent_entry = self.transpositions.get(node.parent.key)
+            if parent_entry is not None:
+                parent_visits = parent_entry[0]
         
         # 2 components of UCT
-        exploitation = node.total_reward / node.visits
-        exploration = self.exploration_weight * (np.log(node.parent.visits) / node.visits) ** 0.5
+        exploitation = total_reward / visits
+
+        # the AMAF value is given less weight as the node gains visits of its own
+        if self.rave and node.amaf_visits:
+            beta = (self.rave_equivalence / (3 * visits + self.rave_equivalence)) ** 0.5
+            exploitation = (1 - beta) * exploitation + beta * node.amaf_reward / node.amaf_visits
+
+        # progressive bias towards actions the prior policy favours, which fades with visits
+        if self.prior is not None:
+            exploitation += self.prior_weight * node.prior / (visits + 1)
+        exploration = self.exploration_weight * (np.log(parent_visits) / visits) ** 0.5
 
         return exploitation + exploration
     
-    def select_best_action(self, node):
+    def select_best_action(self, node, legal_actions=None):
         """
         Select the best action to take from a given node based on the UCT values of its children.
 
@@ -82,17 +575,22 @@ class MCTS:
         ----------
         node : Node
             The node for which to select the best action.
+        legal_actions : list, optional
+            The actions to choose from, by default None (the actions of all of the children). This
+            is needed in an open-loop tree, where the legal actions depend on the sampled outcomes.
 
         Returns
         -------
-        object
-            The best action to take from the node.
+        int
+            The id of the best action to take from the node.
         """
         best_action = None
         best_value = float('-inf')
 
+        children = node.children.values() if legal_actions is None else [node.children[action] for action in legal_actions]
+
         # find the child node with the highest UCT value
-        for child in node.children:
+        for child in children:
             uct_value = self.uct(child)
 
             # update best child node choice
@@ -102,9 +600,120 @@ class MCTS:
 
         return best_action
 
+    def cache_legal_actions(self, node):
+        """
+        Cache the legal actions from a node the first time they are needed. The working board must
+        be at the state of the node.
+
+        Parameters
+        ----------
+        node : Node
+            The node for which to cache the legal actions.
+
+        Returns
+        -------
+        Node
+            The node.
+        """
+        if node.legal_actions is None:
+            node.set_legal_actions(self.board.get_legal_actions())
+
+        # an agent with no legal actions is bankrupt, which get_legal_actions records on the board
+        elif not node.legal_actions:
+            self.board.get_legal_actions()
+
+        return node
+
+    def outcome_class(self):
+        """
+        Return the outcome class of the state of the working board after the turn is ended, made up
+        of the square the agent landed on, whether the agent is in jail or rolled doubles, and the 
+        cards drawn (ie. the positions of the card piles).
+
+        Returns
+        -------
+        tuple
+            The outcome class.
+        """
+        board = self.board
+        agent = board.agent
+
+        return (agent.position, agent.in_jail, agent.double_rolled, board.chance.top_card_idx,
+                board.community_chest.top_card_idx)
+
+    def sample_outcome(self, node):
+        """
+        Sample an outcome of the action of a chance node and move the working board to it, which 
+        must be at the state of the parent of the chance node. The number of outcome classes is 
+        limited by progressive widening. While the chance node has few enough children for its 
+        visits, the action is performed with fresh dice rolls and card draws, and a child is added 
+        if the outcome class is new. Otherwise one of the children is chosen with probability in 
+        proportion to the number of times its outcome class was drawn.
+
+        Parameters
+        ----------
+        node : Node
+            The chance node.
+
+        Returns
+        -------
+        Node
+            The child of the chance node for the sampled outcome.
+        """
+        board = self.board
+        outcomes = node.children
+
+        if len(outcomes) <= self.widening_constant * node.visits ** self.widening_exponent:
+            token = board.apply(node.action)
+            outcome = self.outcome_class()
+            child = outcomes.get(outcome)
+
+            # a child holds the first outcome drawn in its class, which its descendants continue from
+            if child is None:
+                child = self.new_node(action=node.action, parent=node, token=token, terminal=board.is_terminal(),
+                                      key=board.zobrist)
+                node.add_outcome(outcome, child)
+            else:
+                board.undo(token)
+                board.redo(child.token)
+
+            child.samples += 1
+            return child
+
+        children = list(outcomes.values())
+        child = self.rng.choices(children, [child.samples for child in children])[0]
+        board.redo(child.token)
+        return child
+
+    def choose_untried_action(self, untried_actions):
+        """
+        Choose the untried action to expand, which is the action with the highest score from the 
+        prior policy (with ties broken at random), or a random action if there is no prior. The 
+        working board must be at the state the actions are taken from.
+
+        Parameters
+        ----------
+        untried_actions : list
+            The ids of the untried actions.
+
+        Returns
+        -------
+        tuple
+            The id of the chosen action and its score from the prior policy (0 if there is none).
+        """
+        if self.prior is None:
+            return self.rng.choice(untried_actions), 0
+
+        scores = self.prior.score_actions(self.board, untried_actions)
+        best_score = max(scores)
+        action = self.rng.choice([action for action, score in zip(untried_actions, scores) if score == best_score])
+
+        return action, best_score
+
     def selection(self, node):
         """
-        Perform the selection phase of the MCTS algorithm.
+        Perform the selection phase of the MCTS algorithm. The working board is moved to the state 
+        of the selected node.
 
         Parameters
         ----------
@@ -116,16 +725,16 @@ class MCTS:
         Node
             The selected node for expansion.
         """
-        # convert state back to Monopoly board to get legal actions for that state
-        board = node.state.to_monopoly_board()
-        legal_actions = board.get_legal_actions()
-
-        # traverse tree until terminal node or node with unexplored children is reached
-        while not node.is_terminal() and len(node.children) == len(legal_actions):
+        # traverse tree until terminal node or node with unexplored children is reached, moving the board with it
+        while not node.is_terminal() and not self.cache_legal_actions(node).untried_actions:
             best_action = self.select_best_action(node)
             
-            if best_action:
+            if best_action is not None:
                 node = node.get_child_with_action(best_action)
+                if node.chance:
+                    node = self.sample_outcome(node)
+                else:
+                    self.board.redo(node.token)
             else:
                 return node
 
@@ -133,7 +742,8 @@ class MCTS:
 
     def expansion(self, node):
         """
-        Perform the expansion phase of the MCTS algorithm.
+        Perform the expansion phase of the MCTS algorithm. The working board is moved to the state 
+        of the expanded node.
 
         Parameters
         ----------
@@ -145,38 +755,104 @@ class MCTS:
         Node
             The expanded node.
         """
-        # convert state back to Monopoly board to get legal actions for that state
-        board = node.state.to_monopoly_board()
-        legal_actions = board.get_legal_actions()
-
-        # get untried actions
-        children_actions = [child.action for child in node.children]
-        untried_actions = [action for action in legal_actions if action not in children_actions]
+        untried_actions = self.cache_legal_actions(node).untried_actions
 
-        # if there are untried actions, randomly choose one & create child node
+        # if there are untried actions, choose one (at random, or by the prior) & create child node
         if untried_actions:
-            action = random.choice(untried_actions)
-            board.perform_action(action)
+            action, prior = self.choose_untried_action(untried_actions)
 
-            # create new state from Monopoly board for child node
-            new_state = State()
-            new_state.from_monopoly_board(board)
+            # ending the turn has a random outcome, which is sampled from a chance node
+            if self.chance_nodes and action == self.board.END_TURN:
+                child = self.new_node(action=action, parent=node, terminal=False, chance=True, prior=prior)
+                node.add_child(child)
+                return self.sample_outcome(child)
 
-            # create child node for new action
-            child = Node(new_state, action, parent=node)
-            node.children.append(child)
+            token = self.board.apply(action)
+
+            # create child node for new action, storing only the changes made by the action
+            child = self.new_node(action=action, parent=node, token=token, terminal=self.board.is_terminal(),
+                                  key=self.board.zobrist, prior=prior)
+            node.add_child(child)
             return child
         
         # if all actions have been tried, use UCT to choose child
         else:
             best_action = self.select_best_action(node)
-            if not best_action:
+            if best_action is None:
                 return node
-            return node.get_child_with_action(best_action)
+            
+            child = node.get_child_with_action(best_action)
+            if child.chance:
+                return self.sample_outcome(child)
+
+            self.board.redo(child.token)
+            return child
+
+    def open_loop_selection(self, node):
+        """
+        Perform the selection phase of the MCTS algorithm on an open-loop tree. The actions of the
+        selected nodes are performed on the working board, with fresh dice rolls and card draws, 
+        and only the children whose actions are legal in the sampled state are considered.
+
+        Parameters
+        ----------
+        node : Node
+            The current node in the tree.
+
+        Returns
+        -------
+        Node
+            The selected node for expansion.
+        """
+        board = self.board
+
+        # traverse tree until terminal state or node with unexplored legal actions is reached
+        while not board.is_terminal():
+            legal_actions = board.get_legal_actions()
+            if not legal_actions or any([action not in node.children for action in legal_actions]):
+                return node
+
+            best_action = self.select_best_action(node, legal_actions)
+            node = node.children[best_action]
+            board.perform_action(best_action)
+
+        return node
+
+    def open_loop_expansion(self, node):
+        """
+        Perform the expansion phase of the MCTS algorithm on an open-loop tree. The action of the 
+        new node is performed on the working board, but its outcome is not stored.
+
+        Parameters
+        ----------
+        node : Node
+            The current node in the tree.
+
+        Returns
+        -------
+        Node
+            The expanded node.
+        """
+        legal_actions = self.board.get_legal_actions()
+        untried_actions = [action for action in legal_actions if action not in node.children]
+
+        # the selection phase stops at the first node with untried legal actions (or none at all)
+        if not untried_actions:
+            return node
+
+        action, prior = self.choose_untried_action(untried_actions)
+        self.board.perform_action(action)
+
+        child = self.new_node(action=action, parent=node, terminal=self.board.is_terminal(), prior=prior)
+        node.add_child(child)
+        return child
 
     def simulation(self, node):
         """
-        Perform the simulation phase of the MCTS algorithm.
+        Perform the simulation phase of the MCTS algorithm. The game is played out on the working 
+        board, which must be at the state of the node, by the rollout policy until the game ends,
+        max_simulations actions have been taken or the policy's max_rounds have been played, and the
+        board is then scored by the policy.
 
         Parameters
         ----------
@@ -188,23 +864,94 @@ class MCTS:
         float
             The reward obtained from the simulation.
         """
-        board = node.state.to_monopoly_board()
+        board = self.board
+        policy = self.rollout_policy
         sims = 0
 
-        while not board.is_terminal() and sims < self.max_simulations:
+        # a truncated rollout stops after a number of rounds
+        end_round = float('inf') if policy.max_rounds is None else board.rounds + policy.max_rounds
+
+        while not board.is_terminal() and sims < self.max_simulations and board.rounds < end_round:
             legal_actions = board.get_legal_actions()
 
             if legal_actions:
-                action = random.choice(legal_actions)
+                action = policy.choose_action(board, legal_actions, self.rng)
                 board.perform_action(action)
+                if self.rave:
+                    self.rollout_actions.add(action)
 
             sims += 1
 
-        return board.calculate_reward()
+        return policy.evaluate(board)
+
+    def simulate_leaf(self, node):
+        """
+        Run the rollouts from an expanded node and return their mean reward. The working board,
+        which must be at the state of the node, is returned to it between rollouts. The actions 
+        taken in the rollouts of an earlier iteration are cleared first, so that only these 
+        rollouts are recorded for RAVE.
+
+        Parameters
+        ----------
+        node : Node
+            The current node in the tree.
+
+        Returns
+        -------
+        float
+            The mean reward of the rollouts.
+        """
+        self.rollout_actions.clear()
+
+        if self.rollouts == 1:
+            return self.simulation(node)
+
+        # return the board to the leaf between rollouts
+        leaf_snapshot = self.board.snapshot()
+        total_reward = self.simulation(node)
+
+        for _ in range(self.rollouts - 1):
+            self.board.restore(leaf_snapshot)
+            total_reward += self.simulation(node)
+
+        return total_reward / self.rollouts
+
+    def rollout_leaves(self, leaf_snapshots):
+        """
+        Run the rollouts from a batch of leaves in the worker processes, for leaf-parallel search.
+        The leaves are dealt out between the workers, and each worker is sent the root state and 
+        the snapshots of its leaves in a single task (see _leaf_batch_worker), drawing from a 
+        substream of one seed.
+
+        Parameters
+        ----------
+        leaf_snapshots : list
+            The snapshot of the board at each leaf (see MonopolyBoardMCTS.snapshot).
+
+        Returns
+        -------
+        list
+            The mean reward of the rollouts from each leaf and the set of actions taken in them, in
+            the order of the leaves.
+        """
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+
+        streams = RandomStreams(self.rng.getrandbits(64))
+        settings = self.worker_settings()
+        tasks = [(self.root.state, leaf_snapshots[worker::self.workers], settings, streams.game_rng(worker))
+                 for worker in range(min(self.workers, len(leaf_snapshots)))]
+
+        results = [None] * len(leaf_snapshots)
+        for worker, worker_results in enumerate(self.pool.starmap(_leaf_batch_worker, tasks)):
+            results[worker::self.workers] = worker_results
+
+        return results
 
     def backpropagation(self, node, reward):
         """
-        Perform the backpropagation phase of the MCTS algorithm.
+        Perform the backpropagation phase of the MCTS algorithm. The statistics of the game state
+        of each node are also updated in the transposition table, if there is one.
 
         Parameters
         ----------
@@ -213,45 +960,777 @@ class MCTS:
         reward : float
             The reward obtained from the simulation.
         """
-        # traverse up the tree to the root
+        transpositions = self.transpositions
+
+        # traverse up the tree to the root, which has no parent
         while node is not None:
             # modify node properties
             node.visits += 1
             node.total_reward += reward
+            if transpositions is not None and node.key is not None:
+                transpositions.update(node.key, reward)
 
             # traverse up the tree until root node is reached
             node = node.parent
 
-    def search(self):
+    def rave_backpropagation(self, node, reward):
         """
-        Run the MCTS algorithm to find the best action to take from the root node.
+        Update the AMAF statistics of the children of the nodes on the path from the root to a node.
+        A child is updated if its action was taken at any point after its parent in this iteration,
+        ie. lower down the path or in the rollouts (see simulation), including rollouts run in 
+        worker processes in leaf-parallel search (see run_leaf_batch).
+
+        Parameters
+        ----------
+        node : Node
+            The node the rollouts were run from.
+        reward : float
+            The reward obtained from the simulation.
+        """
+        actions = self.rollout_actions
+
+        while node is not None:
+            # the children of a chance node are outcomes, not actions
+            if not node.chance:
+                for child in node.children.values():
+                    if child.action in actions:
+                        child.amaf_visits += 1
+                        child.amaf_reward += reward
+
+            actions.add(node.action)
+            node = node.parent
+
+    def search_deadline(self):
+        """
+        Return the time at which a search that starts now must stop, on the time.perf_counter clock.
 
         Returns
         -------
-        object
-            The best action to take from the root node.
+        float
+            The deadline of the search, or None if there is no time budget.
+        """
+        if self.time_budget_ms is None:
+            return None
+
+        return time.perf_counter() + self.time_budget_ms / 1000
+
+    def is_decided(self, remaining):
+        """
+        Check if the best action at the root can no longer change within a number of iterations.
+        The best action is the most visited child of the root (see best_action_so_far), so this is
+        the case when its lead in visits over every other child is more than the remaining 
+        iterations, so that no other child could catch up even if it got every one of them.
+
+        Parameters
+        ----------
+        remaining : float
+            The number of iterations left in the search.
+
+        Returns
+        -------
+        bool
+            True if the best action can no longer change, False otherwise.
+        """
+        visits = sorted([child.visits for child in self.root.children.values()], reverse=True)
+        if not visits:
+            return False
+
+        # untried actions have no visits, so only count as the runner-up if there is no other child
+        runner_up_visits = visits[1] if len(visits) > 1 else 0
+
+        return visits[0] - runner_up_visits > remaining
+
+    def is_ambiguous(self):
         """
-        for _ in range(self.max_iterations):
-            node = self.root
+        Check if the best action at the root is still unclear from the visits of its children. The 
+        decision is clear once every legal action at the root has been tried and the most visited 
+        child has decisive_ratio times more visits than the runner-up.
+
+        Returns
+        -------
+        bool
+            True if the decision is still ambiguous, False otherwise.
+        """
+        if self.root.untried_actions:
+            return True
+
+        visits = sorted([child.visits for child in self.root.children.values()], reverse=True)
+
+        return len(visits) > 1 and visits[0] < self.decisive_ratio * visits[1]
+
+    def forced_action(self):
+        """
+        Return the only legal action at the root, if there is no choice to make. The child for the
+        action is expanded if it does not exist yet, so that the root can be advanced to it, but no
+        rollout is run.
+
+        Returns
+        -------
+        int
+            The id of the forced action, or None if there is a choice of actions (or none at all).
+        """
+        root = self.root
+        if root.is_terminal() or len(self.cache_legal_actions(root).legal_actions) != 1:
+            return None
+
+        action = root.legal_actions[0]
+        if action not in root.children:
+            root_snapshot = self.board.snapshot()
+            if self.open_loop:
+                self.open_loop_expansion(root)
+            else:
+                self.expansion(root)
+            self.board.restore(root_snapshot)
 
-            # selection phase
-            node = self.selection(node)
+        return action
 
-            # expansion phase
+    def is_search_over(self, iteration, iterations, start, deadline):
+        """
+        Check if a search should stop before its next iteration, because the deadline has passed or,
+        if early stopping is enabled, because the best action is decided.
+
+        Parameters
+        ----------
+        iteration : int
+            The number of iterations run so far.
+        iterations : int
+            The number of iterations the search was asked to run.
+        start : float
+            The time at which the search started, on the time.perf_counter clock.
+        deadline : float
+            The time at which to stop (see search_deadline), or None if there is no deadline.
+
+        Returns
+        -------
+        bool
+            True if the search should stop, False otherwise.
+        """
+        if deadline is None and not self.early_stopping:
+            return False
+
+        now = time.perf_counter()
+        if deadline is not None and now >= deadline:
+            return True
+
+        # the iterations left before the deadline are estimated from the time per iteration so far
+        remaining = iterations - iteration
+        if deadline is not None and iteration:
+            remaining = min(remaining, (deadline - now) * iteration / (now - start))
+
+        return self.early_stopping and self.is_decided(remaining)
+
+    def select_leaf(self):
+        """
+        Perform the selection and expansion phases of the MCTS algorithm from the root node, moving
+        the working board to the leaf. Sampled outcomes are only replayed in a closed-loop tree.
+
+        Returns
+        -------
+        Node
+            The leaf to run the rollouts from.
+        """
+        if self.open_loop:
+            node = self.open_loop_selection(self.root)
+            if not self.board.is_terminal():
+                node = self.open_loop_expansion(node)
+        else:
+            node = self.selection(self.root)
             if not node.is_terminal():
                 node = self.expansion(node)
 
+        return node
+
+    def add_virtual_loss(self, node, virtual_loss):
+        """
+        Add virtual visits (ie. visits with no reward) to the nodes on the path from the root to a
+        node, so that the other leaves of a batch in leaf-parallel search are steered away from the
+        path while its rollouts are pending. A negative number removes them again.
+
+        Parameters
+        ----------
+        node : Node
+            The last node on the path.
+        virtual_loss : int
+            The number of virtual visits to add to each node.
+        """
+        while node is not None:
+            node.visits += virtual_loss
+            node = node.parent
+
+    def run_leaf_batch(self, batch, root_snapshot):
+        """
+        Run a batch of iterations of leaf-parallel MCTS. A leaf is selected for each iteration, 
+        with virtual loss on its path while it is pending, and the rollouts from all of the leaves
+        are then run in the worker processes at once (see rollout_leaves) and backed up.
+
+        Parameters
+        ----------
+        batch : int
+            The number of iterations in the batch.
+        root_snapshot : list
+            The snapshot of the working board at the root, which it is returned to after each leaf.
+        """
+        leaves = []
+        leaf_snapshots = []
+
+        # selection & expansion phases for every leaf of the batch
+        for _ in range(batch):
+            node = self.select_leaf()
+            self.add_virtual_loss(node, self.virtual_loss)
+            leaves.append(node)
+            leaf_snapshots.append(self.board.snapshot())
+            self.board.restore(root_snapshot)
+
+        # simulation phase in the workers, then backpropagation phase for every leaf
+        for node, (reward, actions) in zip(leaves, self.rollout_leaves(leaf_snapshots)):
+            self.add_virtual_loss(node, -self.virtual_loss)
+            self.backpropagation(node, reward)
+            if self.rave:
+                self.rollout_actions = actions
+                self.rave_backpropagation(node, reward)
+
+    def grow_tree(self, iterations, deadline=None):
+        """
+        Run a number of iterations of the MCTS algorithm from the root node. The search stops early
+        at the deadline, or once the best action is decided if early stopping is enabled. In 
+        leaf-parallel search the iterations are run in batches of leaf_batch (see run_leaf_batch),
+        and the search can only stop between batches.
+
+        Parameters
+        ----------
+        iterations : int
+            The number of iterations to run.
+        deadline : float, optional
+            The time at which to stop (see search_deadline), by default None (no deadline).
+
+        Returns
+        -------
+        int
+            The number of iterations run.
+        """
+        # decode the root state once, the board is then returned to the root after every iteration
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+        root_snapshot = self.board.snapshot()
+        start = time.perf_counter()
+        leaf_parallel = self.workers > 1 and self.parallelism == 'leaf'
+        iteration = 0
+
+        while iteration < iterations:
+            if self.is_search_over(iteration, iterations, start, deadline):
+                break
+
+            if leaf_parallel:
+                batch = min(self.leaf_batch, iterations - iteration)
+                self.run_leaf_batch(batch, root_snapshot)
+                iteration += batch
+
+            else:
+                # selection & expansion phases
+                node = self.select_leaf()
+
+                # simulation phase
+                reward = self.simulate_leaf(node)
+
+                # backpropagation phase
+                self.backpropagation(node, reward)
+                if self.rave:
+                    self.rave_backpropagation(node, reward)
+
+                # return the working board to the root state
+                self.board.restore(root_snapshot)
+                iteration += 1
+
+            if self.max_nodes is not None and self.num_nodes > self.max_nodes:
+                self.evict_leaves()
+
+        return iteration
+
+    def search_step(self, iterations=1):
+        """
+        Run a number of iterations of the MCTS algorithm on the tree of Node objects in this process,
+        continuing the current search. Together with best_action_so_far, this lets a caller search 
+        in steps and stop whenever it needs a move, then play it with advance.
+
+        Parameters
+        ----------
+        iterations : int, optional
+            The number of iterations to run, by default 1.
+
+        Returns
+        -------
+        int
+            The number of iterations run, which is less than requested if early stopping is enabled
+            and the best action is decided.
+        """
+        return self.grow_tree(iterations)
+
+    def best_action_so_far(self):
+        """
+        Return the best action to take from the root node given the search so far, as chosen at the
+        end of a search. This is the robust child, ie. the most visited child of the root, with ties
+        broken by mean reward. Visits are used rather than UCT values, since they are what early
+        stopping checks (see is_decided) and are less noisy than the rewards of rarely visited 
+        children.
+
+        Returns
+        -------
+        int
+            The id of the best action, or None if no action has been tried yet.
+        """
+        best_action = None
+        best_key = None
+
+        for child in self.root.children.values():
+            key = (child.visits, child.total_reward / child.visits if child.visits else float('-inf'))
+            if best_key is None or key > best_key:
+                best_action, best_key = child.action, key
+
+        return best_action
+
+    def root_statistics(self):
+        """
+        Return the visits, total reward and undo token of each child of the root node. Undo tokens
+        refer to players and properties by index, so they can be replayed on any board at the root
+        state.
+
+        Returns
+        -------
+        dict
+            The (visits, total reward, undo token, terminal) of each child, keyed by action id.
+        """
+        return {child.action: (child.visits, child.total_reward, child.token, child.terminal)
+                for child in self.root.children.values()}
+
+    def worker_settings(self):
+        """
+        Return the settings of the search that worker processes search with, as keyword arguments
+        of MCTS. A worker always searches in a single process.
+
+        Returns
+        -------
+        dict
+            The settings of the search.
+        """
+        return {'exploration_weight': self.exploration_weight, 'max_simulations': self.max_simulations,
+                'virtual_loss': self.virtual_loss, 'rollouts': self.rollouts,
+                'max_transpositions': self.max_transpositions, 'open_loop': self.open_loop,
+                'chance_nodes': self.chance_nodes, 'widening_constant': self.widening_constant,
+                'widening_exponent': self.widening_exponent, 'time_budget_ms': self.time_budget_ms,
+                'rave': self.rave, 'rave_equivalence': self.rave_equivalence, 'prior': self.prior,
+                'prior_weight': self.prior_weight, 'rollout_policy': self.rollout_policy}
+
+    def search_parallel(self):
+        """
+        Grow independent trees from the root state in the worker processes, each with its own
+        random number stream, and merge the visits and rewards of their root children into the 
+        children of the root node. A child that is new to the root keeps the undo token (ie. the
+        sampled outcome of the action) of the first worker that tried it.
+        """
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+
+        # split the iterations between the workers, each drawing from a substream of one seed
+        streams = RandomStreams(self.rng.getrandbits(64))
+        iterations = [self.max_iterations // self.workers + (worker < self.max_iterations % self.workers)
+                      for worker in range(self.workers)]
+        tasks = [(self.root.state, worker_iterations, self.worker_settings(), streams.game_rng(worker))
+                 for worker, worker_iterations in enumerate(iterations) if worker_iterations > 0]
+
+        for root_visits, statistics in self.pool.starmap(_search_worker, tasks):
+            self.root.visits += root_visits
+
+            for action, (visits, total_reward, token, terminal) in statistics.items():
+                try:
+                    child = self.root.get_child_with_action(action)
+                except ChildNotFoundError:
+                    child = self.new_node(action=action, parent=self.root, token=token, terminal=terminal)
+                    self.root.add_child(child)
+
+                child.visits += visits
+                child.total_reward += total_reward
+
+    def best_shared_child(self, tree, node, children):
+        """
+        Select the child of a node in the shared tree with the highest UCT value (see uct). Virtual
+        visits count as visits with no reward.
+
+        Parameters
+        ----------
+        tree : SharedTree
+            The shared tree.
+        node : int
+            The index of the node.
+        children : list
+            The indices of the children to choose from.
+
+        Returns
+        -------
+        int
+            The index of the best child.
+        """
+        visits = tree.visits[children]
+        total_reward = tree.total_reward[children]
+
+        # unvisited children are chosen first, as in uct
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited):
+            return children[unvisited[0]]
+
+        log_visits = np.log(max(tree.visits[node], 1))
+        uct_values = total_reward / visits + self.exploration_weight * (log_visits / visits) ** 0.5
+
+        return children[int(np.argmax(uct_values))]
+
+    def grow_shared_tree(self, tree, iterations, deadline=None):
+        """
+        Run a number of iterations of tree-parallel MCTS on the shared tree. Virtual loss is added
+        to each node as the path is selected and removed again in backpropagation. The nodes only
+        hold action ids, so the undo token of each node this worker visits is kept locally; a node
+        added by another worker is entered by performing its action on the working board.
+
+        Parameters
+        ----------
+        tree : SharedTree
+            The shared tree, which other workers may be growing at the same time.
+        iterations : int
+            The number of iterations to run.
+        deadline : float, optional
+            The time at which to stop (see search_deadline), by default None (no deadline).
+
+        Returns
+        -------
+        dict
+            The (undo token, terminal) of each child of the root this worker visited, keyed by
+            action id.
+        """
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+        board = self.board
+        root_snapshot = board.snapshot()
+        tokens = {}
+
+        for _ in range(iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            node = 0
+            path = [node]
+            tree.add_virtual_loss(path, self.virtual_loss)
+
+            # selection & expansion phases, the children tried depend on the legal actions of this board
+            while not board.is_terminal():
+                legal_actions = board.get_legal_actions()
+                if not legal_actions:
+                    break
+
+                children = tree.get_children(node)
+                untried_actions = [action for action in legal_actions if action not in children]
+
+                if untried_actions:
+                    child = tree.add_child(node, self.rng.choice(untried_actions))
+                    if child < 0:
+                        break
+                else:
+                    child = self.best_shared_child(tree, node, [children[action] for action in legal_actions])
+
+                tree.add_virtual_loss([child], self.virtual_loss)
+                path.append(child)
+
+                if child in tokens:
+                    board.redo(tokens[child][0])
+                else:
+                    tokens[child] = (board.apply(int(tree.action[child])), board.is_terminal())
+
+                node = child
+
+                # stop at the first node that is new to this worker
+                if untried_actions:
+                    break
+
             # simulation phase
-            reward = self.simulation(node)
+            reward = self.simulate_leaf(None)
 
             # backpropagation phase
-            self.backpropagation(node, reward)
+            tree.backpropagate(path, reward, self.virtual_loss)
+
+            # return the working board to the root state
+            board.restore(root_snapshot)
+
+        return {int(tree.action[child]): outcome for child, outcome in tokens.items() if tree.parent[child] == 0}
+
+    def search_tree_parallel(self):
+        """
+        Grow a single tree from the root state in shared memory with all the worker processes, each
+        with its own random number stream, then read the visits and rewards of the root children
+        into the children of the root node. A child that is new to the root keeps the undo token 
+        (ie. the sampled outcome of the action) of the first worker that visited it.
+        """
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+
+        # split the iterations between the workers, each drawing from a substream of one seed
+        streams = RandomStreams(self.rng.getrandbits(64))
+        iterations = [self.max_iterations // self.workers + (worker < self.max_iterations % self.workers)
+                      for worker in range(self.workers)]
+        tasks = [(self.root.state, worker_iterations, self.worker_settings(), streams.game_rng(worker))
+                 for worker, worker_iterations in enumerate(iterations) if worker_iterations > 0]
+
+        # if the search fails, the pool is shut down and the shared memory block of the tree freed,
+        # since the block would otherwise outlive the process
+        outcomes = {}
+        try:
+            # the tree is sized for the largest search, since every iteration adds at most one node
+            if self.pool is None:
+                self.tree = SharedTree(self.max_iterations + 1)
+                self.pool = multiprocessing.Pool(self.workers, _attach_shared_tree,
+                                                 (self.tree.capacity, self.tree.shm.name, self.tree.lock,
+                                                  self.tree.stat_locks))
+            tree = self.tree
+            tree.reset()
+
+            for worker_outcomes in self.pool.starmap(_tree_search_worker, tasks):
+                for action, outcome in worker_outcomes.items():
+                    outcomes.setdefault(action, outcome)
+        except BaseException:
+            self.close()
+            raise
+
+        self.root.visits += int(tree.visits[0])
+        for action, child_idx in tree.get_children(0).items():
+            try:
+                child = self.root.get_child_with_action(action)
+            except ChildNotFoundError:
+                token, terminal = outcomes[action]
+                child = self.new_node(action=action, parent=self.root, token=token, terminal=terminal)
+                self.root.add_child(child)
+
+            child.visits += int(tree.visits[child_idx])
+            child.total_reward += float(tree.total_reward[child_idx])
+
+    def array_tree_selection(self, tree):
+        """
+        Perform the selection and expansion phases of the MCTS algorithm on the array tree, moving
+        the working board with the selected node.
+
+        Parameters
+        ----------
+        tree : ArrayTree
+            The tree of the search.
+
+        Returns
+        -------
+        list
+            The indices of the nodes on the path from the root to the leaf.
+        """
+        board = self.board
+        node = 0
+        path = [node]
+
+        while not tree.terminal[node]:
+            if tree.num_children[node] < 0:
+                tree.add_children(node, board.get_legal_actions())
+
+            # an agent with no legal actions is bankrupt, which get_legal_actions records on the board
+            elif tree.num_children[node] == 0:
+                board.get_legal_actions()
+
+            if tree.num_children[node] == 0:
+                break
+
+            # expand a random untried child, or move to the child with the highest UCT value
+            if tree.num_untried[node]:
+                untried_actions = tree.untried_actions(node)
+                action = self.rng.choice(untried_actions)
+                token = board.apply(action)
+                path.append(tree.expand(node, untried_actions.index(action), token, board.is_terminal()))
+                break
+
+            node = tree.best_child(node, self.exploration_weight)
+            board.redo(tree.tokens[node])
+            path.append(node)
+
+        return path
+
+    def search_array_tree(self):
+        """
+        Grow a tree stored in NumPy arrays from the root state, then read the visits and rewards of
+        the root children into the children of the root node. The phases are the same as for a tree
+        of Node objects, but the UCT values of all the children of a node are calculated at once and
+        no Python object is created for a node. In leaf-parallel search the iterations are run in 
+        batches of leaf_batch, as in grow_tree.
+        """
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+        if self.array_tree is None:
+            self.array_tree = ArrayTree()
+        board = self.board
+        tree = self.array_tree
+        tree.reset(self.root.is_terminal())
+        root_snapshot = board.snapshot()
+        deadline = self.search_deadline()
+
+        leaf_parallel = self.workers > 1 and self.parallelism == 'leaf'
+        iteration = 0
+
+        while iteration < self.max_iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            # in leaf-parallel search, the rollouts from a batch of leaves are run in the workers at once
+            if leaf_parallel:
+                paths = []
+                leaf_snapshots = []
+                for _ in range(min(self.leaf_batch, self.max_iterations - iteration)):
+                    path = self.array_tree_selection(tree)
+                    tree.add_virtual_loss(path, self.virtual_loss)
+                    paths.append(path)
+                    leaf_snapshots.append(board.snapshot())
+                    board.restore(root_snapshot)
+
+                for path, (reward, _) in zip(paths, self.rollout_leaves(leaf_snapshots)):
+                    tree.backpropagate(path, reward, self.virtual_loss)
+                iteration += len(paths)
+                continue
+
+            # selection & expansion phases
+            path = self.array_tree_selection(tree)
+
+            # simulation phase
+            reward = self.simulate_leaf(None)
+
+            # backpropagation phase
+            tree.backpropagate(path, reward)
+
+            # return the working board to the root state
+            board.restore(root_snapshot)
+            iteration += 1
+
+        self.root.visits += int(tree.visits[0])
+        start = tree.first_child[0]
+        for child_idx in range(start, start + max(tree.num_children[0] - tree.num_untried[0], 0)):
+            action = int(tree.action[child_idx])
+            try:
+                child = self.root.get_child_with_action(action)
+            except ChildNotFoundError:
+                child = self.new_node(action=action, parent=self.root, token=tree.tokens[child_idx],
+                                      terminal=bool(tree.terminal[child_idx]))
+                self.root.add_child(child)
+
+            child.visits += int(tree.visits[child_idx])
+            child.total_reward += float(tree.total_reward[child_idx])
+
+    def search(self):
+        """
+        Run the MCTS algorithm to find the best action to take from the root node. If there is
+        more than one worker, the search is root-parallel (see search_parallel), tree-parallel 
+        (see search_tree_parallel) or leaf-parallel (see run_leaf_batch). Otherwise the tree is stored 
+        as set by tree_backend. The search is limited by max_iterations and time_budget_ms, and by 
+        the difficulty of the decision with an adaptive budget.
+
+        Returns
+        -------
+        object
+            The best action to take from the root node.
+        """
+        if self.board is None:
+            self.board = self.root.state.to_monopoly_board(self.rng)
+        root_visits = self.root.visits
+
+        # forced moves are played without a search
+        if self.adaptive_budget:
+            forced_action = self.forced_action()
+            if forced_action is not None:
+                self.iterations_used.append(0)
+                return forced_action
+
+        if self.workers > 1 and self.parallelism == 'tree':
+            self.search_tree_parallel()
+        elif self.workers > 1 and self.parallelism == 'root':
+            self.search_parallel()
+        elif self.tree_backend == 'array':
+            self.search_array_tree()
+        elif self.adaptive_budget:
+            deadline = self.search_deadline()
+            stage = max(self.max_iterations // 4, 1)
+            iterations = 0
+
+            # search in stages until the decision is clear, or the search is stopped early
+            while iterations < self.max_iterations:
+                stage_iterations = min(stage, self.max_iterations - iterations)
+                iterations_run = self.grow_tree(stage_iterations, deadline)
+                iterations += iterations_run
+                if iterations_run < stage_iterations or not self.is_ambiguous():
+                    break
+        else:
+            self.grow_tree(self.max_iterations, self.search_deadline())
+
+        # root visits from earlier searches are carried over, so only the new visits are counted
+        self.iterations_used.append(self.root.visits - root_visits)
 
         # select the best action to take from the root node
-        best_action = self.select_best_action(self.root)
+        best_action = self.best_action_so_far()
 
         return best_action
+
+    def close(self):
+        """
+        Shut down the pool of worker processes and free the shared tree, if there are any.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+        if self.tree is not None:
+            self.tree.close()
+            self.tree.unlink()
+            self.tree = None
     
+    def advance(self, action):
+        """
+        Move the root node and the working board to the child for an action, once the action has 
+        been chosen by a search (see run, or search_step and best_action_so_far). The new root is 
+        detached from its parent, and the rest of the old tree is released to the node pool.
+
+        Parameters
+        ----------
+        action : int
+            The id of the action taken, which must have a child at the root node.
+        """
+        self.best_actions.append(action)
+
+        # update root node to the child node corresponding to the action, keeping only its subtree
+        old_root = self.root
+        root = old_root.get_child_with_action(action)
+        del old_root.children[action]
+        self.release_subtree(old_root)
+        root.parent = None
+
+        # move the working board to the new root, sampling the outcome if the node does not hold one
+        if root.token is not None:
+            self.board.redo(root.token)
+        elif self.open_loop:
+            self.board.perform_action(action)
+            root.terminal = self.board.is_terminal()
+
+        # the outcomes of a chance node were only drawn for the search, so the game continues from a
+        # fresh outcome and a new tree
+        else:
+            token = self.board.apply(action)
+            self.release_subtree(root)
+            root = self.new_node(action=action, token=token, terminal=self.board.is_terminal())
+
+        self.root = root
+
+        # record the state of the new root
+        self.root.state = State()
+        self.root.state.from_monopoly_board(self.board)
+        if self.root.key is None:
+            self.root.key = self.board.zobrist_hash()
+
     def run(self):
         """
         Run a single iteration of the MCTS algorithm.
@@ -264,13 +1743,11 @@ class MCTS:
         best_action = self.search()
 
         # if there is no best action, there is no action choice at all
-        if not best_action: 
+        if best_action is None:
             return
 
-        self.best_actions.append(best_action)
-            
-        # update root node to the child node corresponding to best action
-        self.root = self.root.get_child_with_action(best_action)
+        self.advance(best_action)
+        return best_action
 
     def run_game(self, max_actions=1000, max_rounds=float('inf')):
         """
@@ -293,6 +1770,7 @@ class MCTS:
             pbar.update(1) 
 
         pbar.close()
+        self.close()
 
     def run_game_quiet(self, max_actions=1000, max_rounds=float('inf')):
         """
@@ -312,5 +1790,7 @@ class MCTS:
             self.run()
             actions += 1
 
+        self.close()
+
 class GameLogicError(Exception):
     pass
\ No newline at end of file
@@ -4,6 +4,7 @@ import copy
 from Node import Node
 from State import State
 from NN import NN
+from MonopolyBoardMCTS import MonopolyBoardMCTS
 from tqdm import tqdm
 import torch.optim as optim
 import torch.nn as nn
@@ -22,6 +23,9 @@ class MCTS:
         A list to store the best actions found during the search.
     exploration_weight : float, optional
         The exploration weight parameter for the UCT (Upper Confidence Bound for Trees) formula.
+    rng : random.Random
+        The random number generator for choosing actions and rolling the dice (the random module
+        by default).
     q_network : NN
         The neural network used for Q-value estimation.
     optimizer : torch.optim.Optimizer
@@ -35,6 +39,8 @@ class MCTS:
         Calculates the UCT (Upper Confidence Bound for Trees) value for a given node.
     select_best_action(node)
         Selects the best action based on the UCT values of the child nodes.
+    cache_legal_actions(node)
+        Caches the legal actions from a node the first time they are needed.
     selection(node)
         Performs the selection phase of the MCTS algorithm.
     expansion(node)
@@ -51,12 +57,13 @@ class MCTS:
         Runs the MCTS algorithm for a specified number of actions or until the game ends.
     """
 
-    def __init__(self, root_state, max_iterations, exploration_weight=1, state_size=1000):
+    def __init__(self, root_state, max_iterations, exploration_weight=1, state_size=1000, rng=None):
         self.root = Node(root_state)
+        self.rng = rng if rng is not None else random
         self.max_iterations = max_iterations
         self.best_actions = []
         self.exploration_weight = exploration_weight
-        self.q_network = NN(input_size=state_size, output_size=len(root_state.get_legal_actions()))
+        self.q_network = NN(input_size=state_size, output_size=MonopolyBoardMCTS.NUM_ACTIONS)
         self.optimizer = optim.Adam(self.q_network.parameters(), lr=0.001)
         self.criterion = nn.MSELoss()
 
@@ -99,7 +106,7 @@ class MCTS:
         best_action = None
         best_value = float('-inf')
 
-        for child in node.children:
+        for child in node.children.values():
             uct_value = self.uct(child)
 
             if uct_value > best_value:
@@ -108,6 +115,25 @@ class MCTS:
 
         return best_action
 
+    def cache_legal_actions(self, node):
+        """
+        Caches the legal actions from a node the first time they are needed.
+
+        Parameters
+        ----------
+        node : Node
+            The node for which to cache the legal actions.
+
+        Returns
+        -------
+        Node
+            The node.
+        """
+        if node.legal_actions is None:
+            node.set_legal_actions(node.state.to_monopoly_board(self.rng).get_legal_actions())
+
+        return node
+
     def selection(self, node):
         """
         Performs the selection phase of the MCTS algorithm.
@@ -122,13 +148,11 @@ class MCTS:
         Node
             The selected node for expansion or simulation.
         """
-        board = node.state.to_monopoly_board()
-        legal_actions = board.get_legal_actions()
-
-        while not node.is_terminal() and len(node.children) == len(legal_actions):
+        # the legal actions of each node are cached, so a board is only decoded on the first visit
+        while not node.is_terminal() and not self.cache_legal_actions(node).untried_actions:
             best_action = self.select_best_action(node)
 
-            if best_action:
+            if best_action is not None:
                 node = node.get_child_with_action(best_action)
             else:
                 return node
@@ -149,27 +173,24 @@ class MCTS:
         Node
             The child node created during the expansion.
         """
-        board = node.state.to_monopoly_board()
-        legal_actions = board.get_legal_actions()
-
-        children_actions = [child.action for child in node.children]
-        untried_actions = [action for action in legal_actions if action not in children_actions]
+        untried_actions = self.cache_legal_actions(node).untried_actions
 
         if untried_actions:
-            action = random.choice(untried_actions)
+            action = self.rng.choice(untried_actions)
+            board = node.state.to_monopoly_board(self.rng)
             board.perform_action(action)
 
             new_state = State()
             new_state.from_monopoly_board(board)
 
             child = Node(new_state, action, parent=node)
-            node.children.append(child)
+            node.add_child(child)
 
             return child
 
         else:
             best_action = self.select_best_action(node)
-            if not best_action:
+            if best_action is None:
                 return node
             return node.get_child_with_action(best_action)
 
@@ -187,18 +208,19 @@ class MCTS:
         float
             The reward obtained from the simulation.
         """
-        board = node.state.to_monopoly_board()
+        board = node.state.to_monopoly_board(self.rng)
 
         while not board.is_terminal():
             legal_actions = board.get_legal_actions()
 
             if legal_actions:
                 state = State()
-                state.to_monopoly_board(board)
+                state.from_monopoly_board(board)
                 state_tensor = torch.tensor(state.preprocess_state()).float().unsqueeze(0)
                 q_values = self.q_network(state_tensor).detach().numpy()
 
-                action = np.argmax(q_values)
+                # q-values are indexed by action id, so only the legal actions are compared
+                action = legal_actions[np.argmax(q_values[0, legal_actions])]
                 board.perform_action(action)
 
         return board.calculate_reward()
@@ -219,9 +241,7 @@ class MCTS:
             q_values = self.q_network(state_tensor)
 
             best_action = self.select_best_action(node)
-            best_action_index = node.state.get_legal_actions().index(best_action)
-
-            q_values[0, best_action_index] += reward
+            q_values[0, best_action] += reward
 
             target_q_values = torch.tensor(q_values).float()
             loss = self.criterion(self.q_network(state_tensor), target_q_values)
@@ -262,7 +282,7 @@ class MCTS:
         """
         best_action = self.search()
 
-        if not best_action:
+        if best_action is None:
             return
 
         self.best_actions.append(best_action)
@@ -12,6 +12,11 @@ from Tax import Tax
 from Utility import Utility
 import random
 import numpy as np
+
+# board without players that later boards copy their spaces from, so that the fixed data of every
+# space is only created once per process
+_template_board = None
+
 class MonopolyBoardMCTS:
     """
     This class represents the Monopoly board and the game logic. It provides methods for creating 
@@ -47,10 +52,44 @@ class MonopolyBoardMCTS:
         A dictionary of property sets grouped by colour.
     strategy: obj
         The object containing the strategy for the players.
+    rng: obj
+        The random number generator used for dice rolls, deck shuffles and the player order (the 
+        random module by default, or a seeded random.Random for a reproducible game).
+    ownables: lst
+        A list of all properties that can be owned (streets, then stations, then utilities).
+    ownable_index: lst
+        The index in ownables of the property at each location on the board (None if the space 
+        cannot be owned).
+    action_names: lst
+        The readable name of each action in the integer action space.
+    action_ids: dict
+        The action id for each readable action name.
+    action_mask: np.ndarray
+        Whether each property action of the agent player is allowed by the ownership, buildings and
+        mortgages on the board, kept up to date as these change.
+    action_costs: np.ndarray
+        The money the agent player needs to perform each action.
+    rent_table: lst
+        The rent on each property for every state it can be in (see create_rent_table).
+    current_rent: lst
+        The rent on the property at each location on the board, updated when the owners, buildings 
+        and mortgages of properties change.
+    stale_rents: set
+        The players whose holdings have changed since the current rent on their properties was last 
+        updated. The rent on their properties is updated before it is next paid.
+    funds_actions: np.ndarray
+        Which actions raise funds, these being the only property actions allowed when the agent player
+        owes money or must leave jail.
+    zobrist_keys: dict
+        The random 64-bit keys that are combined into the hash of the game state (see create_zobrist_keys).
+    zobrist: int
+        The hash of the current game state, or None if it must be recalculated (see zobrist_hash).
+    records: lst
+        The records of the current game state, or None if they must be recalculated (see snapshot).
 
     Methods
     -------
-    __init__()
+    __init__(rng=None)
         Initialises the MonopolyBoard with all necessary properties and spaces.
     create_properties()
         Creates instances of the Street class for street properties on the board.
@@ -72,8 +111,36 @@ class MonopolyBoardMCTS:
         Creates the Free Parking space and places it on the board.
     create_go_to_jail()
         Creates the Go To Jail space and places it on the board.
-    add_player(player)
+    copy_spaces(board)
+        Places copies of the spaces of another board on this board, sharing their fixed data.
+    create_rent_table()
+        Creates the rent table of the board and the current rent on every space.
+    update_rent(prop)
+        Updates the current rent on a property and the properties whose rent depends on it.
+    update_player_rents(player)
+        Updates the current rent on every property group in which a player owns a property.
+    current_rent_on(space)
+        Returns the current rent on a property, first updating it if the owner's holdings have changed.
+    reset_rents()
+        Recalculates the current rent on all properties.
+    create_actions()
+        Creates the fixed integer action space of the agent player.
+    create_zobrist_keys()
+        Creates the random keys for hashing the game state.
+    record_key(idx, record)
+        Returns the hash key of a record in a snapshot of the board.
+    zobrist_hash()
+        Returns the hash of the current game state.
+    update_action_mask(prop)
+        Updates the legal action mask for the agent player's actions on a property.
+    reset_action_mask()
+        Recalculates the legal action mask for all properties.
+    add_other_player(player)
         Adds a player to the game.
+    add_agent(agent)
+        Adds the agent player to the game.
+    clone()
+        Creates a copy of the board that shares all immutable space definitions.
     play_game(stopping_condition=float('inf'))
         Starts the Monopoly game and continues until there is a winner or a stopping condition 
         is met.
@@ -87,9 +154,50 @@ class MonopolyBoardMCTS:
         Handles actions when a player lands on a property space.
     raise_funds(player, cost)
         Raises funds for a player by selling houses and mortgaging properties.
+    legal_action_mask()
+        Gets a mask of the legal actions of the agent player.
+    get_legal_actions()
+        Gets the legal actions of the agent player.
+    perform_action(action)
+        Performs an action for the agent player.
+    player_record(player, player_idx)
+        Returns the record of the mutable state of a player.
+    property_record(prop, player_idx)
+        Returns the record of the mutable state of a property.
+    current_records()
+        Returns the records of the current game state.
+    snapshot()
+        Records all mutable game state on the board.
+    restore(snapshot)
+        Restores the board to a snapshot.
+    apply(action)
+        Performs an action for the agent player and returns an undo token.
+    undo(token)
+        Reverts an action performed with apply().
+    redo(token)
+        Replays an action performed with apply().
     """
 
-    def __init__(self):
+    # the kinds of property action, with one action id for each ownable property
+    MORTGAGE, UNMORTGAGE, SELL_HOTEL, SELL_HOUSE, BUY_HOTEL, BUY_HOUSE, PURCHASE = range(7)
+    PROPERTY_ACTIONS = ("Mortgage", "Unmortgage", "Sell hotel on", "Sell house on", "Buy hotel on", "Buy house on", "Purchase")
+    NUM_OWNABLES = 28
+
+    # the actions that do not involve a property follow the property actions
+    USE_JAIL_CARD = len(PROPERTY_ACTIONS) * NUM_OWNABLES
+    PAY_JAIL_FINE = USE_JAIL_CARD + 1
+    END_TURN = USE_JAIL_CARD + 2
+    NUM_ACTIONS = USE_JAIL_CARD + 3
+
+    # players covered by the hash keys, and the cash buckets that players' money is hashed by
+    MAX_PLAYERS = 8
+    CASH_BUCKET = 50
+    NUM_CASH_BUCKETS = 64
+
+    def __init__(self, rng=None):
+        global _template_board
+
+        self.rng = rng if rng is not None else random
         self.players = []
         self.agent = None
         self.other_players = []
@@ -108,17 +216,31 @@ class MonopolyBoardMCTS:
                               "red":[], "yellow":[], "green":[], "darkblue":[]}
         self.properties_dict = {}
         self.rounds = 0
-
-        self.create_properties()
-        self.create_stations()
-        self.create_utilities()
-        self.create_chance()
-        self.create_community_chest()
-        self.create_tax()
-        self.create_go()
-        self.create_jail()
-        self.create_free_parking()
-        self.create_go_to_jail()
+        self.zobrist = None
+        self.records = None
+
+        # spaces are created from their definitions for the first board only, later boards copy them
+        if _template_board is None:
+            self.create_properties()
+            self.create_stations()
+            self.create_utilities()
+            self.create_chance()
+            self.create_community_chest()
+            self.create_tax()
+            self.create_go()
+            self.create_jail()
+            self.create_free_parking()
+            self.create_go_to_jail()
+            self.create_rent_table()
+            self.create_actions()
+            self.create_zobrist_keys()
+
+            _template_board = object.__new__(MonopolyBoardMCTS)
+            _template_board.copy_spaces(self)
+        else:
+            self.copy_spaces(_template_board)
+            self.create_chance()
+            self.create_community_chest()
 
         self.strategy = Strategy()
 
@@ -245,7 +367,7 @@ class MonopolyBoardMCTS:
         chance_locs = [7, 22, 36]
 
         # create instance of class with corresponding attributes & store them
-        chance = Chance(chance_locs)
+        chance = Chance(chance_locs, self.rng)
         self.chance = chance
 
         for loc in chance_locs:
@@ -269,7 +391,7 @@ class MonopolyBoardMCTS:
         community_chest_locs = [2, 17, 33]
 
         # create instance of class with corresponding attributes & store them
-        community_chest = CommunityChest(community_chest_locs)
+        community_chest = CommunityChest(community_chest_locs, self.rng)
         self.community_chest = community_chest
 
         for loc in community_chest_locs:
@@ -385,6 +507,421 @@ class MonopolyBoardMCTS:
         self.board[loc] = go_to_jail
         self.go_to_jail = go_to_jail
 
+    def copy_spaces(self, board):
+        """
+        This method places copies of the spaces of another board (without any players) on this board.
+        The spaces that never change (Go, Jail, Free Parking, Go To Jail and the tax spaces), the rent
+        table and the hash keys are shared between the boards. Each property is copied, but the copy shares the 
+        fixed data of the property (name, prices, rent schedule, group and location) with the original,
+        so only the owner, houses, hotel and mortgage of the property belong to this board alone. The 
+        Chance and Community Chest piles are not copied, since every board shuffles its own cards.
+        
+        Parameters
+        ----------
+        board: obj
+            The board to copy the spaces from.
+        
+        Returns
+        -------
+        None
+        """
+        # updating the attributes of a new object (rather than replacing them) keeps the compact
+        # attribute storage that Python shares between objects of the same class
+        spaces = {board.chance: None, board.community_chest: None}
+        for space in board.properties + board.stations + board.utilities:
+            space_copy = object.__new__(space.__class__)
+            space_copy.__dict__.update(space.__dict__)
+            spaces[space] = space_copy
+
+        copy_of = spaces.__getitem__
+        self.board = [spaces.get(space, space) for space in board.board]
+        self.properties = list(map(copy_of, board.properties))
+        self.stations = list(map(copy_of, board.stations))
+        self.utilities = list(map(copy_of, board.utilities))
+        self.property_sets = {group: list(map(copy_of, group_properties))
+                              for group, group_properties in board.property_sets.items()}
+        self.tax = list(board.tax)
+        self.chance = self.community_chest = None
+        self.go, self.jail, self.free_parking, self.go_to_jail = board.go, board.jail, board.free_parking, board.go_to_jail
+
+        self.properties_dict = {name: copy_of(prop) for name, prop in board.properties_dict.items()}
+
+        self.rent_table = board.rent_table
+        self.current_rent = board.current_rent.copy()
+        self.stale_rents = set()
+
+        # the action space is the same for every board
+        self.ownables = self.properties + self.stations + self.utilities
+        self.ownable_index = board.ownable_index
+        self.action_names, self.action_ids = board.action_names, board.action_ids
+        self.action_costs, self.funds_actions = board.action_costs, board.funds_actions
+        self.action_mask = board.action_mask.copy()
+        self.zobrist_keys = board.zobrist_keys
+
+    def create_rent_table(self):
+        """
+        This method creates the rent table of the board and the current rent on every space. The rent
+        table holds the rent on each property for every state that the property can be in, indexed as
+        rent_table[loc][level][count]. For streets, level is the development of the street (0 for no
+        houses, 1-4 for the number of houses and 5 for a hotel) and count is 1 if the owner owns the 
+        entire colour group (0 otherwise). For stations and utilities, level is always 0 and count is
+        the number of stations/utilities owned by the owner (the rent on a utility is the multiplier 
+        of the dice roll). Spaces that cannot be owned have no rent. This must be called after all 
+        properties have been created.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.rent_table = [[[0]*5 for _ in range(6)] for _ in range(40)]
+
+        for street in self.properties:
+            table = self.rent_table[street.loc]
+            table[0][0], table[0][1] = street.rent, street.double_rent
+            for num_houses, rent in enumerate(street.house_rent, 1):
+                table[num_houses][0] = table[num_houses][1] = rent
+            table[5][0] = table[5][1] = street.hotel_rent
+
+        for station in self.stations:
+            self.rent_table[station.loc][0][1:] = station.rents
+
+        for utility in self.utilities:
+            self.rent_table[utility.loc][0][1:3] = utility.rent_multipliers
+
+        self.current_rent = [0]*40
+        self.stale_rents = set()
+
+    def update_rent(self, prop):
+        """
+        This method updates the current rent on a property from the rent table. The rent on a street
+        depends on whether its owner owns the entire colour group, and the rent on a station or utility
+        depends on how many of them the owner owns, so the whole group is updated together. This must
+        be called whenever the owner, buildings or mortgage of a property change.
+        
+        Parameters
+        ----------
+        prop: obj
+            An instance of one of the classes Street/Station/Utility.
+        
+        Returns
+        -------
+        None
+        """
+        current_rent = self.current_rent
+
+        if prop.type == "Street":
+            group = self.property_sets[prop.group]
+            full_set = int(all(street.owner is group[0].owner for street in group))
+
+            for street in group:
+                # player can't collect rent when mortgaged
+                if street.owner is None or street.is_mortgaged:
+                    current_rent[street.loc] = 0
+                else:
+                    level = 0 if street.num_houses == 0 else 5 if street.hotel else street.num_houses
+                    current_rent[street.loc] = self.rent_table[street.loc][level][full_set]
+            return
+
+        # rent on stations and utilities depends only on the number of them owned by the owner
+        same_type = self.stations if prop.type == "Station" else self.utilities
+        for space in same_type:
+            if space.owner is None:
+                current_rent[space.loc] = 0
+            else:
+                count = sum([other.owner is space.owner for other in same_type])
+                current_rent[space.loc] = self.rent_table[space.loc][0][count]
+
+    def update_player_rents(self, player):
+        """
+        This method updates the current rent on every property group in which a player owns a property.
+        The rent on a property depends only on the property and the holdings of its owner, so this
+        brings all of the player's rents up to date after their holdings have changed.
+        
+        Parameters
+        ----------
+        player: obj
+            Instance of the class Player.
+        
+        Returns
+        -------
+        None
+        """
+        for group in player.property_sets.values():
+            if group:
+                self.update_rent(group[0])
+        if player.stations:
+            self.update_rent(player.stations[0])
+        if player.utilities:
+            self.update_rent(player.utilities[0])
+        self.stale_rents.discard(player)
+
+    def current_rent_on(self, space):
+        """
+        This method returns the current rent on a property (the multiplier of the dice roll for a
+        utility). If the holdings of the owner have changed since the rent was last updated, the rent
+        on all of the owner's properties is updated first.
+        
+        Parameters
+        ----------
+        space: obj
+            An instance of one of the classes Street/Station/Utility.
+        
+        Returns
+        -------
+        int
+            The current rent on the property.
+        """
+        if space.owner in self.stale_rents:
+            self.update_player_rents(space.owner)
+        return self.current_rent[space.loc]
+
+    def reset_rents(self):
+        """
+        This method recalculates the current rent on all properties, for use when the state of the
+        board has been set directly (eg. owners or houses assigned outside of the game).
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        for group in self.property_sets.values():
+            self.update_rent(group[0])
+        self.update_rent(self.stations[0])
+        self.update_rent(self.utilities[0])
+        self.stale_rents.clear()
+
+    def create_actions(self):
+        """
+        This method creates the fixed integer action space of the agent player. Each kind of property 
+        action (mortgage, unmortgage, sell hotel, sell house, buy hotel, buy house and purchase) has
+        one action id for each ownable property, with the id of the action being the kind of action 
+        multiplied by the number of ownable properties, plus the index of the property. These are 
+        followed by the actions to use a Get Out of Jail Free card, to pay to get out of jail and to
+        end the turn. A readable name is created for every action id, so that actions can be logged.
+        This must be called after all properties have been created.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.ownables = self.properties + self.stations + self.utilities
+        self.ownable_index = [None]*40
+        for idx, prop in enumerate(self.ownables):
+            self.ownable_index[prop.loc] = idx
+
+        # create readable names for logs (eg. 'Buy house on Mayfair')
+        self.action_names = [f"{kind} {prop.name}" for kind in self.PROPERTY_ACTIONS for prop in self.ownables]
+        self.action_names += ["Use Get Out of Jail Free card", "Pay 50 to get out of jail", "End turn"]
+        self.action_ids = {name: action for action, name in enumerate(self.action_names)}
+
+        # money needed for each action, and the actions allowed when raising funds
+        num_ownables = self.NUM_OWNABLES
+        self.action_costs = np.zeros(self.NUM_ACTIONS)
+        for idx, prop in enumerate(self.ownables):
+            self.action_costs[self.UNMORTGAGE*num_ownables + idx] = prop.calculate_unmortgage_price()
+            if prop.type == "Street":
+                self.action_costs[self.BUY_HOTEL*num_ownables + idx] = prop.house_price
+                self.action_costs[self.BUY_HOUSE*num_ownables + idx] = prop.house_price
+        self.funds_actions = np.zeros(self.NUM_ACTIONS, dtype=bool)
+        for kind in (self.MORTGAGE, self.SELL_HOTEL, self.SELL_HOUSE):
+            self.funds_actions[kind*num_ownables:(kind + 1)*num_ownables] = True
+
+        self.action_mask = np.zeros(self.NUM_ACTIONS, dtype=bool)
+        self.reset_action_mask()
+
+    def update_action_mask(self, prop):
+        """
+        This method updates the legal action mask for the agent player's mortgage, unmortgage and 
+        building actions on a property. Building rules depend on the other streets in the same 
+        colour group, so the whole group is updated for a street. This must be called whenever the 
+        owner, buildings or mortgage of a property change. Money, jail and purchases are checked
+        when the mask is read (see legal_action_mask).
+        
+        Parameters
+        ----------
+        prop: obj
+            An instance of one of the classes Street/Station/Utility.
+        
+        Returns
+        -------
+        None
+        """
+        mask = self.action_mask
+        num_ownables = self.NUM_OWNABLES
+        agent = self.agent
+
+        # stations and utilities can only be mortgaged and unmortgaged
+        if prop.type != "Street":
+            idx = self.ownable_index[prop.loc]
+            owned = agent is not None and prop.owner is agent
+            mask[self.MORTGAGE*num_ownables + idx] = owned and not prop.is_mortgaged
+            mask[self.UNMORTGAGE*num_ownables + idx] = owned and prop.is_mortgaged
+            return
+
+        # buildings on the player's streets in a group must differ by at most one
+        group = self.property_sets[prop.group]
+        builds = [street.num_houses + street.hotel for street in group if agent is not None and street.owner is agent]
+        full_set = len(builds) == len(group)
+        if builds:
+            lowest, highest = min(builds), max(builds)
+
+        for street in group:
+            idx = self.ownable_index[street.loc]
+            owned = agent is not None and street.owner is agent
+            build = street.num_houses + street.hotel
+            mask[self.MORTGAGE*num_ownables + idx] = owned and not street.is_mortgaged and street.num_houses == 0
+            mask[self.UNMORTGAGE*num_ownables + idx] = owned and street.is_mortgaged
+            mask[self.SELL_HOTEL*num_ownables + idx] = owned and street.hotel
+            mask[self.SELL_HOUSE*num_ownables + idx] = (owned and street.num_houses > 0 and not street.hotel 
+                                                        and highest - 1 <= build - 1 <= lowest + 1)
+            mask[self.BUY_HOTEL*num_ownables + idx] = (owned and street.num_houses == 4 and not street.hotel 
+                                                       and highest - 1 <= build + 1 <= lowest + 1)
+            mask[self.BUY_HOUSE*num_ownables + idx] = (owned and full_set and street.num_houses < 4 
+                                                       and highest - 1 <= build + 1 <= lowest + 1)
+
+    def reset_action_mask(self):
+        """
+        This method recalculates the legal action mask for all properties, for use when the state of 
+        the board has been set directly (eg. through the methods of Player) rather than through 
+        perform_action.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        for group in self.property_sets.values():
+            self.update_action_mask(group[0])
+        for prop in self.stations + self.utilities:
+            self.update_action_mask(prop)
+
+    def create_zobrist_keys(self):
+        """
+        This method creates the random 64-bit keys for hashing the game state, which covers the
+        position, cash (in buckets of CASH_BUCKET), jail status, "Get Out of Jail Free" cards and 
+        bankruptcy of each player, the owner, buildings and mortgage of each property, and the top 
+        card of each card pile. The hash of a state is the XOR of one key for each of these. The keys
+        are drawn from a fixed seed, so hashes are the same in every process.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        rng = random.Random(0x5EED)
+
+        def keys(*shape):
+            if len(shape) == 1:
+                return [rng.getrandbits(64) for _ in range(shape[0])]
+            return [keys(*shape[1:]) for _ in range(shape[0])]
+
+        self.zobrist_keys = {
+            "position": keys(self.MAX_PLAYERS, 40),
+            "cash": keys(self.MAX_PLAYERS, self.NUM_CASH_BUCKETS),
+            "jail": keys(self.MAX_PLAYERS, 4),
+            "jail_cards": keys(self.MAX_PLAYERS, 3),
+            "bankrupt": keys(self.MAX_PLAYERS),
+            "owner": keys(self.NUM_OWNABLES, self.MAX_PLAYERS + 1),
+            "level": keys(self.NUM_OWNABLES, 6),
+            "mortgaged": keys(self.NUM_OWNABLES),
+            "chance": keys(len(self.chance.cards)),
+            "community_chest": keys(len(self.community_chest.cards)),
+        }
+
+    def record_key(self, idx, record):
+        """
+        This method returns the hash key of a record in a snapshot of the board (see snapshot), so
+        that the hash can be updated from the records changed by an action.
+        
+        Parameters
+        ----------
+        idx: int
+            The index of the record in the snapshot.
+        record: tuple
+            The record.
+        
+        Returns
+        -------
+        int
+            The XOR of the keys of the hashed parts of the record.
+        """
+        keys = self.zobrist_keys
+        num_players = len(self.players)
+
+        # card pile positions (the number of rounds is not hashed)
+        if idx == 0:
+            return keys["chance"][record[1]] ^ keys["community_chest"][record[2]]
+
+        # player state
+        if idx <= num_players:
+            player = idx - 1
+            position, money, bankrupt, in_jail, turns_in_jail = record[:5]
+            cash_bucket = min(max(money, 0) // self.CASH_BUCKET, self.NUM_CASH_BUCKETS - 1)
+
+            key = keys["position"][player][position] ^ keys["cash"][player][cash_bucket] \
+                ^ keys["jail_cards"][player][min(record[7], 2)]
+            if bankrupt:
+                key ^= keys["bankrupt"][player]
+            if in_jail:
+                key ^= keys["jail"][player][min(turns_in_jail, 3)]
+            return key
+
+        # property state, with the owner as an index into the list of players
+        prop = idx - num_players - 1
+        if len(record) == 4:
+            owner, num_houses, hotel, is_mortgaged = record
+            key = keys["level"][prop][5 if hotel else num_houses]
+        else:
+            owner, is_mortgaged = record
+            key = 0
+
+        key ^= keys["owner"][prop][0 if owner is None else owner + 1]
+        if is_mortgaged:
+            key ^= keys["mortgaged"][prop]
+        return key
+
+    def zobrist_hash(self):
+        """
+        This method returns the 64-bit hash of the current game state (see create_zobrist_keys). The
+        hash is kept up to date through apply(), undo(), redo() and restore(), and is recalculated
+        from a snapshot after the board has been changed in any other way (eg. performing actions 
+        directly during a rollout, or adding players).
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        int
+            The hash of the current game state.
+        """
+        if self.zobrist is None:
+            zobrist = 0
+            for idx, record in enumerate(self.current_records()):
+                zobrist ^= self.record_key(idx, record)
+            self.zobrist = zobrist
+
+        return self.zobrist
+
     def add_other_player(self, player):
         """
         This method adds a single player to the MonopolyBoard class. Each player is an instance
@@ -402,10 +939,85 @@ class MonopolyBoardMCTS:
         """
         self.players.append(player)
         self.other_players.append(player)
+        self.zobrist = None
+        self.records = None
 
     def add_agent(self, agent):
         self.players.append(agent)
         self.agent = agent
+        self.zobrist = None
+        self.records = None
+
+    def clone(self):
+        """
+        This method creates an independent copy of the board, including its players and the state
+        of the game. Only the mutable game state is copied (players, ownership, buildings, mortgages
+        and card pile positions). The immutable parts of the board (names, prices, rent schedules, 
+        card orders and the spaces that never change) are shared with the original board. Cloning
+        costs about the same as building a new board, since a new board also copies its spaces from
+        a template (see copy_spaces), but it keeps the game state without having to set it again.
+        The random number generator is also shared, so replace rng on the copy to give it an
+        independent stream.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        MonopolyBoardMCTS
+            The copy of the board.
+        """
+        board = object.__new__(MonopolyBoardMCTS)
+        board.__dict__ = self.__dict__.copy()
+
+        # copy spaces with mutable state, sharing their immutable attributes with the original
+        spaces = {}
+        for space in self.properties + self.stations + self.utilities + [self.chance, self.community_chest]:
+            space_copy = object.__new__(space.__class__)
+            space_copy.__dict__ = space.__dict__.copy()
+            spaces[space] = space_copy
+
+        copy_of = spaces.__getitem__
+        board.board = [spaces.get(space, space) for space in self.board]
+        board.properties = list(map(copy_of, self.properties))
+        board.stations = list(map(copy_of, self.stations))
+        board.utilities = list(map(copy_of, self.utilities))
+        board.chance = spaces[self.chance]
+        board.community_chest = spaces[self.community_chest]
+        board.property_sets = {group: list(map(copy_of, group_properties))
+                               for group, group_properties in self.property_sets.items()}
+        board.properties_dict = {name: spaces[prop] for name, prop in self.properties_dict.items()}
+        board.ownables = board.properties + board.stations + board.utilities
+        board.current_rent = self.current_rent.copy()
+        board.action_mask = self.action_mask.copy()
+
+        # copy players and relink them with the copied spaces
+        players = {None: None}
+        for player in self.players:
+            player_copy = object.__new__(player.__class__)
+            player_copy.__dict__ = player.__dict__.copy()
+            players[player] = player_copy
+
+        for player in self.players:
+            player_copy = players[player]
+            player_copy.properties = list(map(copy_of, player.properties))
+            player_copy.stations = list(map(copy_of, player.stations))
+            player_copy.utilities = list(map(copy_of, player.utilities))
+            player_copy.property_sets = {group: list(map(copy_of, group_properties))
+                                         for group, group_properties in player.property_sets.items()}
+            player_copy.money_owed = {players[recipient]: amount for recipient, amount in player.money_owed.items()}
+
+            for space in player.properties + player.stations + player.utilities:
+                spaces[space].owner = player_copy
+
+        board.players = [players[player] for player in self.players]
+        board.agent = players[self.agent]
+        board.other_players = [players[player] for player in self.other_players]
+        board.stale_rents = {players[player] for player in self.stale_rents}
+        board.records = self.records.copy() if self.records is not None else None
+
+        return board
 
     def play_game(self, stopping_condition = float('inf')):
         """
@@ -426,7 +1038,7 @@ class MonopolyBoardMCTS:
         i = 0
 
         # randomise order of players
-        random.shuffle(self.players)
+        self.rng.shuffle(self.players)
 
         # play continues until there is a winner/stopping condition met
         while len([player for player in self.players if not player.bankrupt]) >= 2 and i < stopping_condition:
@@ -460,12 +1072,19 @@ class MonopolyBoardMCTS:
         TypeError
             If the space type on the game board is not recognised or is of an incorrect type.
         """
+        self.zobrist = None
+        self.records = None
+
+        # the strategy pays for anything it unmortgages or builds, so rents only change if money was spent
+        money = player.money
         self.strategy.decide_unmortgage_properties(player)
         self.strategy.decide_build_on_properties(player, self.property_sets)
+        if player.money != money:
+            self.stale_rents.add(player)
 
         # player rolls the dice
-        a_roll = random.randint(1, 6)
-        b_roll = random.randint(1, 6)
+        a_roll = self.rng.randint(1, 6)
+        b_roll = self.rng.randint(1, 6)
         dice_roll = a_roll + b_roll
  
         # if the player is in jail
@@ -849,12 +1468,10 @@ class MonopolyBoardMCTS:
         """
         # if there is an owner, pay calculated rent on property
         if space.owner:
-            if space.type == "Street":
-                rent = space.calculate_rent()
-            elif space.type == "Station":
-                rent = space.calculate_rent(len(space.owner.stations))
+            if space.type == "Street" or space.type == "Station":
+                rent = self.current_rent_on(space)
             elif space.type == "Utility":
-                rent = space.calculate_rent(dice_roll, len(space.owner.utilities))
+                rent = self.current_rent_on(space) * dice_roll
             else:
                 raise TypeError("Cannot pay rent on space of type" + space.type)  
             
@@ -868,6 +1485,7 @@ class MonopolyBoardMCTS:
         elif self.strategy.decide_to_buy(player, space):
             space.owner = player
             player.pay(space.price)
+            player.property_wealth += space.price
 
             if space.type == "Street":
                 player.properties.append(space)
@@ -878,6 +1496,7 @@ class MonopolyBoardMCTS:
                 player.utilities.append(space)
             else:
                 raise TypeError("Cannot purchase space of type" + space.type) 
+            self.stale_rents.add(player)
             
         else:
             return
@@ -914,90 +1533,77 @@ class MonopolyBoardMCTS:
             else:
                 player.bankrupt = True
 
-    def get_legal_actions(self):
-        legal_actions = []
-
-        # player can mortgage unmortgaged properties at any point given they are not built on
-        unmortgaged_streets = [prop for prop in self.agent.properties if not prop.is_mortgaged and prop.num_houses == 0]
-        unmortgaged_stations = [station for station in self.agent.stations if not station.is_mortgaged]
-        unmortgaged_utilities = [utility for utility in self.agent.utilities if not utility.is_mortgaged]
-        unmortgaged_properties = unmortgaged_streets + unmortgaged_stations + unmortgaged_utilities
-        for prop in unmortgaged_properties:
-            legal_actions.append(f"Mortgage {prop.name}")
+        # the strategy may have sold or mortgaged the player's properties
+        self.stale_rents.add(player)
+        if player is self.agent:
+            self.reset_action_mask()
 
-        # player can sell hotels at any point (will never result in >1 discrepency between properties)
-        sell_hotel_streets = [prop for prop in self.agent.properties if prop.hotel]
-        for prop in sell_hotel_streets:
-            legal_actions.append(f"Sell hotel on {prop.name}")
+    def legal_action_mask(self):
+        """
+        This method gets a mask of the legal actions of the agent player in the current state of the 
+        game, indexed by action id (see create_actions). The mask is built from the action mask 
+        that is kept up to date as properties change, so only money, jail and the space the player 
+        is on are checked here.
 
-        # player can sell houses given house discrepency is <=1
-        sell_house_streets = [prop for prop in self.agent.properties if prop.num_houses > 0 and not prop.hotel]
-        for prop in sell_house_streets:
-            new_prop_build = prop.num_houses + prop.hotel - 1
-            house_discrepencies = [abs(new_prop_build - i.num_houses - i.hotel) <= 1 for i in self.agent.property_sets[prop.group]]
+        Returns
+        -------
+        np.ndarray
+            A boolean array that is True for each legal action.
+        """
+        agent = self.agent
+        mask = self.action_mask & (self.action_costs <= agent.money)
 
-            if all(house_discrepencies):
-                legal_actions.append(f"Sell house on {prop.name}")
+        # if the player owes money, or is in jail and must leave, they can only raise funds (or leave jail)
+        must_leave_jail = agent.in_jail and agent.turns_in_jail > 2
+        if agent.money_owed or must_leave_jail:
+            mask &= self.funds_actions
 
-        # if the player owes money, their only valid options are to mortgage, sell houses & hotels (above)
-        if len(self.agent.money_owed) == 0:
+        if len(agent.money_owed) == 0:
 
             # if the player is in jail, legal options include using jail cards/paying
-            if self.agent.in_jail:
-                if self.agent.jail_cards > 0:
-                    legal_actions.append("Use Get Out of Jail Free card")
-                if self.agent.money >= 50:
-                    legal_actions.append("Pay 50 to get out of jail")
-
-            # if the player is in jail and must leave, their only valid options are mortgaging, selling houses/hotels, or getting out of jail (above)
-            if not (self.agent.in_jail and self.agent.turns_in_jail > 2):
-
-                # player can unmortgage mortgaged properties at any point given they have enough money
-                mortgaged_streets = [prop for prop in self.agent.properties if prop.is_mortgaged]
-                mortgaged_stations = [station for station in self.agent.stations if station.is_mortgaged]
-                mortgaged_utilities = [utility for utility in self.agent.utilities if utility.is_mortgaged]
-                mortgaged_properties = mortgaged_streets + mortgaged_stations + mortgaged_utilities
-                for prop in mortgaged_properties:
-                    if self.agent.money >= prop.calculate_unmortgage_price():
-                        legal_actions.append(f"Unmortgage {prop.name}")
-
-                # player can buy hotels at any point if they have 4 houses, no hotel, enough money & <=1 house discrepency
-                buy_hotel_streets = [prop for prop in self.agent.properties if prop.num_houses==4 and not prop.hotel]
-                for prop in buy_hotel_streets:
-                    new_prop_build = prop.num_houses + prop.hotel + 1
-                    house_discrepencies = [abs(new_prop_build - i.num_houses - i.hotel) <= 1 for i in self.agent.property_sets[prop.group]]
-
-                    if all(house_discrepencies) and self.agent.money >= prop.house_price:
-                        legal_actions.append(f"Buy hotel on {prop.name}")
-
-                # player can buy houses at any point if they have fewer than 4 houses, enough money, a set & <= house discrepency
-                buy_house_streets = [prop for prop in self.agent.properties if prop.num_houses < 4]
-                for prop in buy_house_streets:
-                    group = self.property_sets[prop.group]
-                    player_group = self.agent.property_sets[prop.group]
-                    new_prop_build = prop.num_houses + prop.hotel + 1
-                    house_discrepencies = [abs(new_prop_build - i.num_houses - i.hotel) <= 1 for i in self.agent.property_sets[prop.group]]
-
-                    if all(house_discrepencies) and self.agent.money >= prop.house_price and sorted(group) == sorted(player_group):
-                        legal_actions.append(f"Buy house on {prop.name}")
+            if agent.in_jail:
+                mask[self.USE_JAIL_CARD] = agent.jail_cards > 0
+                mask[self.PAY_JAIL_FINE] = agent.money >= 50
+
+            if not must_leave_jail:
 
                 # if the player is on an unowned property, they can purchase it given they have enough money
-                space = self.board[self.agent.position]
-                is_property = (space.type == "Street" or space.type == "Station" or space.type == "Utility")
-                if is_property and space.owner == None and self.agent.money >= space.price:
-                    legal_actions.append(f"Purchase {space.name}")
+                idx = self.ownable_index[agent.position]
+                if idx is not None:
+                    space = self.board[agent.position]
+                    mask[self.PURCHASE*self.NUM_OWNABLES + idx] = space.owner == None and agent.money >= space.price
 
-                legal_actions.append("End turn")
+                mask[self.END_TURN] = True
+
+        return mask
+
+    def get_legal_actions(self):
+        """
+        This method gets the legal actions of the agent player in the current state of the game, as
+        ids in the integer action space (see create_actions). If the player has no legal actions, 
+        they are bankrupt. The legal actions are only kept up to date by the methods of the board 
+        (eg. perform_action and restore), so after properties are bought, built on or mortgaged 
+        directly (eg. through the methods of Player), reset_action_mask and reset_rents must be 
+        called first.
+
+        Returns
+        -------
+        list
+            The ids of the legal actions.
+        """
+        legal_actions = np.flatnonzero(self.legal_action_mask()).tolist()
 
         # if the player has no options, they are bankrupt
         if len(legal_actions) == 0:
             self.agent.bankrupt = True
+            self.zobrist = None
+            self.records = None
 
         return legal_actions
 
     def perform_action(self, action):
         """
-        This method performs various actions based on the given action string. Actions include 
+        This method performs various actions based on the given action id. Actions include 
         unmortgaging properties, mortgaging properties, selling houses, buying houses, using 
         "Get Out of Jail Free" card, paying to leave jail, purchasing properties, and paying 
         owed money. At the end of the player's turn, it checks if the player rolled doubles 
@@ -1005,89 +1611,72 @@ class MonopolyBoardMCTS:
 
         Parameters
         ----------
-        action : str
-            The action to be performed.
+        action : int
+            The id of the action to be performed (see create_actions).
 
         Returns
         -------
         None
         """
-        # unmortgage property
-        if action.startswith("Unmortgage"):
-            property_name = action[len("Unmortgage"):].strip()
-            prop = self.properties_dict[property_name]
+        self.zobrist = None
+        self.records = None
+
+        kind, idx = divmod(action, self.NUM_OWNABLES)
+        if action < self.USE_JAIL_CARD:
+            prop = self.ownables[idx]
 
+        # unmortgage property
+        if kind == self.UNMORTGAGE:
             unmortgage_cost = prop.calculate_unmortgage_price()
             self.agent.pay(unmortgage_cost)
             prop.is_mortgaged = False
+            if prop.type == "Street":
+                self.agent.property_wealth += prop.price - prop.calculate_mortgage_value()
 
         # mortgage property
-        if action.startswith("Mortgage"):
-            property_name = action[len("Mortgage"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.MORTGAGE:
             mortgage_value = prop.calculate_mortgage_value()
             self.agent.receive(mortgage_value)
             prop.is_mortgaged = True
+            if prop.type == "Street":
+                self.agent.property_wealth -= prop.price - mortgage_value
 
         # sell hotel on property
-        if action.startswith("Sell hotel on"):
-            property_name = action[len("Sell hotel on"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.SELL_HOTEL:
             hotel_value = prop.calculate_house_sale_value()
             self.agent.receive(hotel_value)
             prop.hotel = False
             self.agent.houses += 4
             self.agent.hotels -= 1
+            self.agent.building_wealth -= prop.house_price
 
         # sell house on property
-        if action.startswith("Sell house on"):
-            property_name = action[len("Sell house on"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.SELL_HOUSE:
             house_value = prop.calculate_house_sale_value()
             self.agent.receive(house_value)
             prop.num_houses -= 1
             self.agent.houses -= 1
+            self.agent.building_wealth -= prop.house_price
 
         # buy hotel on property
-        if action.startswith("Buy hotel on"):
-            property_name = action[len("Buy hotel on"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.BUY_HOTEL:
             self.agent.pay(prop.house_price)
             prop.hotel = True
             self.agent.hotels += 1
             self.agent.houses -= 4
+            self.agent.building_wealth += prop.house_price
 
         # buy house on property
-        if action.startswith("Buy house on"):
-            property_name = action[len("Buy house on"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.BUY_HOUSE:
             self.agent.pay(prop.house_price)
             prop.num_houses += 1
             self.agent.houses += 1
-
-        # use get out of jail free card
-        if action == "Use Get Out of Jail Free card":
-            self.agent.jail_cards -= 1
-            self.agent.in_jail = False
-            self.agent.turns_in_jail = 0
-
-        # pay to leave jail
-        if action == "Pay 50 to get out of jail":
-            self.agent.pay(50)
-            self.agent.in_jail = False
-            self.agent.turns_in_jail = 0
+            self.agent.building_wealth += prop.house_price
 
         # purchase property
-        if action.startswith("Purchase"):
-            property_name = action[len("Purchase"):].strip()
-            prop = self.properties_dict[property_name]
-
+        elif kind == self.PURCHASE:
             self.agent.pay(prop.price)
+            self.agent.property_wealth += prop.price
             prop.owner = self.agent
 
             if prop.type == "Street":
@@ -1099,6 +1688,23 @@ class MonopolyBoardMCTS:
                 self.agent.utilities.append(prop)
             else:
                 raise TypeError("Cannot purchase space of type" + prop.type)
+
+        # use get out of jail free card
+        elif action == self.USE_JAIL_CARD:
+            self.agent.jail_cards -= 1
+            self.agent.in_jail = False
+            self.agent.turns_in_jail = 0
+
+        # pay to leave jail
+        elif action == self.PAY_JAIL_FINE:
+            self.agent.pay(50)
+            self.agent.in_jail = False
+            self.agent.turns_in_jail = 0
+
+        # property actions change the rent on the property & which property actions are legal next
+        if action < self.USE_JAIL_CARD:
+            self.update_rent(prop)
+            self.update_action_mask(prop)
         
         # if player owes money, pay it
         if len(self.agent.money_owed) > 0:
@@ -1127,7 +1733,7 @@ class MonopolyBoardMCTS:
                 del self.agent.money_owed[recipient]
         
         # end of player's turn
-        if action == "End turn":
+        if action == self.END_TURN:
             self.rounds += 1
 
             # if the player rolled doubles, they go again
@@ -1155,8 +1761,8 @@ class MonopolyBoardMCTS:
             """
             
             # player rolls the dice
-            a_roll = random.randint(1, 6)
-            b_roll = random.randint(1, 6)
+            a_roll = self.rng.randint(1, 6)
+            b_roll = self.rng.randint(1, 6)
             dice_roll = a_roll + b_roll
 
             if self.agent.in_jail:
@@ -1473,12 +2079,10 @@ class MonopolyBoardMCTS:
         """
         # if there is an owner, pay calculated rent on property if possible
         if space.owner:
-            if space.type == "Street":
-                rent = space.calculate_rent()
-            elif space.type == "Station":
-                rent = space.calculate_rent(len(space.owner.stations))
+            if space.type == "Street" or space.type == "Station":
+                rent = self.current_rent_on(space)
             elif space.type == "Utility":
-                rent = space.calculate_rent(dice_roll, len(space.owner.utilities))
+                rent = self.current_rent_on(space) * dice_roll
             else:
                 raise TypeError("Cannot pay rent on space of type" + space.type)  
             
@@ -1534,6 +2138,271 @@ class MonopolyBoardMCTS:
         else:
             self.agent.money_owed[opponent] = amount
 
+    def player_record(self, player, player_idx):
+        """
+        This method returns the record of the mutable state of a player, as stored in a snapshot of
+        the board (see snapshot).
+
+        Parameters
+        ----------
+        player: obj
+            Instance of the class Player.
+        player_idx: dict
+            The index of each player in the list of players, with None for the bank.
+
+        Returns
+        -------
+        tuple
+            The record of the player.
+        """
+        return (player.position, player.money, player.bankrupt, player.in_jail, player.turns_in_jail,
+                player.double_rolled, player.num_doubles, player.jail_cards, player.houses, player.hotels,
+                player.property_wealth, player.building_wealth,
+                tuple([(player_idx[recipient], amount) for recipient, amount in player.money_owed.items()]),
+                tuple([prop.loc for prop in player.properties]),
+                tuple([station.loc for station in player.stations]),
+                tuple([utility.loc for utility in player.utilities]))
+
+    def property_record(self, prop, player_idx):
+        """
+        This method returns the record of the mutable state of a property, as stored in a snapshot
+        of the board (see snapshot).
+
+        Parameters
+        ----------
+        prop: obj
+            An instance of one of the classes Street/Station/Utility.
+        player_idx: dict
+            The index of each player in the list of players, with None for no owner.
+
+        Returns
+        -------
+        tuple
+            The record of the property.
+        """
+        if prop.type == "Street":
+            return (player_idx[prop.owner], prop.num_houses, prop.hotel, prop.is_mortgaged)
+        return (player_idx[prop.owner], prop.is_mortgaged)
+
+    def current_records(self):
+        """
+        This method returns the records of the current game state (see snapshot). The records are
+        kept up to date through apply(), undo(), redo() and restore(), and are recorded again after
+        the board has been changed in any other way. The list is owned by the board, so it must not
+        be modified.
+
+        Returns
+        -------
+        list
+            The records of the current game state.
+        """
+        if self.records is None:
+            player_idx = {player: idx for idx, player in enumerate(self.players)}
+            player_idx[None] = None
+
+            records = [(self.rounds, self.chance.top_card_idx, self.community_chest.top_card_idx)]
+            records += [self.player_record(player, player_idx) for player in self.players]
+            records += [self.property_record(prop, player_idx) for prop in self.ownables]
+            self.records = records
+
+        return self.records
+
+    def snapshot(self):
+        """
+        This method records all mutable game state on the board as a list of tuple records, one for
+        the board itself (rounds and card pile positions), one per player and one per property.
+        Players and owners are referred to by their index in the list of players, so snapshots are
+        valid on any clone of the board.
+
+        Returns
+        -------
+        list
+            The records of the mutable game state on the board.
+        """
+        return self.current_records().copy()
+
+    def write_record(self, idx, record):
+        """
+        This method overwrites part of the mutable game state on the board with a record from a
+        snapshot of the board.
+
+        Parameters
+        ----------
+        idx: int
+            The index of the record in the snapshot.
+        record: tuple
+            The record to write to the board.
+
+        Returns
+        -------
+        None
+        """
+        num_players = len(self.players)
+        if self.records is not None:
+            self.records[idx] = record
+
+        # rounds and card pile positions
+        if idx == 0:
+            self.rounds, self.chance.top_card_idx, self.community_chest.top_card_idx = record
+
+        # player state, including the lists of properties held by the player
+        elif idx <= num_players:
+            player = self.players[idx - 1]
+            player.position, player.money, player.bankrupt, player.in_jail, player.turns_in_jail, \
+                player.double_rolled, player.num_doubles, player.jail_cards, player.houses, player.hotels, \
+                player.property_wealth, player.building_wealth = record[:12]
+            player.money_owed = {self.players[recipient] if recipient is not None else None: amount
+                                 for recipient, amount in record[12]}
+
+            player.properties = [self.board[loc] for loc in record[13]]
+            player.stations = [self.board[loc] for loc in record[14]]
+            player.utilities = [self.board[loc] for loc in record[15]]
+            player.property_sets = {group: [] for group in self.property_sets}
+            for prop in player.properties:
+                player.property_sets[prop.group].append(prop)
+
+        # street state
+        elif len(record) == 4:
+            prop = self.ownables[idx - num_players - 1]
+            owner, prop.num_houses, prop.hotel, prop.is_mortgaged = record
+            prop.owner = self.players[owner] if owner is not None else None
+            self.update_rent(prop)
+            self.update_action_mask(prop)
+
+        # station and utility state
+        else:
+            prop = self.ownables[idx - num_players - 1]
+            owner, prop.is_mortgaged = record
+            prop.owner = self.players[owner] if owner is not None else None
+            self.update_rent(prop)
+            self.update_action_mask(prop)
+
+    def restore(self, snapshot):
+        """
+        This method restores the board to a snapshot taken earlier. Only the records that differ
+        from the current state of the board are written back.
+
+        Parameters
+        ----------
+        snapshot: list
+            A snapshot of the board, as returned by snapshot().
+
+        Returns
+        -------
+        None
+        """
+        zobrist = self.zobrist
+
+        for idx, (record, current) in enumerate(zip(snapshot, self.current_records())):
+            if record != current:
+                self.write_record(idx, record)
+                if zobrist is not None:
+                    zobrist ^= self.record_key(idx, current) ^ self.record_key(idx, record)
+
+        self.zobrist = zobrist
+
+    def apply(self, action):
+        """
+        This method performs an action (see perform_action) and returns an undo token. The token
+        is a compact change log that holds the old and new records of only the parts of the board
+        that were changed by the action. This covers everything that happens within the action,
+        including dice rolls, card draws and the turns of other players when the turn is ended.
+        Only the records that the action can change are recorded again: the players and the property
+        acted on for a property action, the players for other actions, and the whole board when the
+        turn is ended.
+
+        Parameters
+        ----------
+        action : int
+            The id of the action to be performed.
+
+        Returns
+        -------
+        tuple
+            The undo token, made up of (index, old record, new record) entries.
+        """
+        before = self.current_records()
+        zobrist = self.zobrist
+        if zobrist is None:
+            zobrist = 0
+            for idx, record in enumerate(before):
+                zobrist ^= self.record_key(idx, record)
+
+        self.perform_action(action)
+
+        # the turns of all players are played out when the turn is ended, so anything can change
+        if action == self.END_TURN:
+            after = self.current_records()
+            token = tuple([(idx, old, new) for idx, (old, new) in enumerate(zip(before, after)) if old != new])
+
+        # other actions only change the players (money can be paid to other players) and the property
+        else:
+            player_idx = {player: idx for idx, player in enumerate(self.players)}
+            player_idx[None] = None
+            changed = [(idx, self.player_record(player, player_idx)) for idx, player in enumerate(self.players, 1)]
+            if action < self.USE_JAIL_CARD:
+                idx = action % self.NUM_OWNABLES
+                changed.append((len(self.players) + 1 + idx, self.property_record(self.ownables[idx], player_idx)))
+
+            token = tuple([(idx, before[idx], new) for idx, new in changed if before[idx] != new])
+            for idx, old, new in token:
+                before[idx] = new
+            self.records = before
+
+        # the hash is updated from the changed records only
+        for idx, old, new in token:
+            zobrist ^= self.record_key(idx, old) ^ self.record_key(idx, new)
+        self.zobrist = zobrist
+
+        return token
+
+    def undo(self, token):
+        """
+        This method reverts an action performed with apply(), returning the board to the state it
+        was in before the action.
+
+        Parameters
+        ----------
+        token: tuple
+            The undo token returned by apply().
+
+        Returns
+        -------
+        None
+        """
+        zobrist = self.zobrist
+
+        for idx, old, new in token:
+            self.write_record(idx, old)
+            if zobrist is not None:
+                zobrist ^= self.record_key(idx, new) ^ self.record_key(idx, old)
+
+        self.zobrist = zobrist
+
+    def redo(self, token):
+        """
+        This method replays an action performed with apply() on a board in the state that the
+        action was originally performed from. The outcome of the original action (eg. dice rolls
+        and cards drawn) is replayed exactly.
+
+        Parameters
+        ----------
+        token: tuple
+            The undo token returned by apply().
+
+        Returns
+        -------
+        None
+        """
+        zobrist = self.zobrist
+
+        for idx, old, new in token:
+            self.write_record(idx, new)
+            if zobrist is not None:
+                zobrist ^= self.record_key(idx, old) ^ self.record_key(idx, new)
+
+        self.zobrist = zobrist
+
     def is_terminal(self):
         """
         This method checks if the current game state is a terminal state.
@@ -5,17 +5,44 @@ class Node:
     Attributes
     ----------
     state : obj
-        The state of the game at this node.
-    children : list
-        The list of child nodes.
+        The state of the game at this node. Only the root node of a search holds a state, the
+        state at any other node is reached by replaying the undo tokens from the root.
+    token : tuple
+        The undo token of the action taken to reach this node (see MonopolyBoardMCTS.apply).
+    terminal : bool
+        Whether the game has reached a terminal state at this node.
+    children : dict
+        The child nodes, keyed by the id of the action taken to reach them.
+    legal_actions : list
+        The ids of the legal actions from this node, cached the first time they are needed (None
+        until then).
+    untried_actions : list
+        The legal actions from this node that have no child node yet, in the order of legal_actions.
     visits : int
         The number of times this node has been visited.
     total_reward : int
         The total reward accumulated at this node.
-    action : obj
-        The action taken to reach this node.
+    action : int
+        The id of the action taken to reach this node (see MonopolyBoardMCTS.create_actions).
     parent : obj
         The parent node of this node.
+    key : int
+        The hash of the game state at this node (see MonopolyBoardMCTS.zobrist_hash).
+    chance : bool
+        Whether this is a chance node, ie. a node for an action with a random outcome. A chance
+        node holds no outcome, its children are the sampled outcomes of its action, keyed by 
+        outcome class (see MCTS.sample_outcome).
+    samples : int
+        The number of times the outcome class of this node was drawn, if it is a child of a chance
+        node.
+    amaf_visits : int
+        The number of times the action of this node was taken at any point after the parent node,
+        in the tree or in a rollout (all-moves-as-first, see MCTS.rave_backpropagation).
+    amaf_reward : float
+        The total reward of the iterations counted in amaf_visits.
+    prior : float
+        The score of the action of this node from the prior policy of the search (see 
+        MCTS.choose_untried_action), or 0 if there is none.
 
     Methods
     -------
@@ -25,15 +52,40 @@ class Node:
         Checks if the game has reached a terminal state.
     get_child_with_action(action):
         Returns the child node with the specified action.
+    set_legal_actions(legal_actions):
+        Caches the legal actions from this node.
+    add_child(child):
+        Adds a child node.
+    add_outcome(outcome, child):
+        Adds a child node for an outcome class of a chance node.
     """
 
-    def __init__(self, state, action=None, parent=None):
+    __slots__ = ('state', 'token', 'children', 'legal_actions', 'untried_actions', 'visits', 'total_reward',
+                 'action', 'parent', 'key', 'terminal', 'chance', 'samples',
+                 'amaf_visits', 'amaf_reward', 'prior')
+
+    def __init__(self, state=None, action=None, parent=None, token=None, terminal=None, key=None, chance=False,
+                 prior=0):
         self.state = state
-        self.children = []
+        self.token = token
+        self.children = {}
+        self.legal_actions = None
+        self.untried_actions = None
         self.visits = 0
         self.total_reward = 0
         self.action = action
         self.parent = parent
+        self.key = key
+        self.chance = chance
+        self.samples = 0
+        self.amaf_visits = 0
+        self.amaf_reward = 0
+        self.prior = prior
+
+        # terminal status is read from the state if it is not given
+        if terminal is None:
+            terminal = bool(state.agent[3] or all([other_player[3] for other_player in state.other_players]))
+        self.terminal = terminal
 
     def __repr__(self):
         return f"{self.action}"
@@ -47,10 +99,7 @@ class Node:
         bool
             True if the game has reached a terminal state, False otherwise.
         """
-        if self.state.agent[3] or all([other_player[3] for other_player in self.state.other_players]):
-            return True
-        else:
-            return False
+        return self.terminal
 
     def get_child_with_action(self, action):
         """
@@ -58,8 +107,8 @@ class Node:
 
         Parameters
         ----------
-        action : obj
-            The action to search for.
+        action : int
+            The id of the action to search for.
 
         Returns
         -------
@@ -71,11 +120,48 @@ class Node:
         ChildNotFoundError
             If no child node with the specified action is found.
         """
-        for child in self.children:
-            if child.action == action:
-                return child
+        try:
+            return self.children[action]
+        except KeyError:
+            raise ChildNotFoundError(f"Child with action {action} does not exist") from None
+
+    def set_legal_actions(self, legal_actions):
+        """
+        Caches the legal actions from this node, and the untried actions among them.
+
+        Parameters
+        ----------
+        legal_actions : list
+            The ids of the legal actions from this node.
+        """
+        self.legal_actions = legal_actions
+        self.untried_actions = [action for action in legal_actions if action not in self.children]
+
+    def add_child(self, child):
+        """
+        Adds a child node, which is no longer an untried action.
 
-        raise ChildNotFoundError(f"Child with action {action} does not exist")
+        Parameters
+        ----------
+        child : Node
+            The child node to add.
+        """
+        self.children[child.action] = child
+        if self.untried_actions is not None and child.action in self.untried_actions:
+            self.untried_actions.remove(child.action)
+
+    def add_outcome(self, outcome, child):
+        """
+        Adds a child node for an outcome class of this chance node.
+
+        Parameters
+        ----------
+        outcome : tuple
+            The outcome class of the child (see MCTS.outcome_class).
+        child : Node
+            The child node to add.
+        """
+        self.children[outcome] = child
 
 class ChildNotFoundError(Exception):
     pass
\ No newline at end of file
@@ -0,0 +1,59 @@
+class RandomRollout:
+    """
+    Represents the rollout policy that plays uniformly random legal actions for the agent player
+    until the game ends or the simulation limit is reached, and scores the final board with its
+    reward (see MCTS.simulation). This is the default rollout policy of MCTS.
+
+    Attributes
+    ----------
+    max_rounds : int
+        The number of rounds after which a rollout is stopped, None for no limit.
+
+    Methods
+    -------
+    __init__()
+        Initialises the attributes of the class.
+    choose_action(board, legal_actions, rng)
+        Chooses the next action of the agent player in a rollout.
+    evaluate(board)
+        Scores the board at the end of a rollout.
+    """
+
+    def __init__(self):
+        self.max_rounds = None
+
+    def choose_action(self, board, legal_actions, rng):
+        """
+        Chooses the next action of the agent player in a rollout, uniformly at random.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board, at the state the action is taken from.
+        legal_actions : list
+            The ids of the legal actions of the agent player.
+        rng : random.Random
+            The random number generator of the search.
+
+        Returns
+        -------
+        int
+            The id of the chosen action.
+        """
+        return rng.choice(legal_actions)
+
+    def evaluate(self, board):
+        """
+        Scores the board at the end of a rollout with the reward of the agent player.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board at the end of the rollout.
+
+        Returns
+        -------
+        float
+            The reward of the agent player (see MonopolyBoardMCTS.calculate_reward).
+        """
+        return board.calculate_reward()
@@ -0,0 +1,224 @@
+import numpy as np
+import multiprocessing
+from multiprocessing import shared_memory
+
+class SharedTree:
+    """
+    Represents a search tree held in shared memory, so that several worker processes can grow a
+    single tree together (see MCTS.search_tree_parallel).
+
+    Nodes are rows of fixed-size arrays in one shared memory block, with node 0 as the root. The
+    children of a node are a linked list through first_child and next_sibling. Nodes hold no game
+    state, each worker replays the actions along its path on its own board.
+
+    Attributes
+    ----------
+    capacity : int
+        The maximum number of nodes in the tree.
+    shm : multiprocessing.shared_memory.SharedMemory
+        The shared memory block holding the arrays.
+    visits : np.ndarray
+        The number of visits to each node, including virtual visits from workers still in a rollout.
+    total_reward : np.ndarray
+        The total reward accumulated at each node.
+    action : np.ndarray
+        The id of the action taken to reach each node (-1 for the root).
+    parent : np.ndarray
+        The index of the parent of each node (-1 for the root).
+    first_child : np.ndarray
+        The index of the first child of each node (-1 if there are none).
+    next_sibling : np.ndarray
+        The index of the next child of the parent of each node (-1 if there are none).
+    size : np.ndarray
+        The number of nodes in the tree, as a one element array.
+    lock : multiprocessing.Lock
+        The lock for adding nodes to the tree.
+    stat_locks : list
+        The locks for updating the visits and rewards of nodes, node i uses lock i % len(stat_locks).
+
+    Methods
+    -------
+    __init__(capacity, name=None, lock=None, stat_locks=None, num_stat_locks=64)
+        Creates the shared memory block, or attaches to an existing one.
+    reset()
+        Empties the tree, leaving only the root.
+    get_children(node)
+        Returns the children of a node.
+    add_child(node, action)
+        Adds a child to a node.
+    add_virtual_loss(path, virtual_loss)
+        Adds virtual visits to the nodes on a path.
+    backpropagate(path, reward, virtual_loss)
+        Replaces the virtual visits on a path with a real visit and its reward.
+    close()
+        Detaches from the shared memory block.
+    unlink()
+        Frees the shared memory block.
+    """
+
+    def __init__(self, capacity, name=None, lock=None, stat_locks=None, num_stat_locks=64):
+        """
+        Creates the shared memory block for the tree, or attaches to the block of an existing tree
+        if a name is given.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of nodes in the tree.
+        name : str, optional
+            The name of an existing shared memory block to attach to, by default None (create one).
+        lock : multiprocessing.Lock, optional
+            The lock for adding nodes, which must be given when attaching to an existing tree.
+        stat_locks : list, optional
+            The locks for updating nodes, which must be given when attaching to an existing tree.
+        num_stat_locks : int, optional
+            The number of locks for updating nodes when creating a tree, by default 64.
+        """
+        self.capacity = capacity
+        size = capacity * 32 + 8
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.lock = multiprocessing.Lock()
+            self.stat_locks = [multiprocessing.Lock() for _ in range(num_stat_locks)]
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.lock = lock
+            self.stat_locks = stat_locks
+
+        # 8 byte columns first so that every column is aligned
+        buffer = self.shm.buf
+        self.visits = np.ndarray(capacity, dtype=np.float64, buffer=buffer, offset=0)
+        self.total_reward = np.ndarray(capacity, dtype=np.float64, buffer=buffer, offset=capacity * 8)
+        self.action = np.ndarray(capacity, dtype=np.int32, buffer=buffer, offset=capacity * 16)
+        self.parent = np.ndarray(capacity, dtype=np.int32, buffer=buffer, offset=capacity * 20)
+        self.first_child = np.ndarray(capacity, dtype=np.int32, buffer=buffer, offset=capacity * 24)
+        self.next_sibling = np.ndarray(capacity, dtype=np.int32, buffer=buffer, offset=capacity * 28)
+        self.size = np.ndarray(1, dtype=np.int64, buffer=buffer, offset=capacity * 32)
+
+        if name is None:
+            self.reset()
+
+    def reset(self):
+        """
+        Empties the tree, leaving only a root with no visits.
+        """
+        self.visits[0] = 0
+        self.total_reward[0] = 0
+        self.action[0] = -1
+        self.parent[0] = -1
+        self.first_child[0] = -1
+        self.next_sibling[0] = -1
+        self.size[0] = 1
+
+    def get_children(self, node):
+        """
+        Returns the children of a node. Children are only ever linked in once fully written, so
+        this is safe to call while other workers are adding nodes.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+
+        Returns
+        -------
+        dict
+            The index of each child, keyed by the id of its action.
+        """
+        children = {}
+        child = int(self.first_child[node])
+
+        while child >= 0:
+            children[int(self.action[child])] = child
+            child = int(self.next_sibling[child])
+
+        return children
+
+    def add_child(self, node, action):
+        """
+        Adds a child to a node for an action. If another worker has added the child already, the
+        existing child is returned.
+
+        Parameters
+        ----------
+        node : int
+            The index of the node.
+        action : int
+            The id of the action taken to reach the child.
+
+        Returns
+        -------
+        int
+            The index of the child, or -1 if the tree is full.
+        """
+        with self.lock:
+            existing = self.get_children(node).get(action)
+            if existing is not None:
+                return existing
+
+            child = int(self.size[0])
+            if child == self.capacity:
+                return -1
+
+            # write the child before linking it in, since other workers read without the lock
+            self.visits[child] = 0
+            self.total_reward[child] = 0
+            self.action[child] = action
+            self.parent[child] = node
+            self.first_child[child] = -1
+            self.next_sibling[child] = self.first_child[node]
+            self.first_child[node] = child
+            self.size[0] = child + 1
+
+        return child
+
+    def add_virtual_loss(self, path, virtual_loss):
+        """
+        Adds virtual visits (ie. visits with no reward) to the nodes on a path, so that other
+        workers are steered away from the path while its rollout is running.
+
+        Parameters
+        ----------
+        path : list
+            The indices of the nodes on the path.
+        virtual_loss : int
+            The number of virtual visits to add to each node.
+        """
+        stat_locks = self.stat_locks
+        for node in path:
+            with stat_locks[node % len(stat_locks)]:
+                self.visits[node] += virtual_loss
+
+    def backpropagate(self, path, reward, virtual_loss):
+        """
+        Replaces the virtual visits on a path with a single real visit and its reward.
+
+        Parameters
+        ----------
+        path : list
+            The indices of the nodes on the path.
+        reward : float
+            The reward obtained from the rollout.
+        virtual_loss : int
+            The number of virtual visits that were added to each node.
+        """
+        stat_locks = self.stat_locks
+        for node in path:
+            with stat_locks[node % len(stat_locks)]:
+                self.visits[node] += 1 - virtual_loss
+                self.total_reward[node] += reward
+
+    def close(self):
+        """
+        Detaches from the shared memory block.
+        """
+        self.visits = self.total_reward = self.action = self.parent = None
+        self.first_child = self.next_sibling = self.size = None
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory block. This must only be called by the process that created it.
+        """
+        self.shm.unlink()
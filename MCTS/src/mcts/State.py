@@ -1,46 +1,133 @@
+import numpy as np
 from Player import Player
 from MonopolyBoardMCTS import MonopolyBoardMCTS
+
+# shared pool of space records, most of which repeat across states (eg. unowned & undeveloped)
+_space_records = {}
+
+# shared pool of rent tables and action masks, which only change when properties change hands or are developed
+_board_records = {}
+
+# empty board that decoded boards are cloned from, rather than building every space again
+_blank_board = None
+
 class State:
     """
     Represents the state of the Monopoly game board.
 
+    The state is stored as a compact, fixed-layout record of tuples so that every node in the
+    search tree holds as little memory as possible. Space records are interned, meaning identical
+    records (eg. an unowned, undeveloped street) are shared between all states. The current rents,
+    the agent's action mask and the value of each player's assets are kept alongside the record, so
+    that decoding the state does not have to recalculate them.
+
     Attributes
     ----------
     rounds : int
         The number of rounds played.
-    agent : list
-        Information about the agent player.
-    other_players : list
-        Information about the other players.
-    properties : list
-        Information about the properties on the board.
-    stations : list
-        Information about the stations on the board.
-    utilities : list
-        Information about the utilities on the board.
+    agent : tuple
+        Information about the agent player, laid out as (name, position, money, bankrupt, in_jail,
+        turns_in_jail, double_rolled, num_doubles, jail_cards, money_owed), where money_owed is a
+        tuple of (recipient name, amount) pairs.
+    other_players : tuple
+        Information about the other players, using the same layout as the agent.
+    properties : tuple
+        Information about the properties on the board, laid out as (owner name, num_houses, hotel,
+        is_mortgaged).
+    stations : tuple
+        Information about the stations on the board, laid out as (owner name, is_mortgaged).
+    utilities : tuple
+        Information about the utilities on the board, laid out as (owner name, is_mortgaged).
     agent_wealth : int
         The wealth of the agent player.
     other_players_wealth : list
         The wealth of the other players.
+    chance : tuple
+        The order of the Chance cards and the index of the top card.
+    community_chest : tuple
+        The order of the Community Chest cards and the index of the top card.
+    strategy : obj
+        The strategy used by the other players.
+    rents : tuple
+        The current rent on each space of the board (see MonopolyBoardMCTS.current_rent).
+    action_mask : bytes
+        The legal action mask of the agent player (see MonopolyBoardMCTS.action_mask).
+    asset_wealth : tuple
+        The (property_wealth, building_wealth) of the agent, followed by the other players.
+    zobrist : int
+        The 64-bit hash of the state (see MonopolyBoardMCTS.create_zobrist_keys).
 
     Methods
     -------
+    __hash__()
+        Returns the hash of the state.
+    __eq__(other)
+        Checks if two states are the same.
     from_monopoly_board(board)
         Converts a Monopoly board object to a State object.
-    to_monopoly_board()
+    to_monopoly_board(rng=None)
         Converts a State object to a Monopoly board object.
     preprocess_state()
         Preprocesses the state representation for the Monte Carlo Tree Search algorithm.
     """
+    __slots__ = ('rounds', 'agent', 'other_players', 'properties', 'stations', 'utilities',
+                 'agent_wealth', 'other_players_wealth', 'chance', 'community_chest', 'strategy', 'rents',
+                 'action_mask', 'asset_wealth', 'zobrist')
+
     def __init__(self):
         self.rounds = None
         self.agent = None
-        self.other_players = []
-        self.properties = []
-        self.stations = []
-        self.utilities = []
+        self.other_players = ()
+        self.properties = ()
+        self.stations = ()
+        self.utilities = ()
         self.agent_wealth = 0
         self.other_players_wealth = []
+        self.chance = None
+        self.community_chest = None
+        self.strategy = None
+        self.rents = None
+        self.action_mask = None
+        self.asset_wealth = None
+        self.zobrist = None
+
+    def __hash__(self):
+        """
+        Returns the hash of the state, which equal states share. States that differ only in the
+        number of rounds played, or in players' money within the same cash bucket, also share a hash.
+
+        Returns
+        -------
+        int
+            The hash of the state.
+        """
+        if self.zobrist is None:
+            self.zobrist = self.to_monopoly_board().zobrist_hash()
+        return self.zobrist
+
+    def __eq__(self, other):
+        """
+        Checks if two states are the same, comparing their hashes first.
+
+        Parameters
+        ----------
+        other : obj
+            The object to compare with.
+
+        Returns
+        -------
+        bool
+            True if the states are the same, False otherwise.
+        """
+        if not isinstance(other, State):
+            return NotImplemented
+        if hash(self) != hash(other):
+            return False
+
+        return (self.rounds == other.rounds and self.agent == other.agent and self.other_players == other.other_players
+                and self.properties == other.properties and self.stations == other.stations 
+                and self.utilities == other.utilities and self.chance == other.chance 
+                and self.community_chest == other.community_chest)
 
     def from_monopoly_board(self, board):
         """
@@ -56,126 +143,169 @@ class State:
         None
         """
         self.rounds = board.rounds
-
-        agent = board.agent
-        money_owed_agent = {player.name if player is not None else player: amount for player, amount in agent.money_owed.items()}
-        self.agent = [agent.name, agent.position, agent.money, agent.bankrupt,
-                      agent.in_jail, agent.turns_in_jail, agent.double_rolled,
-                      agent.num_doubles, agent.jail_cards, money_owed_agent]
-
-        for player in board.other_players:
-            money_owed_player = {other.name if other is not None else other: amount for other, amount in agent.money_owed.items()}
-            self.other_players.append([player.name, player.position, player.money, player.bankrupt,
-                                       player.in_jail, player.turns_in_jail, player.double_rolled,
-                                       player.num_doubles, player.jail_cards, money_owed_player])
-
-        for prop in board.properties:
-            if prop.owner:
-                self.properties.append([prop.owner.name, prop.num_houses, prop.hotel, prop.is_mortgaged])
-            else:
-                self.properties.append([None, prop.num_houses, prop.hotel, prop.is_mortgaged])
-
-        for station in board.stations:
-            if station.owner:
-                self.stations.append([station.owner.name, station.is_mortgaged])
-            else:
-                self.stations.append([None, station.is_mortgaged])
-
-        for utility in board.utilities:
-            if utility.owner:
-                self.utilities.append([utility.owner.name, utility.is_mortgaged])
-            else:
-                self.utilities.append([None, utility.is_mortgaged])
+        self.agent = self.encode_player(board.agent)
+        self.other_players = tuple([self.encode_player(player) for player in board.other_players])
+
+        intern = _space_records.setdefault
+        self.properties = tuple([intern(record, record) for record in
+                                 [(prop.owner.name if prop.owner else None, prop.num_houses, prop.hotel, prop.is_mortgaged)
+                                  for prop in board.properties]])
+        self.stations = tuple([intern(record, record) for record in
+                               [(station.owner.name if station.owner else None, station.is_mortgaged)
+                                for station in board.stations]])
+        self.utilities = tuple([intern(record, record) for record in
+                                [(utility.owner.name if utility.owner else None, utility.is_mortgaged)
+                                 for utility in board.utilities]])
+
+        # card orders never change after shuffling, so the lists are shared rather than copied
+        self.chance = (board.chance.cards, board.chance.top_card_idx)
+        self.community_chest = (board.community_chest.cards, board.community_chest.top_card_idx)
+        self.strategy = board.strategy
 
         self.agent_wealth = board.agent.wealth()
         self.other_players_wealth = [player.wealth() for player in board.other_players]
 
-    def to_monopoly_board(self):
+        # the rents & legal actions are only kept up to date by the board's own methods, so they are
+        # recalculated in case the board was set up directly (eg. through the methods of Player)
+        board.reset_rents()
+        board.reset_action_mask()
+        intern = _board_records.setdefault
+        rents = tuple(board.current_rent)
+        self.rents = intern(rents, rents)
+        action_mask = board.action_mask.tobytes()
+        self.action_mask = intern(action_mask, action_mask)
+        self.asset_wealth = tuple([(player.property_wealth, player.building_wealth)
+                                   for player in [board.agent] + board.other_players])
+
+        # the hash refers to players by their order on the board, which is only the same as the
+        # order of a decoded board if the agent comes first
+        if board.players == [board.agent] + board.other_players:
+            self.zobrist = board.zobrist_hash()
+        else:
+            self.zobrist = None
+
+    @staticmethod
+    def encode_player(player):
+        """
+        Encodes a player as a fixed-layout tuple record.
+
+        Parameters
+        ----------
+        player : Player
+            The player to encode.
+
+        Returns
+        -------
+        tuple
+            The record for the player.
+        """
+        money_owed = tuple([(other.name if other is not None else other, amount) for other, amount in player.money_owed.items()])
+        return (player.name, player.position, player.money, player.bankrupt, player.in_jail, player.turns_in_jail,
+                player.double_rolled, player.num_doubles, player.jail_cards, money_owed)
+
+    @staticmethod
+    def decode_player(record):
+        """
+        Decodes a player from a fixed-layout tuple record. Money owed is not restored here since
+        it refers to other players by name.
+
+        Parameters
+        ----------
+        record : tuple
+            The record for the player.
+
+        Returns
+        -------
+        Player
+            The decoded player.
+        """
+        player = Player(record[0])
+        player.position, player.money, player.bankrupt, player.in_jail, player.turns_in_jail, \
+            player.double_rolled, player.num_doubles, player.jail_cards = record[1:-1]
+        return player
+
+    def to_monopoly_board(self, rng=None):
         """
         Converts a State object to a Monopoly board object.
 
+        Parameters
+        ----------
+        rng : obj, optional
+            The random number generator for the board's dice rolls, by default the random module.
+
         Returns
         -------
         MonopolyBoardMCTS
             The Monopoly board object.
         """
-        # reconstruction of Monopoly board
-        board = MonopolyBoardMCTS()
-        board.rounds = self.rounds
+        global _blank_board
 
-        # initialise agent and overwrite properties
-        agent = Player(self.agent[0])
-        agent.position, agent.money, agent.bankrupt, agent.in_jail, agent.turns_in_jail, \
-            agent.double_rolled, agent.num_doubles, agent.jail_cards = self.agent[1:-1]
-        board.add_agent(agent)
+        # reconstruction of Monopoly board from a clone of an empty board
+        if _blank_board is None:
+            _blank_board = MonopolyBoardMCTS()
+        board = _blank_board.clone()
+        board.rounds = self.rounds
+        if rng is not None:
+            board.rng = rng
+        if self.strategy is not None:
+            board.strategy = self.strategy
 
-        # initialise players again and overwrite properties for each player
+        # initialise players and index them by name for owner lookups
+        board.add_agent(self.decode_player(self.agent))
         for player_info in self.other_players:
-            player = Player(player_info[0])
-            player.position, player.money, player.bankrupt, player.in_jail, player.turns_in_jail, \
-                player.double_rolled, player.num_doubles, player.jail_cards = player_info[1:-1]
-            board.add_other_player(player)
-
-        # add money owed by agent
-        money_owed_dict = {}
-        for player_name, amount in self.agent[-1].items():
-            if not player_name:
-                money_owed_dict[None] = amount
-            else:
-                for player in board.players:
-                    if player.name == player_name:
-                        money_owed_dict[player] = amount
-
-        # add money owed by other players
-        for other_player in self.other_players:
-            money_owed_dict = {}
-            for player_name, amount in other_player[-1].items():
-                if not player_name:
-                    money_owed_dict[None] = amount
+            board.add_other_player(self.decode_player(player_info))
+        players_by_name = {player.name: player for player in board.players}
+        players_by_name[None] = None
+
+        # add money owed by each player
+        for player, player_info in zip(board.players, (self.agent,) + self.other_players):
+            player.money_owed = {players_by_name[name]: amount for name, amount in player_info[-1]}
+
+        # properties have already been initialised in board (just overwrite the state)
+        for prop, (owner_name, num_houses, hotel, is_mortgaged) in zip(board.properties, self.properties):
+            prop.num_houses, prop.hotel, prop.is_mortgaged = num_houses, hotel, is_mortgaged
+            if owner_name is not None:
+                owner = players_by_name[owner_name]
+                prop.owner = owner
+                owner.properties.append(prop)
+                owner.property_sets[prop.group].append(prop)
+
+                # houses on a street are replaced by a hotel, so are not counted once a hotel is built
+                if hotel:
+                    owner.hotels += 1
                 else:
-                    for player in board.players:
-                        if player.name == player_name:
-                            money_owed_dict[player] = amount
-        
-        for idx, prop in enumerate(self.properties):
-            # properties have already been initialised in board (just overwrite some properties)
-            # if there is an owner, property also needs to be added to player (player needs to be found by name)
-            if prop[0]:
-                for player in board.players:
-                    if player.name == prop[0]:
-                        player.properties.append(board.properties[idx])
-                        prop_group = board.properties[idx].group
-                        player.property_sets[prop_group].append(board.properties[idx])
-                        board.properties[idx].owner = player
-                        break
-
-            board.properties[idx].num_houses, board.properties[idx].hotel, board.properties[idx].is_mortgaged = prop[1:]
-
-        # count player houses and hotel counts
-        for player in board.players:
-            house_count = sum([prop.num_houses for prop in player.properties])
-            hotel_count = sum([prop.hotel for prop in player.properties])
-            player.houses = house_count
-            player.hotels = hotel_count
+                    owner.houses += num_houses
 
         # and for stations and utilities
-        for idx, station in enumerate(self.stations):
-            if station[0]:
-                for player in board.players:
-                    if player.name == station[0]:
-                        player.stations.append(board.stations[idx])
-                        board.stations[idx].owner = player
-
-            board.stations[idx].is_mortgaged = station[1]
-
-        for idx, utility in enumerate(self.utilities):
-            if utility[0]:
-                for player in board.players:
-                    if player.name == utility[0]:
-                        player.utilities.append(board.utilities[idx])
-                        board.utilities[idx].owner = player
-
-            board.utilities[idx].is_mortgaged = utility[1]
+        for station, (owner_name, is_mortgaged) in zip(board.stations, self.stations):
+            station.is_mortgaged = is_mortgaged
+            if owner_name is not None:
+                station.owner = players_by_name[owner_name]
+                station.owner.stations.append(station)
+
+        for utility, (owner_name, is_mortgaged) in zip(board.utilities, self.utilities):
+            utility.is_mortgaged = is_mortgaged
+            if owner_name is not None:
+                utility.owner = players_by_name[owner_name]
+                utility.owner.utilities.append(utility)
+
+        # restore the card piles so that draws continue from the same position
+        if self.chance is not None:
+            board.chance.cards, board.chance.top_card_idx = self.chance
+            board.community_chest.cards, board.community_chest.top_card_idx = self.community_chest
+
+        # the owners and buildings were set directly, so the wealth, rents & legal actions are restored
+        # from the record, or recalculated if the state was not encoded from a board
+        if self.asset_wealth is not None:
+            for player, (property_wealth, building_wealth) in zip(board.players, self.asset_wealth):
+                player.property_wealth, player.building_wealth = property_wealth, building_wealth
+            board.current_rent = list(self.rents)
+            board.action_mask = np.frombuffer(self.action_mask, dtype=bool).copy()
+        else:
+            for player in board.players:
+                player.recalculate_wealth()
+            board.reset_rents()
+            board.reset_action_mask()
 
         return board
 
@@ -192,14 +322,14 @@ class State:
         state_representation.append(self.rounds)
         state_representation.extend(self.agent[:-1])
 
-        for player, amount in self.agent[-1].items():
+        for player, amount in self.agent[-1]:
             state_representation.append(player)
             state_representation.append(amount)
 
         for other_player in self.other_players:
             state_representation.extend(other_player[:-1])
 
-            for player, amount in other_player[-1].items():
+            for player, amount in other_player[-1]:
                 state_representation.append(player)
                 state_representation.append(amount)
 
@@ -212,4 +342,4 @@ class State:
         for utility in self.utilities:
             state_representation.extend(utility)
 
-        return state_representation
\ No newline at end of file
+        return state_representation
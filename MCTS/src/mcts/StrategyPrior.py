@@ -0,0 +1,85 @@
+from Strategy import Strategy
+from RandomStrategy import RandomStrategy
+
+class StrategyPrior:
+    """
+    Represents a prior policy for the agent player that scores its legal actions with the domain
+    heuristics of a Strategy (see MCTS.expansion and MCTS.uct). Any object with a score_actions
+    method of the same form can be used as a prior instead.
+
+    Actions that the strategy would take in the current state (eg. buying a property it would buy,
+    or building a house it would build) score highly, and actions it would only take when raising
+    funds (eg. mortgaging or selling houses) score highly only when the agent owes money. Only the
+    decisions of the strategy that do not change the board are called. The strategy of the other
+    players is never used, and a RandomStrategy is rejected, since its decisions are coin flips that
+    would make the scores noise.
+
+    Attributes
+    ----------
+    strategy : obj
+        The strategy whose heuristics the actions are scored with (a new Strategy by default).
+
+    Methods
+    -------
+    __init__(strategy=None)
+        Initialises the attributes of the class.
+    score_actions(board, actions)
+        Scores actions of the agent player on a board.
+    """
+
+    def __init__(self, strategy=None):
+        if isinstance(strategy, RandomStrategy):
+            raise TypeError("A RandomStrategy has no heuristics to score actions with")
+        self.strategy = strategy if strategy is not None else Strategy()
+
+    def score_actions(self, board, actions):
+        """
+        Scores actions of the agent player on a board, from 0 (an action the strategy would not
+        take) to 1 (an action the strategy would take).
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board, at the state the actions are taken from.
+        actions : list
+            The ids of the actions to score (see MonopolyBoardMCTS.create_actions).
+
+        Returns
+        -------
+        list
+            The score of each action, in the order of the actions.
+        """
+        strategy = self.strategy
+        agent = board.agent
+
+        # the strategy only sells and mortgages when it needs money
+        raising_funds = bool(agent.money_owed) or (agent.in_jail and agent.turns_in_jail > 2)
+
+        scores = []
+        for action in actions:
+            kind, idx = divmod(action, board.NUM_OWNABLES)
+
+            if action == board.END_TURN:
+                score = 0.5
+            elif action == board.USE_JAIL_CARD:
+                score = 0.9
+            elif action == board.PAY_JAIL_FINE:
+                score = 0.7
+            elif kind == board.PURCHASE:
+                score = 0.9 if strategy.decide_to_buy(agent, board.ownables[idx]) else 0.3
+            elif kind == board.BUY_HOUSE:
+                score = 0.8 if strategy.decide_to_build_house(agent, board.ownables[idx]) else 0.2
+            elif kind == board.BUY_HOTEL:
+                score = 0.8 if strategy.decide_to_build_hotel(agent, board.ownables[idx]) else 0.2
+            elif kind == board.UNMORTGAGE:
+                score = 0.6
+            elif kind == board.MORTGAGE:
+                score = 0.6 if raising_funds else 0.1
+
+            # houses and hotels are sold before properties are mortgaged
+            else:
+                score = 0.7 if raising_funds else 0.05
+
+            scores.append(score)
+
+        return scores
@@ -0,0 +1,75 @@
+from StrategyPrior import StrategyPrior
+
+class StrategyRollout:
+    """
+    Represents the rollout policy that plays the action of the agent player that a prior policy
+    scores highest, with ties broken at random, and otherwise a random action with a small
+    probability so that rollouts still vary. The final board is scored with its reward (see
+    MCTS.simulation).
+
+    Attributes
+    ----------
+    prior : obj
+        The prior policy that scores the legal actions (see StrategyPrior).
+    epsilon : float
+        The probability of playing a uniformly random action instead.
+    max_rounds : int
+        The number of rounds after which a rollout is stopped, None for no limit.
+
+    Methods
+    -------
+    __init__(prior=None, epsilon=0.1)
+        Initialises the attributes of the class.
+    choose_action(board, legal_actions, rng)
+        Chooses the next action of the agent player in a rollout.
+    evaluate(board)
+        Scores the board at the end of a rollout.
+    """
+
+    def __init__(self, prior=None, epsilon=0.1):
+        self.prior = prior if prior is not None else StrategyPrior()
+        self.epsilon = epsilon
+        self.max_rounds = None
+
+    def choose_action(self, board, legal_actions, rng):
+        """
+        Chooses the next action of the agent player in a rollout, which is the action with the
+        highest score from the prior policy, or a random action with probability epsilon.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board, at the state the action is taken from.
+        legal_actions : list
+            The ids of the legal actions of the agent player.
+        rng : random.Random
+            The random number generator of the search.
+
+        Returns
+        -------
+        int
+            The id of the chosen action.
+        """
+        if rng.random() < self.epsilon:
+            return rng.choice(legal_actions)
+
+        scores = self.prior.score_actions(board, legal_actions)
+        best_score = max(scores)
+
+        return rng.choice([action for action, score in zip(legal_actions, scores) if score == best_score])
+
+    def evaluate(self, board):
+        """
+        Scores the board at the end of a rollout with the reward of the agent player.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board at the end of the rollout.
+
+        Returns
+        -------
+        float
+            The reward of the agent player (see MonopolyBoardMCTS.calculate_reward).
+        """
+        return board.calculate_reward()
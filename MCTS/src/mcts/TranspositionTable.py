@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+class TranspositionTable:
+    """
+    Represents a bounded table of search statistics keyed by the hash of a game state, so that 
+    nodes reached by different orders of actions (eg. building houses on a colour group in a 
+    different order) share their statistics. When the table is full, the entry that was least 
+    recently used is evicted.
+
+    The keys are Zobrist hashes of the board (see MonopolyBoardMCTS.zobrist_hash), which hash the
+    money of each player in buckets of CASH_BUCKET and do not include the number of rounds played.
+    States that differ only in these are merged into one entry on purpose: their values are close,
+    and sharing statistics between them is what lets the table generalise across the tree. The
+    merge is approximate, so the table should be left off (max_transpositions=0) when exact
+    statistics per state are needed.
+
+    Attributes
+    ----------
+    max_entries : int
+        The maximum number of entries in the table.
+    entries : OrderedDict
+        The [visits, total reward] of each state, keyed by its hash, from least to most recently used.
+
+    Methods
+    -------
+    __len__()
+        Returns the number of entries in the table.
+    get(key)
+        Returns the entry for a state.
+    update(key, reward)
+        Adds a visit and its reward to the entry for a state.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the entry for a state, marking it as recently used.
+
+        Parameters
+        ----------
+        key : int
+            The hash of the state.
+
+        Returns
+        -------
+        list
+            The [visits, total reward] of the state, or None if it is not in the table.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def update(self, key, reward):
+        """
+        Adds a visit and its reward to the entry for a state, adding the entry (and evicting the 
+        least recently used entry if the table is full) if there is none.
+
+        Parameters
+        ----------
+        key : int
+            The hash of the state.
+        reward : float
+            The reward obtained from the visit.
+        """
+        entry = self.get(key)
+
+        if entry is None:
+            self.entries[key] = [1, reward]
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            entry[0] += 1
+            entry[1] += reward
@@ -0,0 +1,117 @@
+from RandomRollout import RandomRollout
+
+class TruncatedRollout:
+    """
+    Represents the rollout policy that stops a rollout after a number of rounds and scores the
+    board with a static evaluation of the players' positions, rather than playing towards the end
+    of the game (see MCTS.simulation). The actions of the agent player are chosen by another
+    rollout policy.
+
+    The value of a player is their wealth, plus the rent they can expect to collect over the next
+    few turns of their opponents and a bonus for each complete colour group they own. As with the
+    reward of the board, the score is the value of the agent divided by the mean value of the other
+    players.
+
+    Attributes
+    ----------
+    max_rounds : int
+        The number of rounds after which a rollout is stopped.
+    policy : obj
+        The rollout policy that chooses the actions of the agent player (see RandomRollout).
+    rent_horizon : int
+        The number of opponent turns over which rent is expected to be collected.
+    monopoly_bonus : float
+        The value of owning a complete colour group, on top of the value of its properties.
+
+    Methods
+    -------
+    __init__(max_rounds=5, policy=None, rent_horizon=10, monopoly_bonus=200)
+        Initialises the attributes of the class.
+    choose_action(board, legal_actions, rng)
+        Chooses the next action of the agent player in a rollout.
+    player_value(board, player)
+        Returns the static value of a player.
+    evaluate(board)
+        Scores the board at the end of a rollout.
+    """
+
+    def __init__(self, max_rounds=5, policy=None, rent_horizon=10, monopoly_bonus=200):
+        self.max_rounds = max_rounds
+        self.policy = policy if policy is not None else RandomRollout()
+        self.rent_horizon = rent_horizon
+        self.monopoly_bonus = monopoly_bonus
+
+    def choose_action(self, board, legal_actions, rng):
+        """
+        Chooses the next action of the agent player in a rollout with the underlying policy.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board, at the state the action is taken from.
+        legal_actions : list
+            The ids of the legal actions of the agent player.
+        rng : random.Random
+            The random number generator of the search.
+
+        Returns
+        -------
+        int
+            The id of the chosen action.
+        """
+        return self.policy.choose_action(board, legal_actions, rng)
+
+    def player_value(self, board, player):
+        """
+        Returns the static value of a player: their wealth, the rent they can expect to collect
+        over rent_horizon turns of their opponents, and monopoly_bonus for each complete colour
+        group they own. Each space is assumed to be landed on with probability 1/40 per turn, and
+        utilities are assumed to be landed on with the average dice roll of 7.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board.
+        player : Player
+            The player to value.
+
+        Returns
+        -------
+        float
+            The value of the player.
+        """
+        rent = 0
+        for space in player.properties + player.stations:
+            if not space.is_mortgaged:
+                rent += board.current_rent_on(space)
+        for space in player.utilities:
+            if not space.is_mortgaged:
+                rent += 7 * board.current_rent_on(space)
+
+        monopolies = sum([len(player.property_sets[group]) == len(properties)
+                          for group, properties in board.property_sets.items()])
+
+        return player.wealth() + self.rent_horizon * rent / 40 + self.monopoly_bonus * monopolies
+
+    def evaluate(self, board):
+        """
+        Scores the board at the end of a rollout. A finished game is scored with the reward of the
+        agent player, and an unfinished game with the static values of the players.
+
+        Parameters
+        ----------
+        board : MonopolyBoardMCTS
+            The board at the end of the rollout.
+
+        Returns
+        -------
+        float
+            The value of the agent player divided by the mean value of the other players.
+        """
+        if board.is_terminal():
+            return board.calculate_reward()
+
+        other_values = [self.player_value(board, player) for player in board.other_players]
+
+        # other players can be left with no value before they are declared bankrupt
+        return self.player_value(board, board.agent) / max(sum(other_values) / len(other_values), 1)
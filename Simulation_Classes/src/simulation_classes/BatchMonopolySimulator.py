@@ -0,0 +1,961 @@
+from MonopolyBoard import MonopolyBoard
+from Strategy import Strategy
+from RandomStrategy import RandomStrategy
+import numpy as np
+
+class BatchMonopolySimulator:
+    """
+    This class simulates many Monopoly games in lockstep. The state of every game is stored as
+    NumPy arrays (one row per game), so each step of the game logic is performed for all games
+    at once rather than one game at a time. It follows the same rules as MonopolyBoard.take_turn,
+    with the decisions of Strategy and RandomStrategy carried out for all games at once. Players
+    take their turns in the order they are seated; since all players share a single strategy,
+    this is equivalent to the random order used by MonopolyBoard.play_game.
+
+    Attributes
+    ----------
+    num_games: int
+        The number of games being simulated.
+    num_players: int
+        The number of players in each game.
+    strategy: obj
+        The strategy used by all players (an instance of Strategy or RandomStrategy).
+    rng: np.random.Generator
+        The random number generator used for dice, card shuffles and random decisions.
+    rounds: np.ndarray
+        The number of rounds played in each game.
+    position: np.ndarray
+        The position of each player on the board, for each game.
+    money: np.ndarray
+        The money of each player, for each game.
+    bankrupt: np.ndarray
+        Whether each player is bankrupt, for each game.
+    in_jail: np.ndarray
+        Whether each player is in jail, for each game.
+    turns_in_jail: np.ndarray
+        The number of turns each player has spent in jail, for each game.
+    jail_cards: np.ndarray
+        The number of Get Out of Jail Free cards held by each player, for each game.
+    owner: np.ndarray
+        The player owning each property (streets, then stations, then utilities), or -1 if it is
+        unowned, for each game.
+    purchase_order: np.ndarray
+        The order in which the properties were bought in each game, used to break ties in the same
+        way as the order of the property lists of a Player.
+    num_houses: np.ndarray
+        The number of houses on each street, for each game.
+    hotel: np.ndarray
+        Whether there is a hotel on each street, for each game.
+    is_mortgaged: np.ndarray
+        Whether each property is mortgaged, for each game.
+    chance_cards: np.ndarray
+        The order of the Chance cards, for each game.
+    chance_top: np.ndarray
+        The index of the top Chance card, for each game.
+    community_chest_cards: np.ndarray
+        The order of the Community Chest cards, for each game.
+    community_chest_top: np.ndarray
+        The index of the top Community Chest card, for each game.
+
+    Methods
+    -------
+    __init__(num_games, num_players=2, strategy=None, seed=None)
+        Initialises the arrays holding the state of all games.
+    create_spaces()
+        Creates the arrays of fixed property information from the spaces of a MonopolyBoard.
+    play_games(stopping_condition=float('inf'))
+        Plays all games until there is a winner or a stopping condition is met.
+    take_turn(games, player)
+        Executes a turn for a player in each of the given games.
+    land_on_space(games, player, dice_roll)
+        Handles the space that a player lands on in each of the given games.
+    calculate_tax(games, player, loc)
+        Calculates the tax that a player must pay on a tax space.
+    advance(games, player, loc)
+        Moves a player directly to a property, collecting Go income if they pass Go.
+    perform_chance(games, player, dice_roll)
+        Handles the execution of a Chance card drawn by a player.
+    perform_community_chest(games, player)
+        Handles the execution of a Community Chest card drawn by a player.
+    count_buildings(games, player)
+        Counts the houses and hotels owned by a player.
+    handle_property(games, player, props, dice_roll)
+        Handles actions when a player lands on a property space.
+    pay_bank(games, player, cost)
+        Pays the bank, raising funds if the player does not have enough money.
+    raise_funds(games, player, cost)
+        Raises funds for a player by selling houses and mortgaging properties.
+    decide_to_buy(games, player, props)
+        Makes the decision for a player to purchase/not purchase properties.
+    decide_sell_houses(games, player, money_needed)
+        Sells houses and hotels to raise money.
+    decide_mortgage_properties(games, player, money_needed)
+        Mortgages properties to raise money.
+    decide_to_leave_jail(games, player)
+        Makes the decision as to whether a player leaves jail.
+    decide_unmortgage_properties(games, player)
+        Unmortgages properties.
+    decide_build_on_properties(games, player)
+        Builds houses and hotels on complete property sets.
+    wealth(games=None)
+        Calculates the wealth of each player in each game.
+    """
+
+    # chance cards, in the order listed by the Chance class
+    (ADVANCE_TO_GO, ADVANCE_TO_TRAFALGAR_SQUARE, ADVANCE_TO_MAYFAIR, ADVANCE_TO_PALL_MALL, NEAREST_STATION,
+     NEAREST_STATION_TWO, NEAREST_UTILITY, DIVIDEND, CHANCE_JAIL_CARD, GO_BACK_THREE, CHANCE_GO_TO_JAIL,
+     GENERAL_REPAIRS, SPEEDING_FINE, KINGS_CROSS, CHAIRMAN, BUILDING_LOAN) = range(16)
+
+    # community chest cards, in the order listed by the CommunityChest class
+    (CHEST_ADVANCE_TO_GO, BANK_ERROR, DOCTORS_FEE, SALE_OF_STOCK, CHEST_JAIL_CARD, CHEST_GO_TO_JAIL,
+     HOLIDAY_FUND, TAX_REFUND, BIRTHDAY, LIFE_INSURANCE, HOSPITAL_FEES, SCHOOL_FEES, CONSULTANCY_FEE,
+     STREET_REPAIRS, BEAUTY_CONTEST, INHERITANCE) = range(16)
+
+    def __init__(self, num_games, num_players=2, strategy=None, seed=None):
+        """
+        Parameters
+        ----------
+        num_games: int
+            The number of games to simulate.
+        num_players: int, optional, default: 2
+            The number of players in each game.
+        strategy: obj, optional, default: None
+            The strategy used by all players, either an instance of Strategy or RandomStrategy.
+            If None, the base Strategy is used.
+        seed: int, np.random.SeedSequence or np.random.Generator, optional, default: None
+            The seed for the random number generator. For runs split into several batches, pass
+            RandomStreams(root_seed).game_generator(batch) so that each batch has its own stream.
+
+        Raises
+        ------
+        TypeError
+            If the strategy has no batch decisions.
+        """
+        self.strategy = strategy if strategy is not None else Strategy()
+        if not isinstance(self.strategy, (Strategy, RandomStrategy)):
+            raise TypeError("No batch decisions for strategy: " + str(self.strategy))
+        self.random_decisions = isinstance(self.strategy, RandomStrategy)
+
+        self.num_games = num_games
+        self.num_players = num_players
+        self.rng = np.random.default_rng(seed)
+        self.create_spaces()
+
+        # player state
+        shape = (num_games, num_players)
+        self.rounds = np.zeros(num_games, dtype=np.int64)
+        self.position = np.zeros(shape, dtype=np.int64)
+        self.money = np.full(shape, 1500, dtype=np.int64)
+        self.bankrupt = np.zeros(shape, dtype=bool)
+        self.in_jail = np.zeros(shape, dtype=bool)
+        self.turns_in_jail = np.zeros(shape, dtype=np.int64)
+        self.jail_cards = np.zeros(shape, dtype=np.int64)
+
+        # property state
+        num_props = len(self.price)
+        num_streets = len(self.house_price)
+        self.owner = np.full((num_games, num_props), -1, dtype=np.int64)
+        self.purchase_order = np.zeros((num_games, num_props), dtype=np.int64)
+        self.purchases = np.zeros(num_games, dtype=np.int64)
+        self.num_houses = np.zeros((num_games, num_streets), dtype=np.int64)
+        self.hotel = np.zeros((num_games, num_streets), dtype=bool)
+        self.is_mortgaged = np.zeros((num_games, num_props), dtype=bool)
+
+        # each game shuffles its own card piles
+        self.chance_cards = np.argsort(self.rng.random((num_games, 16)), axis=1)
+        self.chance_top = np.zeros(num_games, dtype=np.int64)
+        self.community_chest_cards = np.argsort(self.rng.random((num_games, 16)), axis=1)
+        self.community_chest_top = np.zeros(num_games, dtype=np.int64)
+
+    def __repr__(self):
+        return f'Batch of {self.num_games} Monopoly games'
+
+    def create_spaces(self):
+        """
+        This method creates the arrays of fixed property information (prices, rents and colour
+        groups) used by the game logic, taken from the spaces of a MonopolyBoard. Properties are
+        indexed in the order streets, then stations, then utilities.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        board = MonopolyBoard()
+        props = board.properties + board.stations + board.utilities
+        self.num_streets = len(board.properties)
+        self.num_stations = len(board.stations)
+
+        self.property_index = np.full(40, -1, dtype=np.int64)
+        for idx, prop in enumerate(props):
+            self.property_index[prop.loc] = idx
+        self.price = np.array([prop.price for prop in props], dtype=np.int64)
+        self.mortgage_value = np.array([prop.calculate_mortgage_value() for prop in props], dtype=np.int64)
+        self.unmortgage_price = np.array([prop.calculate_unmortgage_price() for prop in props], dtype=np.int64)
+
+        # properties of each kind are listed in this order by Player (streets, stations, utilities)
+        self.kind = np.array([0]*len(board.properties) + [1]*len(board.stations) + [2]*len(board.utilities))
+
+        # streets
+        streets = board.properties
+        groups = list(board.property_sets)
+        self.house_price = np.array([street.house_price for street in streets], dtype=np.int64)
+        self.house_sale_value = np.array([street.calculate_house_sale_value() for street in streets], dtype=np.int64)
+        self.group = np.array([groups.index(street.group) for street in streets])
+
+        # streets in each group, padded by repeating the first street so every group has 3
+        self.group_streets = np.array([[streets.index(street) for street in (group + group[:1])[:3]]
+                                       for group in board.property_sets.values()])
+
+        # rent table shared with the board, indexed by property rather than location
+        self.rent_table = np.array(board.rent_table, dtype=np.int64)[[prop.loc for prop in props]]
+
+        self.go_income = board.go.income
+        self.chance_locs = np.array(board.chance.loc)
+        self.community_chest_locs = np.array(board.community_chest.loc)
+        self.tax = {tax.loc: tax for tax in board.tax}
+        self.jail_loc = board.jail.loc
+        self.go_to_jail_loc = board.go_to_jail.loc
+
+    def play_games(self, stopping_condition = float('inf')):
+        """
+        This method plays all games. In each round, every player takes a turn in every game that
+        is still being played. A game is played until there is only a single player that is not
+        yet bankrupt or until the stopping condition is reached.
+
+        Parameters
+        ----------
+        stopping_condition: float, optional, default: float('inf')
+            The value at which to stop playing the games (the maximum number of rounds).
+
+        Returns
+        -------
+        None
+        """
+        while True:
+            playing = ((~self.bankrupt).sum(axis=1) >= 2) & (self.rounds < stopping_condition)
+            games = np.flatnonzero(playing)
+            if len(games) == 0:
+                return
+
+            self.rounds[games] += 1
+            for player in range(self.num_players):
+                self.take_turn(games, player)
+
+    def take_turn(self, games, player):
+        """
+        This method executes a turn of a player in each of the given games. The player first
+        decides whether to unmortgage and build on their properties. Then, they roll the dice,
+        leave jail if they can, move and handle the space they land on. Games where the player
+        rolled doubles continue with another turn, and the player goes to jail on their third
+        double in a row.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player taking the turn.
+
+        Returns
+        -------
+        None
+        """
+        doubles = np.zeros(len(games), dtype=np.int64)
+
+        while len(games):
+            self.decide_unmortgage_properties(games, player)
+            self.decide_build_on_properties(games, player)
+
+            # player rolls the dice
+            a_roll = self.rng.integers(1, 7, len(games))
+            b_roll = self.rng.integers(1, 7, len(games))
+            dice_roll = a_roll + b_roll
+            rolled_double = a_roll == b_roll
+
+            # if the player is in jail
+            jailed = self.in_jail[games, player]
+            if jailed.any():
+                jailed_games = games[jailed]
+                self.turns_in_jail[jailed_games, player] += 1
+
+                # player must leave jail after 3 rounds, using a card, paying or raising funds if not a double
+                must_leave = self.turns_in_jail[jailed_games, player] > 2
+                paying = jailed_games[must_leave & ~rolled_double[jailed]]
+                has_card = self.jail_cards[paying, player] > 0
+                self.jail_cards[paying[has_card], player] -= 1
+                self.pay_bank(paying[~has_card], player, np.full((~has_card).sum(), 50))
+
+                # otherwise decide whether or not to leave jail
+                leaving = must_leave.copy()
+                leaving[~must_leave] = self.decide_to_leave_jail(jailed_games[~must_leave], player)
+                self.in_jail[jailed_games[leaving], player] = False
+                self.turns_in_jail[jailed_games[leaving], player] = 0
+
+                # not leaving jail so turn is over
+                moving = np.ones(len(games), dtype=bool)
+                moving[np.flatnonzero(jailed)[~leaving]] = False
+                games, dice_roll, rolled_double, doubles = games[moving], dice_roll[moving], rolled_double[moving], doubles[moving]
+
+            # go to jail if third double in a row and end turn
+            doubles += rolled_double
+            to_jail = doubles > 2
+            self.position[games[to_jail], player] = self.jail_loc
+            self.in_jail[games[to_jail], player] = True
+            games, dice_roll, rolled_double, doubles = games[~to_jail], dice_roll[~to_jail], rolled_double[~to_jail], doubles[~to_jail]
+
+            # player moves the number of spaces shown on the two dice combined, collecting Go income if passed
+            previous_position = self.position[games, player]
+            new_position = (previous_position + dice_roll) % 40
+            self.position[games, player] = new_position
+            self.money[games[previous_position > new_position], player] += self.go_income
+
+            self.land_on_space(games, player, dice_roll)
+
+            # player takes another turn if they roll a double
+            games, doubles = games[rolled_double], doubles[rolled_double]
+
+    def land_on_space(self, games, player, dice_roll):
+        """
+        This method handles the space that the player has landed on in each of the given games.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        dice_roll: np.ndarray
+            The value on the dice that the player rolled in each game.
+
+        Returns
+        -------
+        None
+        """
+        position = self.position[games, player]
+        props = self.property_index[position]
+
+        on_property = props >= 0
+        self.handle_property(games[on_property], player, props[on_property], dice_roll[on_property])
+
+        # handle chance card outcomes
+        on_chance = np.isin(position, self.chance_locs)
+        self.perform_chance(games[on_chance], player, dice_roll[on_chance])
+
+        # handle community chest card outcomes
+        on_community_chest = np.isin(position, self.community_chest_locs)
+        self.perform_community_chest(games[on_community_chest], player)
+
+        # player pays the tax amount to the bank
+        for loc in self.tax:
+            taxed = games[position == loc]
+            self.pay_bank(taxed, player, self.calculate_tax(taxed, player, loc))
+
+        # player goes to jail and revoke pass go money immediately
+        to_jail = games[position == self.go_to_jail_loc]
+        self.position[to_jail, player] = self.jail_loc
+        self.in_jail[to_jail, player] = True
+        self.money[to_jail, player] -= self.go_income
+
+    def calculate_tax(self, games, player, loc):
+        """
+        This method calculates the tax that a player must pay on the tax space at a location (see
+        Tax.calculate_tax).
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        loc: int
+            The location of the tax space.
+
+        Returns
+        -------
+        np.ndarray
+            The tax to be paid in each game.
+        """
+        tax = self.tax[loc]
+        if tax.name == "Income Tax":
+            alternative = np.trunc(0.1 * self.wealth(games)[:, player]).astype(np.int64)
+            return np.minimum(tax.amount, alternative)
+        else:
+            return np.full(len(games), tax.amount, dtype=np.int64)
+
+    def advance(self, games, player, loc):
+        """
+        This method moves a player directly to a location, collecting Go income if they pass Go,
+        and handles the property there.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        loc: int
+            The location of the property to advance to.
+
+        Returns
+        -------
+        None
+        """
+        passed_go = games[self.position[games, player] > loc]
+        self.money[passed_go, player] += 200
+        self.position[games, player] = loc
+        self.handle_property(games, player, np.full(len(games), self.property_index[loc]), np.zeros(len(games), dtype=np.int64))
+
+    def perform_chance(self, games, player, dice_roll):
+        """
+        This method executes a player picking the top card from the Chance card pile in each of
+        the given games, then handles the card. The cards to advance to the nearest station or
+        utility never match a card in MonopolyBoard.perform_chance, so they have no effect here
+        either.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        dice_roll: np.ndarray
+            The value on the dice that the player rolled in each game.
+
+        Returns
+        -------
+        None
+        """
+        if len(games) == 0:
+            return
+        card = self.chance_cards[games, self.chance_top[games]]
+        self.chance_top[games] = (self.chance_top[games] + 1) % 16
+
+        drew = games[card == self.ADVANCE_TO_GO]
+        self.position[drew, player] = 0
+        self.money[drew, player] += 200
+
+        self.advance(games[card == self.ADVANCE_TO_TRAFALGAR_SQUARE], player, 24)
+        self.advance(games[card == self.ADVANCE_TO_MAYFAIR], player, 39)
+        self.advance(games[card == self.ADVANCE_TO_PALL_MALL], player, 11)
+        self.advance(games[card == self.KINGS_CROSS], player, 5)
+
+        self.money[games[card == self.DIVIDEND], player] += 50
+        self.money[games[card == self.BUILDING_LOAN], player] += 150
+        self.jail_cards[games[card == self.CHANCE_JAIL_CARD], player] += 1
+
+        # position of player after going back is either income tax, vine street or community chest
+        drew = games[card == self.GO_BACK_THREE]
+        position = (self.position[drew, player] - 3) % 40
+        self.position[drew, player] = position
+        taxed = drew[position == 4]
+        self.pay_bank(taxed, player, self.calculate_tax(taxed, player, 4))
+        on_street = drew[position == 19]
+        self.handle_property(on_street, player, np.full(len(on_street), self.property_index[19]), np.zeros(len(on_street), dtype=np.int64))
+        self.perform_community_chest(drew[position == 33], player)
+
+        drew = games[card == self.CHANCE_GO_TO_JAIL]
+        self.position[drew, player] = self.jail_loc
+        self.in_jail[drew, player] = True
+
+        drew = games[card == self.GENERAL_REPAIRS]
+        houses, hotels = self.count_buildings(drew, player)
+        self.pay_bank(drew, player, 25*houses + 100*hotels)
+
+        drew = games[card == self.SPEEDING_FINE]
+        self.pay_bank(drew, player, np.full(len(drew), 15))
+
+        # every player (including the player) is paid in turn, or raises the funds themselves if the player cannot pay
+        drew = games[card == self.CHAIRMAN]
+        for opponent in range(self.num_players):
+            paid = self.money[drew, player] >= 50
+            self.money[drew[paid], player] -= 50
+            self.money[drew[paid], opponent] += 50
+            self.raise_funds(drew[~paid], opponent, np.full((~paid).sum(), 50))
+
+    def perform_community_chest(self, games, player):
+        """
+        This method executes a player picking the top card from the Community Chest card pile in
+        each of the given games, then handles the card.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+
+        Returns
+        -------
+        None
+        """
+        if len(games) == 0:
+            return
+        card = self.community_chest_cards[games, self.community_chest_top[games]]
+        self.community_chest_top[games] = (self.community_chest_top[games] + 1) % 16
+
+        drew = games[card == self.CHEST_ADVANCE_TO_GO]
+        self.position[drew, player] = 0
+        self.money[drew, player] += 200
+
+        for chest_card, amount in ((self.BANK_ERROR, 200), (self.SALE_OF_STOCK, 50), (self.HOLIDAY_FUND, 100),
+                                   (self.TAX_REFUND, 20), (self.LIFE_INSURANCE, 100), (self.CONSULTANCY_FEE, 25),
+                                   (self.BEAUTY_CONTEST, 10), (self.INHERITANCE, 100)):
+            self.money[games[card == chest_card], player] += amount
+
+        for chest_card, amount in ((self.DOCTORS_FEE, 50), (self.HOSPITAL_FEES, 100), (self.SCHOOL_FEES, 50)):
+            drew = games[card == chest_card]
+            self.pay_bank(drew, player, np.full(len(drew), amount))
+
+        self.jail_cards[games[card == self.CHEST_JAIL_CARD], player] += 1
+
+        drew = games[card == self.CHEST_GO_TO_JAIL]
+        self.position[drew, player] = self.jail_loc
+        self.in_jail[drew, player] = True
+
+        # every player (including the player) pays if they can, otherwise they raise the funds to pay the bank
+        drew = games[card == self.BIRTHDAY]
+        for opponent in range(self.num_players):
+            paid = self.money[drew, opponent] >= 10
+            self.money[drew[paid], player] += 10
+            self.money[drew[paid], opponent] -= 10
+            self.raise_funds(drew[~paid], opponent, np.full((~paid).sum(), 10))
+
+        drew = games[card == self.STREET_REPAIRS]
+        houses, hotels = self.count_buildings(drew, player)
+        self.pay_bank(drew, player, 40*houses + 115*hotels)
+
+    def count_buildings(self, games, player):
+        """
+        This method counts the houses and hotels owned by a player, where the houses on a street
+        are replaced by its hotel.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+
+        Returns
+        -------
+        tuple
+            The number of houses and the number of hotels in each game.
+        """
+        owned = self.owner[games, :self.num_streets] == player
+        hotel = self.hotel[games]
+        houses = (self.num_houses[games] * (owned & ~hotel)).sum(axis=1)
+        hotels = (owned & hotel).sum(axis=1)
+        return houses, hotels
+
+    def handle_property(self, games, player, props, dice_roll):
+        """
+        This method handles the case when a player lands on a property in each of the given games.
+        If the property has an owner, the player must pay the owner the rent on the property (see
+        MonopolyBoard.create_rent_table). If not, the player decides whether or not to
+        purchase the property.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        props: np.ndarray
+            The index of the property in each game.
+        dice_roll: np.ndarray
+            The value on the dice that the player rolled in each game.
+
+        Returns
+        -------
+        None
+        """
+        if len(games) == 0:
+            return
+        owner = self.owner[games, props]
+        owned = owner >= 0
+
+        # otherwise, decide whether to buy property
+        buying = self.decide_to_buy(games[~owned], player, props[~owned])
+        bought_games, bought = games[~owned][buying], props[~owned][buying]
+        self.owner[bought_games, bought] = player
+        self.money[bought_games, player] -= self.price[bought]
+        self.purchase_order[bought_games, bought] = self.purchases[bought_games]
+        self.purchases[bought_games] += 1
+
+        # if there is an owner, pay calculated rent on property
+        games, props, owner, dice_roll = games[owned], props[owned], owner[owned], dice_roll[owned]
+        rent = np.zeros(len(games), dtype=np.int64)
+        kind = self.kind[props]
+
+        on_street = kind == 0
+        street_games, streets, street_owner = games[on_street], props[on_street], owner[on_street]
+        num_houses = self.num_houses[street_games, streets]
+        group_owner = self.owner[street_games[:, None], self.group_streets[self.group[streets]]]
+        full_set = (group_owner == street_owner[:, None]).all(axis=1).astype(np.int64)
+        level = np.where(num_houses == 0, 0, np.where(self.hotel[street_games, streets], 5, num_houses))
+        street_rent = self.rent_table[streets, level, full_set]
+        rent[on_street] = np.where(self.is_mortgaged[street_games, streets], 0, street_rent)
+
+        stations = self.owner[games, self.num_streets:self.num_streets + self.num_stations]
+        on_station = kind == 1
+        stations_owned = (stations[on_station] == owner[on_station, None]).sum(axis=1)
+        rent[on_station] = self.rent_table[props[on_station], 0, stations_owned]
+
+        utilities = self.owner[games, self.num_streets + self.num_stations:]
+        on_utility = kind == 2
+        utilities_owned = (utilities[on_utility] == owner[on_utility, None]).sum(axis=1)
+        rent[on_utility] = self.rent_table[props[on_utility], 0, utilities_owned] * dice_roll[on_utility]
+
+        # the owner is only paid if the player can pay without raising funds
+        paid = self.money[games, player] >= rent
+        self.money[games[paid], player] -= rent[paid]
+        self.money[games[paid], owner[paid]] += rent[paid]
+        self.raise_funds(games[~paid], player, rent[~paid])
+
+    def pay_bank(self, games, player, cost):
+        """
+        This method makes a player pay the bank, raising funds if they do not have enough money.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        cost: np.ndarray
+            The amount to be paid in each game.
+
+        Returns
+        -------
+        None
+        """
+        paid = self.money[games, player] >= cost
+        self.money[games[paid], player] -= cost[paid]
+        self.raise_funds(games[~paid], player, cost[~paid])
+
+    def raise_funds(self, games, player, cost):
+        """
+        This method raises funds for a player by selling houses and mortgaging properties. The
+        method first attempts to sell any houses that the player has on properties, and then
+        mortgage properties. If neither of these options mean that the player has money that is
+        greater than or equal to the cost, they go bankrupt.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        cost: np.ndarray
+            The amount of money that the player requires in each game.
+
+        Returns
+        -------
+        None
+        """
+        if len(games) == 0:
+            return
+
+        # sell houses to pay
+        self.decide_sell_houses(games, player, cost - self.money[games, player])
+        paid = self.money[games, player] >= cost
+        self.money[games[paid], player] -= cost[paid]
+        games, cost = games[~paid], cost[~paid]
+
+        # mortgage properties to pay
+        self.decide_mortgage_properties(games, player, cost - self.money[games, player])
+        paid = self.money[games, player] >= cost
+        self.money[games[paid], player] -= cost[paid]
+
+        # when all houses/hotels are sold & properties mortgaged, player goes bankrupt
+        self.bankrupt[games[~paid], player] = True
+
+    def decide_to_buy(self, games, player, props):
+        """
+        This method makes the decision for a player to purchase/not purchase a property in each of
+        the given games. The player must have enough money. With the base strategy, streets are
+        bought if the player already has a street in that set or fewer than 3 streets, and stations
+        and utilities are always bought. With the random strategy, the property is bought with
+        probability 0.5.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        props: np.ndarray
+            The index of the property in each game.
+
+        Returns
+        -------
+        np.ndarray
+            Whether the player purchases the property in each game.
+        """
+        affordable = self.money[games, player] >= self.price[props]
+        if self.random_decisions:
+            return affordable & (self.rng.random(len(games)) < 0.5)
+
+        is_street = self.kind[props] == 0
+        group = self.group[np.where(is_street, props, 0)]
+        in_set = (self.owner[games[:, None], self.group_streets[group]] == player).any(axis=1)
+        few_streets = (self.owner[games, :self.num_streets] == player).sum(axis=1) < 3
+        return affordable & (~is_street | in_set | few_streets)
+
+    def decide_sell_houses(self, games, player, money_needed):
+        """
+        This method sells a player's houses and hotels to raise money, in each of the given games.
+        Property groups are considered in order of most houses and hotels (base strategy) or in a
+        random order (random strategy). Within a group, a house or hotel is sold from the street
+        with the most houses and hotels until the money is raised or the group has none left.
+        Hotels are sold before houses.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        money_needed: np.ndarray
+            The amount of money that the player needs in each game.
+
+        Returns
+        -------
+        None
+        """
+        owned = self.owner[games, :self.num_streets] == player
+        built = owned & (self.num_houses[games] > 0)
+        has_houses = built.any(axis=1)
+        games, owned, money_needed = games[has_houses], owned[has_houses], money_needed[has_houses]
+        if len(games) == 0:
+            return
+
+        # rank groups by the order they are sold from
+        num_groups = len(self.group_streets)
+        if self.random_decisions:
+            group_key = self.rng.random((len(games), num_groups))
+        else:
+            build = (self.num_houses[games] + self.hotel[games]) * owned
+            group_build = np.zeros((len(games), num_groups), dtype=np.int64)
+            np.add.at(group_build.T, self.group, build.T)
+            group_key = -group_build * num_groups + np.arange(num_groups)
+        group_rank = np.argsort(np.argsort(group_key, axis=1), axis=1)
+        street_rank = group_rank[:, self.group] * 1000 + self.purchase_order[games, :self.num_streets]
+
+        money_raised = np.zeros(len(games), dtype=np.int64)
+        while len(games):
+            build = (self.num_houses[games] + self.hotel[games]) * owned
+            selling = (money_raised < money_needed) & (build > 0).any(axis=1)
+            games, owned, money_needed = games[selling], owned[selling], money_needed[selling]
+            money_raised, street_rank, build = money_raised[selling], street_rank[selling], build[selling]
+
+            # sell from the first group with houses, from the street with most houses & hotels
+            key = np.where(build > 0, street_rank - build * 100, np.iinfo(np.int64).max)
+            streets = np.argmin(key, axis=1)
+            has_hotel = self.hotel[games, streets]
+            self.hotel[games[has_hotel], streets[has_hotel]] = False
+            self.num_houses[games[~has_hotel], streets[~has_hotel]] -= 1
+
+            sale_value = self.house_sale_value[streets]
+            money_raised += sale_value
+            self.money[games, player] += sale_value
+
+    def decide_mortgage_properties(self, games, player, money_needed):
+        """
+        This method mortgages a player's properties without houses to raise money, in each of the
+        given games. Properties are mortgaged in order of mortgage value, least valuable first
+        (base strategy), or in a random order (random strategy), until the money is raised.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+        money_needed: np.ndarray
+            The amount of money that the player needs in each game.
+
+        Returns
+        -------
+        None
+        """
+        if len(games) == 0:
+            return
+        owned = self.owner[games] == player
+        owned[:, :self.num_streets] &= self.num_houses[games] == 0
+
+        # order properties in the same way as the sorted property lists of the player
+        if self.random_decisions:
+            key = self.rng.random(owned.shape)
+        else:
+            key = (self.mortgage_value * 1000 + self.kind * 100 + self.purchase_order[games]).astype(float)
+        key[~owned] = np.inf
+        order = np.argsort(key, axis=1)
+
+        value = np.where(owned & ~self.is_mortgaged[games], self.mortgage_value, 0)
+        value = np.take_along_axis(value, order, axis=1)
+        money_raised = np.cumsum(value, axis=1)
+
+        # mortgage each property until enough money has been raised
+        mortgaging = (value > 0) & (money_raised - value < money_needed[:, None])
+        rows, cols = np.nonzero(mortgaging)
+        self.is_mortgaged[games[rows], order[rows, cols]] = True
+        self.money[games, player] += (value * mortgaging).sum(axis=1)
+
+    def decide_to_leave_jail(self, games, player):
+        """
+        This method makes the decision as to whether or not a player should leave jail in each of
+        the given games. If the player has a Get Out of Jail Free card, they use it. Next, if they
+        have enough money, they pay to leave. With the random strategy, each option is taken with
+        probability 0.5.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+
+        Returns
+        -------
+        np.ndarray
+            Whether the player leaves jail in each game.
+        """
+        use_card = self.jail_cards[games, player] > 0
+        pay = ~use_card & (self.money[games, player] >= 50)
+        if self.random_decisions:
+            use_card &= self.rng.random(len(games)) < 0.5
+            pay = ~use_card & (self.money[games, player] >= 50) & (self.rng.random(len(games)) < 0.5)
+
+        self.jail_cards[games[use_card], player] -= 1
+        self.money[games[pay], player] -= 50
+        return use_card | pay
+
+    def decide_unmortgage_properties(self, games, player):
+        """
+        This method unmortgages a player's properties in each of the given games. Mortgaged
+        properties are considered in order of price, cheapest first (base strategy), or in a
+        random order (random strategy, where each is unmortgaged with probability 0.5). The player
+        stops at the first property they do not unmortgage.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+
+        Returns
+        -------
+        None
+        """
+        mortgaged = (self.owner[games] == player) & self.is_mortgaged[games]
+        has_mortgages = mortgaged.any(axis=1)
+        games, mortgaged = games[has_mortgages], mortgaged[has_mortgages]
+        if len(games) == 0:
+            return
+
+        if self.random_decisions:
+            key = self.rng.random(mortgaged.shape)
+        else:
+            key = (self.price * 1000 + self.kind * 100 + self.purchase_order[games]).astype(float)
+        key[~mortgaged] = np.inf
+        order = np.argsort(key, axis=1)
+
+        cost = np.where(mortgaged, self.unmortgage_price, np.iinfo(np.int32).max)
+        cost = np.take_along_axis(cost, order, axis=1)
+        unmortgaging = np.cumsum(cost, axis=1) <= self.money[games, player][:, None]
+        if self.random_decisions:
+            unmortgaging &= np.cumprod(self.rng.random(mortgaged.shape) < 0.5, axis=1).astype(bool)
+
+        rows, cols = np.nonzero(unmortgaging)
+        self.is_mortgaged[games[rows], order[rows, cols]] = False
+        self.money[games, player] -= (cost * unmortgaging).sum(axis=1)
+
+    def decide_build_on_properties(self, games, player):
+        """
+        This method builds houses and hotels on the complete property sets of a player in each of
+        the given games. Each street that is not mortgaged gets a house if it has fewer than 4
+        houses, the player has enough money and its neighbouring streets differ by at most one
+        house. Otherwise, it gets a hotel under the same conditions if it has 4 houses. With the
+        random strategy, each is built with probability 0.5.
+
+        Parameters
+        ----------
+        games: np.ndarray
+            The indices of the games.
+        player: int
+            The index of the player.
+
+        Returns
+        -------
+        None
+        """
+        full_set = (self.owner[games[:, None, None], self.group_streets] == player).all(axis=2)
+        has_set = full_set.any(axis=1)
+        games, full_set = games[has_set], full_set[has_set]
+        if len(games) == 0:
+            return
+
+        any_full_set = full_set.any(axis=0)
+        for street in range(self.num_streets):
+            if not any_full_set[self.group[street]]:
+                continue
+            building = games[full_set[:, self.group[street]] & ~self.is_mortgaged[games, street]]
+            if len(building) == 0:
+                continue
+            neighbours = self.group_streets[self.group[street]]
+            num_houses = self.num_houses[building, street]
+            build = num_houses + self.hotel[building, street]
+            neighbour_houses = self.num_houses[building[:, None], neighbours]
+            neighbour_build = neighbour_houses + self.hotel[building[:, None], neighbours]
+            affordable = self.money[building, player] >= self.house_price[street]
+
+            # decision to develop property or not (house)
+            house = (affordable & (num_houses < 4)
+                     & (np.abs(num_houses[:, None] - neighbour_houses) <= 1).all(axis=1))
+            if self.random_decisions:
+                house &= self.rng.random(len(building)) < 0.5
+
+            # decision to develop the property or not (hotel)
+            hotel = (~house & affordable & (num_houses == 4) & ~self.hotel[building, street]
+                     & (np.abs(build[:, None] - neighbour_build) <= 1).all(axis=1))
+            if self.random_decisions:
+                hotel &= self.rng.random(len(building)) < 0.5
+
+            self.num_houses[building[house], street] += 1
+            self.hotel[building[hotel], street] = True
+            self.money[building[house | hotel], player] -= self.house_price[street]
+
+    def wealth(self, games=None):
+        """
+        This method calculates the wealth of each player (see Player.wealth). It sums the value of:
+        money that the player possesses; any properties that the player holds, both mortgaged and
+        unmortgaged; the buildings that the player owns, both houses and hotels.
+
+        Parameters
+        ----------
+        games: np.ndarray, optional, default: None
+            The indices of the games. If None, all games are used.
+
+        Returns
+        -------
+        np.ndarray
+            The wealth of each player in each game.
+        """
+        if games is None:
+            games = np.arange(self.num_games)
+
+        # streets are valued at their mortgage value when mortgaged, stations and utilities at their price
+        value = np.where(self.is_mortgaged[games] & (self.kind == 0), self.mortgage_value, self.price)
+        value[:, :self.num_streets] += (self.num_houses[games] + self.hotel[games]) * self.house_price
+
+        owner = self.owner[games]
+        wealth = self.money[games].copy()
+        for player in range(self.num_players):
+            wealth[:, player] += (value * (owner == player)).sum(axis=1)
+        return wealth
@@ -17,8 +17,9 @@ class Chance:
 
     Methods
     -------
-    __init__(locs)
-        Initialises the Chance space with its location and a shuffled deck of Chance cards.
+    __init__(locs, rng=None)
+        Initialises the Chance space with its location and a deck of Chance cards shuffled by
+        rng (the random module by default).
     __repr__()
         Provides a string representation of the Chance space, including the top card.
     __lt__(other)
@@ -27,7 +28,7 @@ class Chance:
         Draws and returns the top card from the deck of Chance cards.
     """
 
-    def __init__(self, locs):
+    def __init__(self, locs, rng=None):
         self.type = "Chance"
         self.loc = locs
         self.cards = [
@@ -48,7 +49,8 @@ class Chance:
             "You have been elected Chairman of the Board. Pay each player £50.",
             "Your building loan matures. Collect £150."
         ]
-        random.shuffle(self.cards)
+        # the deck is shuffled with the board's random number generator when one is given
+        (rng if rng is not None else random).shuffle(self.cards)
         self.top_card_idx = 0
 
     def __repr__(self):
@@ -17,9 +17,9 @@ class CommunityChest:
 
     Methods
     -------
-    __init__(locs)
-        Initialises the Community Chest space with its location and a shuffled deck of 
-        Community Chest cards.
+    __init__(locs, rng=None)
+        Initialises the Community Chest space with its location and a deck of Community Chest
+        cards shuffled by rng (the random module by default).
     __repr__()
         Provides a string representation of the Community Chest space, including the top card.
     __lt__(other)
@@ -28,7 +28,7 @@ class CommunityChest:
         Draws and returns the top card from the deck of Community Chest cards.
     """
 
-    def __init__(self, locs):
+    def __init__(self, locs, rng=None):
         self.type = "Community Chest"
         self.loc = locs
         self.cards = [
@@ -49,7 +49,8 @@ class CommunityChest:
             "You have won second prize in a beauty contest. Collect £10.",
             "You inherit £100."
         ]
-        random.shuffle(self.cards)
+        # the deck is shuffled with the board's random number generator when one is given
+        (rng if rng is not None else random).shuffle(self.cards)
         self.top_card_idx = 0
 
     def __repr__(self):
@@ -12,6 +12,11 @@ from Street import Street
 from Tax import Tax
 from Utility import Utility
 import random
+
+# board without players that later boards copy their spaces from, so that the fixed data of every
+# space is only created once per process
+_template_board = None
+
 class MonopolyBoard:
     """
     This class represents the Monopoly board and the game logic. It provides methods for creating 
@@ -47,10 +52,21 @@ class MonopolyBoard:
         A dictionary of property sets grouped by colour.
     strategy: obj
         The object containing the strategy for the players.
+    rent_table: lst
+        The rent on each property for every state it can be in (see create_rent_table).
+    current_rent: lst
+        The rent on the property at each location on the board, updated when the owners, buildings 
+        and mortgages of properties change.
+    stale_rents: set
+        The players whose holdings have changed since the current rent on their properties was last 
+        updated. The rent on their properties is updated before it is next paid.
+    rng: obj
+        The random number generator used for dice rolls, deck shuffles and the player order (the 
+        random module by default, or a seeded random.Random for a reproducible game).
 
     Methods
     -------
-    __init__()
+    __init__(rng=None)
         Initialises the MonopolyBoard with all necessary properties and spaces.
     create_properties()
         Creates instances of the Street class for street properties on the board.
@@ -72,6 +88,18 @@ class MonopolyBoard:
         Creates the Free Parking space and places it on the board.
     create_go_to_jail()
         Creates the Go To Jail space and places it on the board.
+    copy_spaces(board)
+        Places copies of the spaces of another board on this board, sharing their fixed data.
+    create_rent_table()
+        Creates the rent table of the board and the current rent on every space.
+    update_rent(prop)
+        Updates the current rent on a property and the properties whose rent depends on it.
+    update_player_rents(player)
+        Updates the current rent on every property group in which a player owns a property.
+    current_rent_on(space)
+        Returns the current rent on a property, first updating it if the owner's holdings have changed.
+    reset_rents()
+        Recalculates the current rent on all properties.
     add_player(player)
         Adds a player to the game.
     play_game(stopping_condition=float('inf'))
@@ -89,7 +117,10 @@ class MonopolyBoard:
         Raises funds for a player by selling houses and mortgaging properties.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None):
+        global _template_board
+
+        self.rng = rng if rng is not None else random
         self.players = []
         self.board = [None]*40
         self.properties = []
@@ -105,16 +136,26 @@ class MonopolyBoard:
         self.property_sets = {"brown":[], "lightblue":[], "pink":[], "orange":[], 
                               "red":[], "yellow":[], "green":[], "darkblue":[]}
 
-        self.create_properties()
-        self.create_stations()
-        self.create_utilities()
-        self.create_chance()
-        self.create_community_chest()
-        self.create_tax()
-        self.create_go()
-        self.create_jail()
-        self.create_free_parking()
-        self.create_go_to_jail()
+        # spaces are created from their definitions for the first board only, later boards copy them
+        if _template_board is None:
+            self.create_properties()
+            self.create_stations()
+            self.create_utilities()
+            self.create_chance()
+            self.create_community_chest()
+            self.create_tax()
+            self.create_go()
+            self.create_jail()
+            self.create_free_parking()
+            self.create_go_to_jail()
+            self.create_rent_table()
+
+            _template_board = object.__new__(MonopolyBoard)
+            _template_board.copy_spaces(self)
+        else:
+            self.copy_spaces(_template_board)
+            self.create_chance()
+            self.create_community_chest()
 
         self.strategy = Strategy()
 
@@ -235,7 +276,7 @@ class MonopolyBoard:
         chance_locs = [7, 22, 36]
 
         # create instance of class with corresponding attributes & store them
-        chance = Chance(chance_locs)
+        chance = Chance(chance_locs, self.rng)
         self.chance = chance
 
         for loc in chance_locs:
@@ -259,7 +300,7 @@ class MonopolyBoard:
         community_chest_locs = [2, 17, 33]
 
         # create instance of class with corresponding attributes & store them
-        community_chest = CommunityChest(community_chest_locs)
+        community_chest = CommunityChest(community_chest_locs, self.rng)
         self.community_chest = community_chest
 
         for loc in community_chest_locs:
@@ -375,6 +416,187 @@ class MonopolyBoard:
         self.board[loc] = go_to_jail
         self.go_to_jail = go_to_jail
 
+    def copy_spaces(self, board):
+        """
+        This method places copies of the spaces of another board (without any players) on this board.
+        The spaces that never change (Go, Jail, Free Parking, Go To Jail and the tax spaces) and the 
+        rent table are shared between the boards. Each property is copied, but the copy shares the 
+        fixed data of the property (name, prices, rent schedule, group and location) with the original,
+        so only the owner, houses, hotel and mortgage of the property belong to this board alone. The 
+        Chance and Community Chest piles are not copied, since every board shuffles its own cards.
+        
+        Parameters
+        ----------
+        board: obj
+            The board to copy the spaces from.
+        
+        Returns
+        -------
+        None
+        """
+        # updating the attributes of a new object (rather than replacing them) keeps the compact
+        # attribute storage that Python shares between objects of the same class
+        spaces = {board.chance: None, board.community_chest: None}
+        for space in board.properties + board.stations + board.utilities:
+            space_copy = object.__new__(space.__class__)
+            space_copy.__dict__.update(space.__dict__)
+            spaces[space] = space_copy
+
+        copy_of = spaces.__getitem__
+        self.board = [spaces.get(space, space) for space in board.board]
+        self.properties = list(map(copy_of, board.properties))
+        self.stations = list(map(copy_of, board.stations))
+        self.utilities = list(map(copy_of, board.utilities))
+        self.property_sets = {group: list(map(copy_of, group_properties))
+                              for group, group_properties in board.property_sets.items()}
+        self.tax = list(board.tax)
+        self.chance = self.community_chest = None
+        self.go, self.jail, self.free_parking, self.go_to_jail = board.go, board.jail, board.free_parking, board.go_to_jail
+
+        self.rent_table = board.rent_table
+        self.current_rent = board.current_rent.copy()
+        self.stale_rents = set()
+
+    def create_rent_table(self):
+        """
+        This method creates the rent table of the board and the current rent on every space. The rent
+        table holds the rent on each property for every state that the property can be in, indexed as
+        rent_table[loc][level][count]. For streets, level is the development of the street (0 for no
+        houses, 1-4 for the number of houses and 5 for a hotel) and count is 1 if the owner owns the 
+        entire colour group (0 otherwise). For stations and utilities, level is always 0 and count is
+        the number of stations/utilities owned by the owner (the rent on a utility is the multiplier 
+        of the dice roll). Spaces that cannot be owned have no rent. This must be called after all 
+        properties have been created.
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.rent_table = [[[0]*5 for _ in range(6)] for _ in range(40)]
+
+        for street in self.properties:
+            table = self.rent_table[street.loc]
+            table[0][0], table[0][1] = street.rent, street.double_rent
+            for num_houses, rent in enumerate(street.house_rent, 1):
+                table[num_houses][0] = table[num_houses][1] = rent
+            table[5][0] = table[5][1] = street.hotel_rent
+
+        for station in self.stations:
+            self.rent_table[station.loc][0][1:] = station.rents
+
+        for utility in self.utilities:
+            self.rent_table[utility.loc][0][1:3] = utility.rent_multipliers
+
+        self.current_rent = [0]*40
+        self.stale_rents = set()
+
+    def update_rent(self, prop):
+        """
+        This method updates the current rent on a property from the rent table. The rent on a street
+        depends on whether its owner owns the entire colour group, and the rent on a station or utility
+        depends on how many of them the owner owns, so the whole group is updated together. This must
+        be called whenever the owner, buildings or mortgage of a property change.
+        
+        Parameters
+        ----------
+        prop: obj
+            An instance of one of the classes Street/Station/Utility.
+        
+        Returns
+        -------
+        None
+        """
+        current_rent = self.current_rent
+
+        if prop.type == "Street":
+            group = self.property_sets[prop.group]
+            full_set = int(all(street.owner is group[0].owner for street in group))
+
+            for street in group:
+                # player can't collect rent when mortgaged
+                if street.owner is None or street.is_mortgaged:
+                    current_rent[street.loc] = 0
+                else:
+                    level = 0 if street.num_houses == 0 else 5 if street.hotel else street.num_houses
+                    current_rent[street.loc] = self.rent_table[street.loc][level][full_set]
+            return
+
+        # rent on stations and utilities depends only on the number of them owned by the owner
+        same_type = self.stations if prop.type == "Station" else self.utilities
+        for space in same_type:
+            if space.owner is None:
+                current_rent[space.loc] = 0
+            else:
+                count = sum([other.owner is space.owner for other in same_type])
+                current_rent[space.loc] = self.rent_table[space.loc][0][count]
+
+    def update_player_rents(self, player):
+        """
+        This method updates the current rent on every property group in which a player owns a property.
+        The rent on a property depends only on the property and the holdings of its owner, so this
+        brings all of the player's rents up to date after their holdings have changed.
+        
+        Parameters
+        ----------
+        player: obj
+            Instance of the class Player.
+        
+        Returns
+        -------
+        None
+        """
+        for group in player.property_sets.values():
+            if group:
+                self.update_rent(group[0])
+        if player.stations:
+            self.update_rent(player.stations[0])
+        if player.utilities:
+            self.update_rent(player.utilities[0])
+        self.stale_rents.discard(player)
+
+    def current_rent_on(self, space):
+        """
+        This method returns the current rent on a property (the multiplier of the dice roll for a
+        utility). If the holdings of the owner have changed since the rent was last updated, the rent
+        on all of the owner's properties is updated first.
+        
+        Parameters
+        ----------
+        space: obj
+            An instance of one of the classes Street/Station/Utility.
+        
+        Returns
+        -------
+        int
+            The current rent on the property.
+        """
+        if space.owner in self.stale_rents:
+            self.update_player_rents(space.owner)
+        return self.current_rent[space.loc]
+
+    def reset_rents(self):
+        """
+        This method recalculates the current rent on all properties, for use when the state of the
+        board has been set directly (eg. owners or houses assigned outside of the game).
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        for group in self.property_sets.values():
+            self.update_rent(group[0])
+        self.update_rent(self.stations[0])
+        self.update_rent(self.utilities[0])
+        self.stale_rents.clear()
+
     def add_player(self, player):
         """
         This method adds a single player to the MonopolyBoard class. Each player is an instance
@@ -411,7 +633,7 @@ class MonopolyBoard:
         i = 0
 
         # randomise order of players
-        random.shuffle(self.players)
+        self.rng.shuffle(self.players)
 
         # play continues until there is a winner/stopping condition met
         while len([player for player in self.players if not player.bankrupt]) >= 2 and i < stopping_condition:
@@ -445,12 +667,16 @@ class MonopolyBoard:
         TypeError
             If the space type on the game board is not recognised or is of an incorrect type.
         """
+        # the strategy pays for anything it unmortgages or builds, so rents only change if money was spent
+        money = player.money
         self.strategy.decide_unmortgage_properties(player)
         self.strategy.decide_build_on_properties(player, self.property_sets)
+        if player.money != money:
+            self.stale_rents.add(player)
 
         # player rolls the dice
-        a_roll = random.randint(1, 6)
-        b_roll = random.randint(1, 6)
+        a_roll = self.rng.randint(1, 6)
+        b_roll = self.rng.randint(1, 6)
         dice_roll = a_roll + b_roll
 
         # if the player is in jail
@@ -837,12 +1063,10 @@ class MonopolyBoard:
         """
         # if there is an owner, pay calculated rent on property
         if space.owner:
-            if space.type == "Street":
-                rent = space.calculate_rent()
-            elif space.type == "Station":
-                rent = space.calculate_rent(len(space.owner.stations))
+            if space.type == "Street" or space.type == "Station":
+                rent = self.current_rent_on(space)
             elif space.type == "Utility":
-                rent = space.calculate_rent(dice_roll, len(space.owner.utilities))
+                rent = self.current_rent_on(space) * dice_roll
             else:
                 raise TypeError("Cannot purchase space of type" + space.type)  
             
@@ -856,6 +1080,7 @@ class MonopolyBoard:
         elif self.strategy.decide_to_buy(player, space):
             space.owner = player
             player.pay(space.price)
+            player.property_wealth += space.price
 
             if space.type == "Street":
                 player.properties.append(space)
@@ -866,6 +1091,7 @@ class MonopolyBoard:
                 player.utilities.append(space)
             else:
                 raise TypeError("Cannot purchase space of type" + space.type) 
+            self.stale_rents.add(player)
             
         else:
             return
@@ -900,4 +1126,7 @@ class MonopolyBoard:
 
             # when all houses/hotels are sold & properties mortgaged, player goes bankrupt
             else:
-                player.bankrupt = True
\ No newline at end of file
+                player.bankrupt = True
+
+        # the strategy may have sold houses or mortgaged properties
+        self.stale_rents.add(player)
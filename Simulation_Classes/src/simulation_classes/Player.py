@@ -32,6 +32,12 @@ class Player:
         The number of houses the player owns.
     hotels: int
         The number of hotels the player owns.
+    property_wealth: float
+        The value of the properties the player owns (mortgaged streets count at their mortgage
+        value), kept as a running total as properties are bought and mortgaged.
+    building_wealth: float
+        The value of the houses and hotels the player owns, kept as a running total as they are
+        built and sold.
 
     Methods
     -------
@@ -53,7 +59,9 @@ class Player:
     buy_utility(utility)
         Purchases a utility property for the player.
     wealth()
-        Calculates the wealth of the player, considering money, properties, and buildings.
+        Returns the wealth of the player, considering money, properties, and buildings.
+    recalculate_wealth()
+        Recalculates the running totals of the value of the player's properties and buildings.
     """
 
     def __init__(self, name):
@@ -73,6 +81,8 @@ class Player:
         self.jail_cards = 0
         self.houses = 0
         self.hotels = 0
+        self.property_wealth = 0
+        self.building_wealth = 0
         self.money_owed = {}
 
     def __repr__(self):
@@ -165,6 +175,7 @@ class Player:
             self.properties.append(street)
             self.property_sets[street.group].append(street)
             self.pay(street.price)
+            self.property_wealth += street.price
             street.owner = self
             return True
         return False
@@ -190,6 +201,7 @@ class Player:
         if station.owner is None and self.money >= station.price:
             self.stations.append(station)
             self.pay(station.price)
+            self.property_wealth += station.price
             station.owner = self
             return True
         return False
@@ -215,15 +227,17 @@ class Player:
         if utility.owner is None and self.money >= utility.price:
             self.utilities.append(utility)
             self.pay(utility.price)
+            self.property_wealth += utility.price
             utility.owner = self
             return True
         return False
     
     def wealth(self):
         """
-        This method calculates the wealth of the player. It sums the value of: money that
+        This method returns the wealth of the player. It sums the value of: money that
         the player possesses; any properties that the player holds, both mortgaged and unmortgaged;
-        the buildings that the player owns, both houses and hotels.
+        the buildings that the player owns, both houses and hotels. The value of the properties and
+        buildings are running totals, so this does not need to look through the player's properties.
         
         Parameters
         ----------
@@ -234,14 +248,30 @@ class Player:
         float
             The calculated wealth of the player.
         """
+        return self.property_wealth + self.building_wealth + self.money
 
-        # Calculate the value of the player's assets individually
+    def recalculate_wealth(self):
+        """
+        This method recalculates the running totals of the value of the player's properties and 
+        buildings from the properties that the player holds. This must be called when the owners,
+        buildings or mortgages of properties have been set directly, rather than by buying, building,
+        selling or mortgaging during the game.
+        
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        # calculate the value of the player's assets individually
         street_wealth = sum([street.price if street.is_mortgaged == False else 0 for street in self.properties])
         street_mortgaged_wealth = sum([street.calculate_mortgage_value() if street.is_mortgaged else 0 for street in self.properties])
         station_wealth = sum([station.price for station in self.stations])
         utility_wealth = sum([utility.price for utility in self.utilities])
         house_wealth = sum([street.num_houses*street.house_price for street in self.properties])
         hotel_wealth = sum([street.hotel*street.house_price for street in self.properties])
-        money_wealth = self.money
 
-        return street_wealth + street_mortgaged_wealth + station_wealth + utility_wealth + house_wealth + hotel_wealth + money_wealth
\ No newline at end of file
+        self.property_wealth = street_wealth + street_mortgaged_wealth + station_wealth + utility_wealth
+        self.building_wealth = house_wealth + hotel_wealth
@@ -7,6 +7,9 @@ class RandomStrategy:
     ----------
     strategy : str
         The name of the strategy.
+    rng : random.Random
+        The random number generator used for every decision. By default it is a new random.Random,
+        seeded from the random module so that random.seed still reproduces the decisions.
 
     Methods
     -------
@@ -28,8 +31,9 @@ class RandomStrategy:
         Determines whether to build a hotel on a street.
     """
 
-    def __init__(self):
+    def __init__(self, rng=None):
         self.strategy = "Random strategy"
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
 
     def decide_to_buy(self, player, space):
         """
@@ -48,7 +52,7 @@ class RandomStrategy:
             True if the player should buy the space, False otherwise.
         """
         if player.money >= space.price:
-            return random.choice([True, False])
+            return self.rng.choice([True, False])
         else:
             return False
         
@@ -71,7 +75,7 @@ class RandomStrategy:
 
         # get property groups that player owns
         property_sets = [(group, properties) for group, properties in player.property_sets.items()]
-        random.shuffle(property_sets) 
+        self.rng.shuffle(property_sets) 
 
         for group, properties in property_sets:
             while money_raised < money_needed:
@@ -97,6 +101,7 @@ class RandomStrategy:
                         property_to_sell.num_houses -= 1
                         player.houses -= 1
 
+                    player.building_wealth -= property_to_sell.house_price
                     sale_value = property_to_sell.calculate_house_sale_value()
                     money_raised += sale_value
                     player.money += sale_value
@@ -125,7 +130,7 @@ class RandomStrategy:
         all_properties = undeveloped_streets + player.stations + player.utilities
 
         # sort combined list of properties by mortgage value (least valuable first)
-        random.shuffle(all_properties)
+        self.rng.shuffle(all_properties)
 
         money_raised = 0
 
@@ -139,6 +144,10 @@ class RandomStrategy:
                 money_raised += mortgage_value
                 player.money += mortgage_value
 
+                # mortgaged streets count towards wealth at their mortgage value
+                if prop.type == "Street":
+                    player.property_wealth -= prop.price - mortgage_value
+
             # check if enough money has been raised to meet the target
             if money_raised >= money_needed:
                 break
@@ -157,10 +166,10 @@ class RandomStrategy:
         bool
             True if the player should leave jail, False otherwise.
         """
-        if player.jail_cards > 0 and random.random() < 0.5:
+        if player.jail_cards > 0 and self.rng.random() < 0.5:
             player.jail_cards -= 1
             return True
-        elif player.money >= 50 and random.random() < 0.5:
+        elif player.money >= 50 and self.rng.random() < 0.5:
             player.pay(50)
             return True
         else:
@@ -184,15 +193,17 @@ class RandomStrategy:
         mortgaged_stations = [station for station in player.stations if station.is_mortgaged]
         mortgaged_utilities = [utility for utility in player.utilities if utility.is_mortgaged]
         mortgaged_properties = mortgaged_streets + mortgaged_stations + mortgaged_utilities 
-        random.shuffle(mortgaged_properties)
+        self.rng.shuffle(mortgaged_properties)
 
         for prop in mortgaged_properties:
             unmortgage_cost = prop.calculate_unmortgage_price()
             
             # if the player has enough money to unmortgage the property and randomly chosen
-            if player.money >= unmortgage_cost and random.random() < 0.5:
+            if player.money >= unmortgage_cost and self.rng.random() < 0.5:
                 player.pay(unmortgage_cost)
                 prop.is_mortgaged = False
+                if prop.type == "Street":
+                    player.property_wealth += prop.price - prop.calculate_mortgage_value()
             else:
                 break
         
@@ -229,6 +240,7 @@ class RandomStrategy:
                         player.pay(street.house_price)
                         street.num_houses += 1
                         player.houses += 1
+                        player.building_wealth += street.house_price
 
                     # decision to develop the property or not (hotel)
                     elif self.decide_to_build_hotel(player, street):
@@ -238,6 +250,7 @@ class RandomStrategy:
                         # 4 houses are replaced by a hotel on the property
                         player.hotels += 1
                         player.houses -= 4
+                        player.building_wealth += street.house_price
                         
                     else:
                         pass
@@ -269,7 +282,7 @@ class RandomStrategy:
                     return False 
 
             # randomly decide whether to build or not
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 return True 
         
         else:
@@ -302,7 +315,7 @@ class RandomStrategy:
                     return False  
 
             # randomly decide whether to build or not
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 return True 
         
         else:
@@ -0,0 +1,123 @@
+import random
+import numpy as np
+
+class RandomStreams:
+    """
+    This class derives independent random number generators for a set of games from a single root
+    seed. The stream of each game depends only on the root seed and the index of the game (it is the
+    same as the child SeedSequence.spawn would give for that index), so a set of games split across
+    any number of workers, in any order, is reproduced exactly.
+
+    Attributes
+    ----------
+    seed_sequence: np.random.SeedSequence
+        The root seed sequence that the streams of all games are derived from.
+    entropy: int
+        The entropy of the root seed sequence. Passing this as the seed reproduces the streams of a
+        run whose seed was not given.
+
+    Methods
+    -------
+    __init__(seed=None)
+        Initialises the root seed sequence from a seed (or fresh entropy if no seed is given).
+    game_seed(game)
+        Returns the seed sequence for a single game.
+    game_rng(game)
+        Returns a random.Random for a single game, used by MonopolyBoard and the strategies.
+    game_generator(game)
+        Returns a NumPy Generator for a single game (or batch of games).
+    spawn(num_games, start=0)
+        Returns a random.Random for each of a range of games.
+    """
+
+    def __init__(self, seed=None):
+        """
+        This method initialises the root seed sequence.
+
+        Parameters
+        ----------
+        seed: int or np.random.SeedSequence, optional, default: None
+            The root seed. If None, fresh entropy is drawn from the operating system.
+
+        Returns
+        -------
+        None
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.entropy = self.seed_sequence.entropy
+
+    def game_seed(self, game):
+        """
+        This method returns the seed sequence for a single game. It is built directly from the
+        spawn key of the game rather than by spawning children in turn, so it does not depend on
+        which other games have been created.
+
+        Parameters
+        ----------
+        game: int
+            The index of the game.
+
+        Returns
+        -------
+        np.random.SeedSequence
+            The seed sequence for the game.
+        """
+        return np.random.SeedSequence(self.seed_sequence.entropy,
+                                      spawn_key=self.seed_sequence.spawn_key + (game,),
+                                      pool_size=self.seed_sequence.pool_size)
+
+    def game_rng(self, game):
+        """
+        This method returns a random.Random for a single game, seeded with 256 bits from the seed
+        sequence of the game.
+
+        Parameters
+        ----------
+        game: int
+            The index of the game.
+
+        Returns
+        -------
+        random.Random
+            The random number generator for the game.
+        """
+        state = self.game_seed(game).generate_state(8)
+        return random.Random(int.from_bytes(state.tobytes(), 'little'))
+
+    def game_generator(self, game):
+        """
+        This method returns a NumPy Generator for a single game. The BatchMonopolySimulator draws
+        for all of its games at once, so here the index is that of the batch rather than a game.
+
+        Parameters
+        ----------
+        game: int
+            The index of the game (or batch of games).
+
+        Returns
+        -------
+        np.random.Generator
+            The random number generator for the game.
+        """
+        return np.random.default_rng(self.game_seed(game))
+
+    def spawn(self, num_games, start=0):
+        """
+        This method returns a random.Random for each game in a range of games.
+
+        Parameters
+        ----------
+        num_games: int
+            The number of games.
+        start: int, optional, default: 0
+            The index of the first game, so that a worker can create the streams of its own games.
+
+        Returns
+        -------
+        lst
+            The random number generators for the games.
+        """
+        return [self.game_rng(game) for game in range(start, start + num_games)]
@@ -131,6 +131,7 @@ class Strategy:
                         property_to_sell.num_houses -= 1
                         player.houses -= 1
 
+                    player.building_wealth -= property_to_sell.house_price
                     sale_value = property_to_sell.calculate_house_sale_value()
                     money_raised += sale_value
                     player.money += sale_value
@@ -181,6 +182,10 @@ class Strategy:
                 money_raised += mortgage_value
                 player.money += mortgage_value
 
+                # mortgaged streets count towards wealth at their mortgage value
+                if prop.type == "Street":
+                    player.property_wealth -= prop.price - mortgage_value
+
             # check if enough money has been raised to meet the target
             if money_raised >= money_needed:
                 break
@@ -241,6 +246,8 @@ class Strategy:
             if player.money >= unmortgage_cost:
                 player.pay(unmortgage_cost)
                 prop.is_mortgaged = False
+                if prop.type == "Street":
+                    player.property_wealth += prop.price - prop.calculate_mortgage_value()
             else:
                 break
         
@@ -286,6 +293,7 @@ class Strategy:
                         player.pay(street.house_price)
                         street.num_houses += 1
                         player.houses += 1
+                        player.building_wealth += street.house_price
 
                     # decision to develop the property or not (hotel)
                     elif self.decide_to_build_hotel(player, street):
@@ -295,6 +303,7 @@ class Strategy:
                         # 4 houses are replaced by a hotel on the property
                         player.hotels += 1
                         player.houses -= 4
+                        player.building_wealth += street.house_price
                         
                     else:
                         pass